@@ -0,0 +1,81 @@
+# 비동기 분석 단계 벤치마크
+# 느린 리다이렉션 서버를 흉내내어(리다이렉션 추적을 sleep으로 대체),
+# 분석을 동기 실행할 때와 워커 풀에서 실행할 때의 프리뷰 FPS / 최대 프레임 간격을 비교함.
+#
+# 실행: python src/benchmarks/bench_async_analysis.py
+import os, sys
+import time
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import cv2
+import numpy as np
+
+import QR_Webcam_Scanner_Ver5 as scanner
+
+SLOW_RESOLVE_SECONDS = 1.5   # 리다이렉션 한 번 추적에 걸리는 시간 (느린 호스트 가정)
+RUN_SECONDS = 6              # 모드별 측정 시간
+QR_PAYLOAD = "https://example.com/kiosk/1234"
+
+# 테스트용 QR 프레임 생성 (OpenCV 내장 인코더 사용)
+def make_qr_frame(text, width=640, height=480, qr_size=240):
+    qr = cv2.QRCodeEncoder.create().encode(text)
+    qr = cv2.resize(qr, (qr_size, qr_size), interpolation=cv2.INTER_NEAREST)
+    frame = np.full((height, width, 3), 255, dtype=np.uint8)
+    y = (height - qr_size) // 2
+    x = (width - qr_size) // 2
+    frame[y:y + qr_size, x:x + qr_size] = cv2.cvtColor(qr, cv2.COLOR_GRAY2BGR)
+    return frame
+
+# 느린 리다이렉션 추적 흉내 (async_resolver 결과와 같은 형태의 dict 반환)
+def slow_resolve(url, *args, **kwargs):
+    time.sleep(SLOW_RESOLVE_SECONDS)
+    return {"url": url, "final_url": url, "chain": [url], "status": 200, "ok": True,
+            "complete": True, "truncated_reason": None, "hops": 0}
+
+# 제출 즉시 같은 스레드에서 실행하는 실행기 (기존 동기 방식 재현용)
+class InlineExecutor:
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+def run(mode, frame):
+    scanner.last_detect_times.clear()
+    scanner.current_analyses.clear()
+    scanner.change_detector.reset()
+    if mode == "sync":
+        scanner.analysis_executor = InlineExecutor()
+    else:
+        scanner.analysis_executor = scanner.ThreadPoolExecutor(max_workers=scanner.ANALYSIS_WORKERS)
+
+    meter = scanner.FrameRateMeter()
+    deadline = time.perf_counter() + RUN_SECONDS
+    while time.perf_counter() < deadline:
+        scanner.detect_qr_opencv(frame.copy())
+        meter.tick()
+
+    if mode != "sync":
+        scanner.analysis_executor.shutdown(wait=True)
+    return meter
+
+def main():
+    # GUI 팝업은 벤치마크에서 띄우지 않음
+    scanner.resolve_with_deadline = slow_resolve
+    scanner.resolve_many = lambda urls, *args, **kwargs: [slow_resolve(url) for url in urls]
+    scanner.GUI_ENABLED = False
+
+    frame = make_qr_frame(QR_PAYLOAD)
+    print(f"[설정] 리다이렉션 지연 {SLOW_RESOLVE_SECONDS}s / 모드별 {RUN_SECONDS}s 측정")
+    print(f"{'모드':<8}{'평균 FPS':>10}{'최대 프레임 간격':>18}")
+    for mode in ("sync", "async"):
+        meter = run(mode, frame)
+        average_fps = meter.frame_count / RUN_SECONDS
+        print(f"{mode:<8}{average_fps:>10.1f}{meter.worst_interval * 1000:>16.0f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# 차단 목록 자동 갱신 벤치마크
+# 조회 스레드가 쉬지 않고 match()를 호출하는 동안 BlocklistReloader가
+#   1) 큰 목록 파일(기본 50만 개)이 교체되어 전체 재구축하는 경우
+#   2) 변경분(델타) 파일에 몇 줄이 덧붙은 경우
+# 를 처리할 때, 조회 지연(최대 / p99)과 새 항목이 조회에 반영되기까지 걸린 시간을 측정함.
+# 같은 피드를 컴파일한 .qrbl 파일이 교체되는 경우(재구축 = 메모리 매핑만 다시 함)도 함께 측정.
+#
+# 실행: python src/benchmarks/bench_blocklist_reload.py [--size 500000]
+import os, sys
+import argparse
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import numpy as np
+
+from blocklist_reloader import BlocklistReloader
+from blocklist_store import compile_blocklist
+
+SEED = 3
+POLL_INTERVAL = 0.05
+
+def write_feed(path, count, rng, extra=()):
+    labels = rng.integers(0, 36 ** 9, size=count)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        for label in labels:
+            f.write(f"{np.base_repr(int(label), 36).lower()}.com\n")
+        for domain in extra:
+            f.write(domain + "\n")
+    os.replace(path + ".tmp", path)  # 실제 피드 갱신처럼 파일을 통째로 교체
+
+class LookupLoop:
+    """별도 스레드에서 계속 조회하면서 호출별 지연 시간을 기록"""
+    def __init__(self, blocklist):
+        self.blocklist = blocklist
+        self.latencies = []
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        queries = [f"https://login.site{i}.com/x" for i in range(1000)]
+        i = 0
+        while not self.stop_event.is_set():
+            started = time.perf_counter()
+            self.blocklist.match(queries[i % len(queries)])
+            self.latencies.append(time.perf_counter() - started)
+            i += 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop_event.set()
+        self.thread.join()
+
+def wait_until(condition, timeout=60):
+    started = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError
+        time.sleep(0.001)
+    return time.perf_counter() - started
+
+def report(label, latencies, visible_after):
+    values = np.array(latencies) * 1000
+    print(f"{label:<22}조회 {len(values):>9,}회  p99 {np.percentile(values, 99):7.3f}ms  "
+          f"최대 {values.max():7.2f}ms  반영까지 {visible_after * 1000:8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="차단 목록 자동 갱신 벤치마크")
+    parser.add_argument("--size", type=int, default=500_000, help="목록 파일 도메인 수")
+    args = parser.parse_args()
+    rng = np.random.default_rng(SEED)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        feed_path = os.path.join(workdir, "feed.txt")
+        delta_path = os.path.join(workdir, "delta.txt")
+        write_feed(feed_path, args.size, rng)
+        open(delta_path, "w").close()
+
+        reloader = BlocklistReloader([feed_path], [delta_path], interval=POLL_INTERVAL)
+        print(f"[설정] 목록 {len(reloader):,}개, 첫 구축 {reloader.stats['last_build_seconds']:.2f}초, "
+              f"확인 간격 {POLL_INTERVAL * 1000:.0f}ms")
+        reloader.start()
+
+        with LookupLoop(reloader) as loop:
+            time.sleep(0.5)
+            report("평상시", loop.latencies, 0.0)
+
+        with LookupLoop(reloader) as loop:
+            write_feed(feed_path, args.size, rng, extra=["new-threat.com"])
+            visible = wait_until(lambda: reloader.match("x.new-threat.com") is not None)
+            report("전체 재구축", loop.latencies, visible)
+
+        with LookupLoop(reloader) as loop:
+            with open(delta_path, "a", encoding="utf-8") as f:
+                f.write("+delta-threat.com\n-new-threat.com\n")
+            visible = wait_until(lambda: reloader.match("delta-threat.com") is not None)
+            report("델타 반영", loop.latencies, visible)
+
+        reloader.stop()
+        print(reloader.summary())
+        del reloader, loop  # 텍스트 목록(집합 50만 개) 해제가 다음 측정 중에 일어나지 않도록 미리 해제
+
+        # 컴파일 목록: 새 피드를 .qrbl로 컴파일해서 교체 (컴파일은 스캐너 밖에서 하는 작업이므로 측정에서 제외)
+        compiled_path = os.path.join(workdir, "feed.qrbl")
+        compile_blocklist([feed_path], compiled_path)
+        reloader = BlocklistReloader([compiled_path], interval=POLL_INTERVAL).start()
+        write_feed(feed_path, args.size, rng, extra=["compiled-threat.com"])
+        compile_blocklist([feed_path], compiled_path + ".new")
+        with LookupLoop(reloader) as loop:
+            os.replace(compiled_path + ".new", compiled_path)
+            visible = wait_until(lambda: reloader.match("compiled-threat.com") is not None)
+            report("재구축 (.qrbl)", loop.latencies, visible)
+        reloader.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# 컴파일된 차단 목록(.qrbl) 벤치마크
+# 합성 도메인 피드(기본 200만 개)를 만들어
+#   1) 텍스트 피드를 DomainBlocklist(파이썬 set)로 불러오기
+#   2) .qrbl 파일을 메모리 매핑으로 열기 (블룸 필터 사용 / 미사용)
+# 의 불러오기 시간, 메모리(RSS) 증가량, 조회 속도를 비교함.
+# 각 방식은 별도 프로세스에서 측정함 (앞 측정에서 늘어난 메모리가 섞이지 않도록).
+#
+# 실행: python src/benchmarks/bench_blocklist_store.py [--size 2000000]
+import os, sys
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import numpy as np
+
+SEED = 11
+TLDS = ["com", "net", "org", "io", "kr", "xyz", "top", "info"]
+QUERIES = 100_000
+
+def rss_mb():
+    # Linux: /proc/self/statm의 두 번째 값이 상주 페이지 수
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+def write_feed(path, count, rng):
+    labels = rng.integers(0, 36 ** 9, size=count)
+    tlds = rng.integers(0, len(TLDS), size=count)
+    with open(path, "w", encoding="utf-8") as f:
+        for label, tld in zip(labels, tlds):
+            f.write(f"{np.base_repr(int(label), 36).lower()}.{TLDS[tld]}\n")
+
+def make_queries(feed_path, count):
+    # 절반은 피드에 있는 도메인의 하위 도메인, 절반은 없는 도메인
+    with open(feed_path, encoding="utf-8") as f:
+        listed = [next(f).strip() for _ in range(count // 2)]
+    return [f"https://login.{domain}/x" for domain in listed] + \
+           [f"https://www.unlisted-{i}.com/x" for i in range(count - len(listed))]
+
+def measure_child(mode, path, feed_path):
+    """자식 프로세스: 불러오기 시간 / RSS 증가량 / 조회 속도를 JSON으로 출력"""
+    from domain_blocklist import DomainBlocklist
+
+    queries = make_queries(feed_path, QUERIES)
+    before = rss_mb()
+    started = time.perf_counter()
+    blocklist = DomainBlocklist()
+    blocklist.load_file(path)
+    load_seconds = time.perf_counter() - started
+    after_load = rss_mb()
+
+    started = time.perf_counter()
+    hits = sum(blocklist.match(url) is not None for url in queries)
+    lookup_rate = len(queries) / (time.perf_counter() - started)
+    print(json.dumps({
+        "mode": mode, "entries": len(blocklist), "load_seconds": load_seconds,
+        "rss_load_mb": after_load - before, "rss_after_lookups_mb": rss_mb() - before,
+        "lookups_per_second": lookup_rate, "hits": hits,
+    }))
+
+def run_child(mode, path, feed_path):
+    output = subprocess.run([sys.executable, __file__, "--child", mode, path, feed_path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="컴파일된 차단 목록 벤치마크")
+    parser.add_argument("--size", type=int, default=2_000_000, help="합성 피드 도메인 수")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "PATH", "FEED"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(*args.child)
+        return
+
+    from blocklist_store import compile_blocklist
+
+    with tempfile.TemporaryDirectory() as workdir:
+        feed_path = os.path.join(workdir, "feed.txt")
+        write_feed(feed_path, args.size, np.random.default_rng(SEED))
+
+        compiled = {}
+        for name, bloom_bits in (("bloom", 10), ("nobloom", 0)):
+            compiled[name] = os.path.join(workdir, f"feed_{name}.qrbl")
+            started = time.perf_counter()
+            compile_blocklist([feed_path], compiled[name], bloom_bits_per_entry=bloom_bits)
+            size_mb = os.path.getsize(compiled[name]) / 1024 / 1024
+            print(f"[컴파일] {name}: {time.perf_counter() - started:.1f}초, 파일 {size_mb:.1f}MB")
+
+        feed_mb = os.path.getsize(feed_path) / 1024 / 1024
+        print(f"[설정] 피드 {args.size:,}개 도메인 ({feed_mb:.1f}MB), 조회 {QUERIES:,}회 (절반 일치)")
+        print(f"{'방식':<24}{'불러오기':>10}{'RSS(불러온 직후)':>18}{'RSS(조회 후)':>14}{'조회 속도':>14}")
+        runs = [("텍스트 → set", feed_path), (".qrbl (이진 탐색)", compiled["nobloom"]),
+                (".qrbl + 블룸 필터", compiled["bloom"])]
+        for label, path in runs:
+            r = run_child(label, path, feed_path)
+            print(f"{label:<24}{r['load_seconds'] * 1000:>8.1f}ms{r['rss_load_mb']:>16.1f}MB"
+                  f"{r['rss_after_lookups_mb']:>12.1f}MB{r['lookups_per_second']:>10,.0f}회/초"
+                  f"  (일치 {r['hits']:,})")
+
+if __name__ == "__main__":
+    main()
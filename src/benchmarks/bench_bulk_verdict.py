@@ -0,0 +1,129 @@
+# 대량 URL 판정 벤치마크
+# 로컬 HTTP 서버가 응답마다 지연(느린 외부 서버 가정)을 두고 리다이렉션 체인을 흉내내며,
+# 호스트 이름은 127.0.0.x 루프백 주소 여러 개로 나눠서 호스트별 동시 요청 제한이 걸리게 함.
+# URL 목록(중복 포함)을 기존 방식(한 개씩 is_suspicious_qr과 같은 순서로 추적 → 판정)과
+# BulkScanner의 동시 작업 수(workers)별로 처리해서 초당 처리 URL 수와 첫 결과까지 걸린 시간을 비교함.
+# (리다이렉션 캐시는 끄고 측정)
+# 마지막으로 연결할 수 없는 주소로 리다이렉션되는 URL을 캐시를 켜고 두 번 검사해서,
+# 실패 캐시(네거티브 캐시)에서 나온 두 번째 판정이 첫 번째와 같은지 확인함.
+# 형식이 잘못된 URL이 섞인 목록도 검사해서, 그 URL만 오류 결과가 되고 나머지는 끝까지 판정되는지 확인함.
+#
+# 실행: python src/benchmarks/bench_bulk_verdict.py
+import os, sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+from async_resolver import resolve_with_deadline
+from bulk_verdict import BulkScanner, default_rule_engine
+from redirect_cache import RedirectCache
+import redirect_resolver
+
+RESPONSE_DELAY_SECONDS = 0.02   # 응답 하나에 걸리는 시간
+HOPS_PER_CHAIN = 2              # URL당 리다이렉션 횟수 (요청 수 = 홉 + 1)
+HOSTS = 32                      # 서로 다른 호스트 수 (127.0.0.2 ~)
+UNIQUE_URLS = 240
+DUPLICATE_URLS = 60             # 목록에 한 번 더 들어가는 URL 수
+WORKER_COUNTS = (4, 16, 64)
+UNREACHABLE_TARGET = "http://127.0.0.1:1/landing.exe"   # 연결이 거부되는 주소
+
+class SlowRedirectHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def respond(self):
+        time.sleep(RESPONSE_DELAY_SECONDS)
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "unreachable":
+            self.send_response(302)
+            self.send_header("Location", UNREACHABLE_TARGET)
+        elif len(parts) == 3 and parts[0] == "hop" and int(parts[1]) > 0:
+            self.send_response(302)
+            self.send_header("Location", f"/hop/{int(parts[1]) - 1}/{parts[2]}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self.respond()
+
+    def do_HEAD(self):
+        self.respond()
+
+    def log_message(self, format, *args):
+        pass
+
+class BenchServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256    # 기본값(5)이면 동시 연결이 많을 때 서버 쪽 대기열이 넘쳐 측정이 왜곡됨
+
+def make_urls(port):
+    urls = [f"http://127.0.0.{2 + i % HOSTS}:{port}/hop/{HOPS_PER_CHAIN}/u{i}" for i in range(UNIQUE_URLS)]
+    return urls + urls[::UNIQUE_URLS // DUPLICATE_URLS][:DUPLICATE_URLS]
+
+def sequential(urls, engine):
+    verdicts = {}
+    for url in urls:
+        resolution = resolve_with_deadline(url, use_cache=False)
+        score, _ = engine.evaluate(url, resolution["final_url"], resolution)
+        verdicts[url] = engine.is_bad(score)
+    return verdicts
+
+def repeat_scan(port, engine):
+    # 디스크 캐시 파일을 건드리지 않도록 메모리 캐시로 교체
+    redirect_resolver._redirect_cache = RedirectCache(db_path=None)
+    url = f"http://127.0.0.2:{port}/unreachable"
+    first, second = (next(BulkScanner(engine, workers=1).scan([url])) for _ in range(2))
+    assert redirect_resolver.get_redirect_cache().stats["negative_hits"] == 1
+    assert first == second, (first, second)
+    assert first["final_url"] == UNREACHABLE_TARGET and first["score"] == 3, first
+    print(f"[재검사] 실패 캐시 적중 후에도 같은 판정 (점수 {second['score']}, {', '.join(second['reasons'])})")
+
+def mixed_scan(port, engine):
+    malformed = "http://[::1/x"     # urlparse가 ValueError를 냄
+    urls = [malformed, "javascript:alert(1)", f"http://127.0.0.2:{port}/hop/{HOPS_PER_CHAIN}/mixed",
+            "http://127.0.0.1:1/a.exe"]
+    scanner = BulkScanner(engine, workers=4, use_cache=False)
+    verdicts = {verdict["url"]: verdict for verdict in scanner.scan(urls)}
+    assert set(verdicts) == set(urls), verdicts
+    assert verdicts[malformed]["error"] and not verdicts[malformed]["bad"], verdicts[malformed]
+    assert all(verdicts[url]["error"] is None for url in urls[1:]), verdicts
+    assert scanner.stats["errors"] == 1 and scanner.stats["scanned"] == len(urls) - 1, scanner.stats
+    print(f"[오류 섞인 입력] {len(urls)}개 모두 결과 반환 (오류 {scanner.stats['errors']}개: {verdicts[malformed]['error']})")
+
+def main():
+    server = BenchServer(("", 0), SlowRedirectHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = make_urls(server.server_address[1])
+    engine = default_rule_engine()
+
+    print(f"[설정] URL {len(urls)}개 (중복 {DUPLICATE_URLS}개), 호스트 {HOSTS}개, "
+          f"URL당 요청 {HOPS_PER_CHAIN + 1}회 x {RESPONSE_DELAY_SECONDS * 1000:.0f}ms")
+    print(f"{'방식':<14}{'소요 시간':>10}{'처리량':>14}{'첫 결과':>12}")
+
+    started = time.perf_counter()
+    expected = sequential(urls, engine)
+    elapsed = time.perf_counter() - started
+    print(f"{'한 개씩':<14}{elapsed:>9.2f}s{len(urls) / elapsed:>10.0f}개/초{'-':>12}")
+
+    for workers in WORKER_COUNTS:
+        scanner = BulkScanner(engine, workers=workers, use_cache=False)
+        started = time.perf_counter()
+        first = None
+        verdicts = {}
+        for verdict in scanner.scan(urls):
+            first = first or time.perf_counter() - started
+            verdicts[verdict["url"]] = verdict["bad"]
+            assert verdict["complete"] and verdict["hops"] == HOPS_PER_CHAIN, verdict
+        elapsed = time.perf_counter() - started
+        assert verdicts == expected
+        print(f"{f'동시 {workers}개':<14}{elapsed:>9.2f}s{len(urls) / elapsed:>10.0f}개/초{first * 1000:>10.0f}ms")
+
+    repeat_scan(server.server_address[1], engine)
+    mixed_scan(server.server_address[1], engine)
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
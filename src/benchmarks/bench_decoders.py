@@ -0,0 +1,75 @@
+# 디코더 백엔드 벤치마크
+# 같은 합성 이미지 세트(정상 / 회전 / 블러 / 잡음 / 저대비)에 대해
+# 설치된 백엔드(OpenCV, pyzbar, WeChat)와 기본 캐스케이드의 지연 시간 / 성공률을 비교함.
+#
+# 실행: python src/benchmarks/bench_decoders.py
+import os, sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import cv2
+import numpy as np
+
+from qr_decoders import available_backends, create_decoder, create_decoder_cascade
+
+IMAGES_PER_KIND = 10
+SEED = 42
+
+def make_base(payload, size=640, qr_size=300):
+    qr = cv2.QRCodeEncoder.create().encode(payload)
+    qr = cv2.resize(qr, (qr_size, qr_size), interpolation=cv2.INTER_NEAREST)
+    image = np.full((size, size), 255, dtype=np.uint8)
+    offset = (size - qr_size) // 2
+    image[offset:offset + qr_size, offset:offset + qr_size] = qr
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+# 열화 종류별 변환 함수
+DEGRADATIONS = {
+    "정상": lambda image, rng: image,
+    "회전": lambda image, rng: cv2.warpAffine(
+        image, cv2.getRotationMatrix2D((320, 320), float(rng.uniform(15, 40)), 1.0), (640, 640),
+        borderValue=(255, 255, 255)),
+    "블러": lambda image, rng: cv2.GaussianBlur(image, (0, 0), float(rng.uniform(1.5, 2.5))),
+    "잡음": lambda image, rng: np.clip(
+        image.astype(np.int16) + rng.normal(0, 40, image.shape), 0, 255).astype(np.uint8),
+    "저대비": lambda image, rng: (image.astype(np.float32) * 0.15 + 20).astype(np.uint8),
+}
+
+def make_image_set(rng):
+    images = []
+    for kind, degrade in DEGRADATIONS.items():
+        for i in range(IMAGES_PER_KIND):
+            payload = f"https://example.com/{kind}/{i}"
+            images.append((kind, degrade(make_base(payload), rng), payload))
+    return images
+
+def run(decoder, images):
+    correct = {kind: 0 for kind in DEGRADATIONS}
+    started = time.perf_counter()
+    for kind, image, payload in images:
+        results = decoder.decode(image)
+        correct[kind] += any(data == payload for data, _ in results)
+    elapsed = (time.perf_counter() - started) / len(images)
+    return elapsed, correct
+
+def main():
+    rng = np.random.default_rng(SEED)
+    images = make_image_set(rng)
+
+    decoders = [(name, create_decoder(name)) for name in available_backends()]
+    cascade = create_decoder_cascade()
+    decoders.append(("cascade(" + ">".join(cascade.names) + ")", cascade))
+
+    print(f"[설정] 이미지 {len(images)}장 (종류별 {IMAGES_PER_KIND}장), 설치된 백엔드: {', '.join(available_backends())}")
+    header = f"{'백엔드':<28}{'평균 지연':>10}{'전체':>8}" + "".join(f"{kind:>8}" for kind in DEGRADATIONS)
+    print(header)
+    for name, decoder in decoders:
+        elapsed, correct = run(decoder, images)
+        total = sum(correct.values()) / len(images) * 100
+        row = f"{name:<28}{elapsed * 1000:>8.1f}ms{total:>7.0f}%"
+        row += "".join(f"{correct[kind] / IMAGES_PER_KIND * 100:>7.0f}%" for kind in DEGRADATIONS)
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# 도메인 차단 목록 벤치마크
+# 합성 도메인 N개로 목록을 만들어, 기존 방식(리스트에 대한 any(domain.endswith(...)) 선형 검사)과
+# DomainBlocklist(라벨 단위 해시 조회)의 구축 시간 / 조회 속도를 비교함.
+#
+# 실행: python src/benchmarks/bench_domain_blocklist.py [--size 1000000]
+import os, sys
+import argparse
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import numpy as np
+
+from domain_blocklist import DomainBlocklist
+
+SEED = 5
+TLDS = ["com", "net", "org", "io", "co.kr", "kr", "xyz", "top"]
+LINEAR_QUERIES = 20  # 선형 검사는 느리므로 조회 수를 줄여서 측정
+
+def make_domains(rng, count):
+    labels = rng.integers(0, 36 ** 8, size=count)
+    tlds = rng.integers(0, len(TLDS), size=count)
+    return [f"{np.base_repr(int(label), 36).lower()}.{TLDS[tld]}" for label, tld in zip(labels, tlds)]
+
+def make_queries(rng, domains, count):
+    # 절반은 목록에 있는 도메인의 하위 도메인, 절반은 목록에 없는 도메인
+    queries = []
+    for i in range(count):
+        if i % 2 == 0:
+            queries.append(f"https://login.secure.{domains[int(rng.integers(0, len(domains)))]}/path")
+        else:
+            queries.append(f"https://www.not-listed-{i}.com/path")
+    return queries
+
+def linear_match(domains, url):
+    """기존 QR_Webcam_Scanner_Ver5 방식"""
+    domain = url.split("://", 1)[-1].split("/", 1)[0].lower()
+    return any(domain.endswith(sd) for sd in domains)
+
+def main():
+    parser = argparse.ArgumentParser(description="도메인 차단 목록 벤치마크")
+    parser.add_argument("--size", type=int, default=1_000_000, help="합성 도메인 수")
+    parser.add_argument("--queries", type=int, default=100_000, help="인덱스 조회 수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(SEED)
+    domains = make_domains(rng, args.size)
+    queries = make_queries(rng, domains, args.queries)
+    print(f"[설정] 도메인 {args.size:,}개, 조회 {args.queries:,}회")
+
+    started = time.perf_counter()
+    blocklist = DomainBlocklist(domains)
+    build_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    hits = sum(blocklist.match(url) is not None for url in queries)
+    index_rate = len(queries) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    linear_hits = sum(linear_match(domains, url) for url in queries[:LINEAR_QUERIES])
+    linear_rate = LINEAR_QUERIES / (time.perf_counter() - started)
+
+    index_hits_sample = sum(blocklist.match(url) is not None for url in queries[:LINEAR_QUERIES])
+    print(f"[구축] {build_time:.2f}초 ({len(blocklist):,}개 등록, 제외 {blocklist.stats['rejected']}개)")
+    print(f"[선형 검사] {linear_rate:,.1f}회/초 (일치 {linear_hits}/{LINEAR_QUERIES})")
+    print(f"[인덱스]    {index_rate:,.0f}회/초 (일치 {hits:,}/{len(queries):,}, "
+          f"선형 검사와 같은 표본에서 일치 {index_hits_sample}/{LINEAR_QUERIES}) → {index_rate / linear_rate:,.0f}배")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# IP / CIDR 평판 검사 벤치마크
+# 1) 무작위 CIDR 대역 30만 개(IPv4 20만 + IPv6 10만)로 구간 배열을 만들고,
+#    대역을 하나씩 확인하는 방식(ipaddress `in`)과 이진 탐색 조회의 초당 조회 수를 비교 (결과 일치 확인 포함)
+# 2) IP 주소 판별: 기존 정규식(\d{1,3} 네 개)과 ipaddress 기반 판별 비교
+# 3) DNS 캐시: 실제 DNS 대신 로컬 가짜 resolver(지연 5ms, 호출 횟수 기록)와 조작 가능한 시계로
+#    캐시 적중 / TTL 만료 후 재조회 / 조회 실패 캐시, 규칙 엔진 연결까지 확인
+# 4) 기본 목록(문서용 예시 대역)만 있으면 DNS를 조회하지 않는지, 응답하지 않는 DNS는 timeout에서 끊기는지 확인
+#
+# 실행: python src/benchmarks/bench_ip_reputation.py
+import os, sys
+import ipaddress
+import re
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import numpy as np
+
+from ip_reputation import (CidrBlocklist, CachingResolver, IpReputation, parse_ip, load_cidr_blocklist,
+                           BAD_NETWORKS_LIST_PATH)
+from rule_engine import RuleEngine
+
+SEED = 23
+IPV4_NETWORKS = 200_000
+IPV6_NETWORKS = 100_000
+LOOKUPS = 100_000
+LINEAR_LOOKUPS = 20      # 하나씩 확인하는 방식은 매우 느리므로 일부만 측정
+STUB_DELAY_SECONDS = 0.005
+HANGING_DNS_SECONDS = 3       # 응답하지 않는 DNS 서버 흉내
+DNS_TIMEOUT_SECONDS = 0.2
+
+def random_networks(rng):
+    networks = []
+    for value, prefix in zip(rng.integers(0, 2**32, IPV4_NETWORKS), rng.integers(20, 33, IPV4_NETWORKS)):
+        networks.append(ipaddress.IPv4Network((int(value), int(prefix)), strict=False))
+    highs = rng.integers(0, 2**63, IPV6_NETWORKS)
+    for high, prefix in zip(highs, rng.integers(48, 65, IPV6_NETWORKS)):
+        networks.append(ipaddress.IPv6Network(((0x2000 << 112) | (int(high) << 48), int(prefix)), strict=False))
+    return networks
+
+def random_addresses(rng, networks, count):
+    # 절반은 목록에 있는 대역 안의 주소, 나머지는 무작위 주소
+    addresses = []
+    for i in range(count):
+        if i % 2:
+            network = networks[int(rng.integers(len(networks)))]
+            addresses.append(network.network_address + int(rng.integers(min(network.num_addresses, 2**62))))
+        elif i % 4:
+            addresses.append(ipaddress.IPv4Address(int(rng.integers(0, 2**32))))
+        else:
+            addresses.append(ipaddress.IPv6Address((0x2000 << 112) | (int(rng.integers(0, 2**63)) << 48)))
+    return addresses
+
+def bench_cidr(rng):
+    networks = random_networks(rng)
+    started = time.perf_counter()
+    blocklist = CidrBlocklist(str(network) for network in networks)
+    blocklist.build()
+    build_time = time.perf_counter() - started
+    print(f"[CIDR] 대역 {len(blocklist):,}개 구간 배열 생성 {build_time:.2f}초 "
+          f"(포함 관계 제거 후 IPv4 {len(blocklist.index[4][0]):,} / IPv6 {len(blocklist.index[6][0]):,}개 구간)")
+
+    addresses = random_addresses(rng, networks, LOOKUPS)
+    started = time.perf_counter()
+    results = [blocklist.lookup(address) for address in addresses]
+    indexed_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for address, result in zip(addresses[:LINEAR_LOOKUPS], results):
+        linear = any(address in network for network in networks if network.version == address.version)
+        assert linear == (result is not None), address
+    linear_time = time.perf_counter() - started
+
+    print(f"[CIDR] 하나씩 확인  {LINEAR_LOOKUPS / linear_time:>12,.1f}회/초 (결과 일치 확인 {LINEAR_LOOKUPS}건)")
+    print(f"[CIDR] 이진 탐색    {LOOKUPS / indexed_time:>12,.0f}회/초 (일치 {sum(r is not None for r in results):,}건)")
+
+def bench_ip_detection():
+    legacy = re.compile(r"^\d{1,3}(\.\d{1,3}){3}$")
+    samples = ["192.168.0.1", "999.1.1.1", "256.256.256.256", "2001:db8::1", "[2001:db8::1]", "::ffff:203.0.113.9",
+               "1.2.3", "example.com"]
+    print(f"{'호스트':<22}{'기존 정규식':>10}{'ipaddress':>12}")
+    for host in samples:
+        address = parse_ip(host)
+        print(f"{host:<22}{bool(legacy.match(host))!s:>10}{str(address) if address else '-':>16}")
+    assert parse_ip("999.1.1.1") is None and parse_ip("[2001:db8::1]") is not None
+    assert str(parse_ip("::ffff:203.0.113.9")) == "203.0.113.9"
+
+class StubResolver:
+    """로컬 가짜 resolver: 정해 둔 주소를 돌려주고 호출 횟수를 기록"""
+    def __init__(self, records, delay=STUB_DELAY_SECONDS):
+        self.records = records
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, host):
+        self.calls += 1
+        time.sleep(self.delay)
+        if host not in self.records:
+            raise OSError(f"stub: {host} 없음")
+        return self.records[host]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def bench_dns_cache():
+    stub = StubResolver({
+        "evil-host.test": ["203.0.113.7"],
+        "dual-stack.test": ["198.18.0.1", "2001:db8::42"],
+        "clean.test": ["198.18.0.2"],
+        "short-ttl.test": (["198.18.0.3"], 1),
+    })
+    clock = FakeClock()
+    resolver = CachingResolver(stub, ttl=300, negative_ttl=60, clock=clock)
+    # 문서용 대역만 있는 목록이므로 DNS 조회를 강제로 켬
+    reputation = IpReputation(CidrBlocklist(["203.0.113.0/24", "2001:db8::/32"]), resolver, resolve_hostnames=True)
+
+    hosts = ["evil-host.test", "dual-stack.test", "clean.test", "missing.test"] * 250
+    started = time.perf_counter()
+    results = [reputation.match(host) for host in hosts]
+    elapsed = time.perf_counter() - started
+    assert results[:4] == ["203.0.113.7 ∈ 203.0.113.0/24", "2001:db8::42 ∈ 2001:db8::/32", None, None]
+    assert stub.calls == 4, stub.calls
+    print(f"[DNS 캐시] 조회 {len(hosts)}회 → resolver 호출 {stub.calls}회, {elapsed * 1000:.0f}ms "
+          f"(캐시 없이: 약 {len(hosts) * STUB_DELAY_SECONDS * 1000:.0f}ms)")
+
+    reputation.match("short-ttl.test")
+    clock.now += 2          # 레코드 TTL(1초) 경과 → 재조회
+    reputation.match("short-ttl.test")
+    clock.now += 100        # 실패 캐시(60초) 만료 → 재조회, 정상 결과(300초)는 유지
+    reputation.match("missing.test")
+    reputation.match("evil-host.test")
+    assert stub.calls == 4 + 2 + 1, stub.calls
+    print(f"[DNS 캐시] TTL 만료 후 재조회 확인 (resolver 호출 {stub.calls}회) / {resolver.summary()}")
+
+    engine = RuleEngine({"threshold": 2, "rules": [
+        {"id": "ip_host", "type": "ip_host", "weight": 1, "reason": "IP 주소 기반 URL"},
+        {"id": "bad_network", "type": "blocklist", "list": "bad_networks", "fields": ["url", "data"], "weight": 2,
+         "reason": "위험 IP 대역 ({match})"},
+    ]}, {"bad_networks": reputation})
+    assert engine.evaluate("https://evil-host.test/login") == (2, ["위험 IP 대역 (203.0.113.7 ∈ 203.0.113.0/24)"])
+    assert engine.evaluate("http://[2001:db8::5]/a")[0] == 3
+    assert engine.evaluate("http://999.1.1.1/a") == (0, [])
+    assert engine.evaluate("https://clean.test/") == (0, [])
+    print("[규칙 엔진] 도메인 → DNS → 위험 대역 / IPv6 주소 / 잘못된 옥텟 판정 확인")
+
+def bench_dns_guards():
+    stub = StubResolver({"evil-host.test": ["203.0.113.7"]})
+    default = IpReputation(load_cidr_blocklist(BAD_NETWORKS_LIST_PATH), CachingResolver(stub))
+    assert default.match("evil-host.test") is None and default.match("203.0.113.7") is not None
+    assert stub.calls == 0, stub.calls
+    default.networks.update(["198.18.0.0/15"])   # 실제 대역이 추가되면 DNS 조회 시작
+    assert default.match("evil-host.test") == "203.0.113.7 ∈ 203.0.113.0/24" and stub.calls == 1
+    print("[DNS 생략] 기본 목록(문서용 예시 대역)만 있을 때 resolver 호출 0회, 실제 대역 추가 후 조회")
+
+    hanging = StubResolver({"slow.test": ["203.0.113.9"]}, delay=HANGING_DNS_SECONDS)
+    reputation = IpReputation(CidrBlocklist(["203.0.113.0/24"]), CachingResolver(hanging, timeout=DNS_TIMEOUT_SECONDS),
+                              resolve_hostnames=True)
+    started = time.perf_counter()
+    assert reputation.match("https://slow.test/") is None
+    elapsed = time.perf_counter() - started
+    assert elapsed < HANGING_DNS_SECONDS / 2, elapsed
+    assert reputation.match("https://slow.test/") is None and hanging.calls == 1  # 시간 초과도 실패 캐시에 남음
+    print(f"[DNS 시간 제한] 응답 없는 DNS({HANGING_DNS_SECONDS}초) → {elapsed * 1000:.0f}ms에 조회 포기 "
+          f"(timeout {DNS_TIMEOUT_SECONDS}초) / {reputation.resolver.summary()}")
+
+def main():
+    rng = np.random.default_rng(SEED)
+    bench_cidr(rng)
+    bench_ip_detection()
+    bench_dns_cache()
+    bench_dns_guards()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# 야간 모드 처리 벤치마크
+# 1) 어두운 합성 프레임에서 기존 방식(그레이 변환 2회 + 매번 CLAHE 생성 + BGR 재변환 후 디코딩)과
+#    LowLightProcessor(격자 밝기 추정 + CLAHE 재사용 + 단일 채널 디코딩)의 프레임당 시간 / 디코딩 성공률 비교
+# 2) 밝기가 기준값 근처에서 흔들리는 프레임열에서 야간 모드 전환(깜빡임) 횟수 비교
+#
+# 실행: python src/benchmarks/bench_low_light.py
+import os, sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import cv2
+import numpy as np
+
+from low_light import LowLightProcessor
+from qr_detection import QRDecoderSession
+
+RESOLUTIONS = [(1280, 720), (1920, 1080)]
+SAMPLES = 20
+SEED = 99
+
+def make_dark_frames(width, height, rng):
+    frames = []
+    for i in range(SAMPLES):
+        payload = f"https://example.com/night/{i}"
+        qr_size = height // 3
+        qr = cv2.resize(cv2.QRCodeEncoder.create().encode(payload), (qr_size, qr_size),
+                        interpolation=cv2.INTER_NEAREST)
+        frame = np.full((height, width, 3), 200, dtype=np.uint8)
+        x, y = int(rng.integers(0, width - qr_size)), int(rng.integers(0, height - qr_size))
+        frame[y:y + qr_size, x:x + qr_size] = cv2.cvtColor(qr, cv2.COLOR_GRAY2BGR)
+        dark = frame.astype(np.float32) * rng.uniform(0.1, 0.2) + rng.normal(0, 2, frame.shape)
+        frames.append((np.clip(dark, 0, 255).astype(np.uint8), payload))
+    return frames
+
+def legacy_process(frame, decode):
+    """기존 QR_Webcam_Scanner_Ver5의 is_dark_environment + enhance_for_low_light 흐름"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if np.mean(gray) < 50:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+        frame = cv2.cvtColor(clahe.apply(gray), cv2.COLOR_GRAY2BGR)
+    return decode(frame)[0]
+
+def shared_process(frame, decode, processor):
+    if processor.is_dark(frame):
+        frame = processor.enhance(frame)
+    return decode(frame)[0]
+
+def run(process, frames):
+    correct = 0
+    started = time.perf_counter()
+    for frame, payload in frames:
+        correct += process(frame) == payload
+    return (time.perf_counter() - started) / len(frames), correct / len(frames)
+
+def count_flicker(rng, processor, frames=300):
+    # 평균 밝기 50 근처에서 ±3 정도 흔들리는 장면 (해 질 녘, 형광등 깜빡임 등)
+    legacy_switches, legacy_dark = 0, False
+    for level in 50 + rng.normal(0, 3, frames):
+        frame = np.full((120, 160, 3), int(np.clip(level, 0, 255)), dtype=np.uint8)
+        dark = np.mean(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)) < 50
+        legacy_switches += dark != legacy_dark
+        legacy_dark = dark
+        processor.is_dark(frame)
+    return legacy_switches, processor.stats["switches"]
+
+def main():
+    rng = np.random.default_rng(SEED)
+    session = QRDecoderSession()
+    processor = LowLightProcessor()
+
+    skip_decode = lambda image: ("", None, None)  # 전처리 시간만 측정할 때 사용
+    print(f"{'해상도':<12}{'전처리(기존/신규)':>22}{'디코딩 포함(기존/신규)':>26}{'성공률(기존/신규)':>20}")
+    with session:
+        for width, height in RESOLUTIONS:
+            frames = make_dark_frames(width, height, rng)
+            legacy_prep, _ = run(lambda frame: legacy_process(frame, skip_decode), frames)
+            shared_prep, _ = run(lambda frame: shared_process(frame, skip_decode, processor), frames)
+            legacy_time, legacy_rate = run(lambda frame: legacy_process(frame, session.decode), frames)
+            shared_time, shared_rate = run(lambda frame: shared_process(frame, session.decode, processor), frames)
+            resolution = f"{width}x{height}"
+            print(f"{resolution:<12}{legacy_prep * 1000:>10.2f}ms / {shared_prep * 1000:.2f}ms"
+                  f"{legacy_time * 1000:>14.1f}ms / {shared_time * 1000:.1f}ms"
+                  f"{legacy_rate * 100:>12.0f}% / {shared_rate * 100:.0f}%")
+
+    processor = LowLightProcessor()
+    legacy_switches, switches = count_flicker(rng, processor)
+    print(f"[모드 전환] 밝기 50±3 장면 300프레임: 기존 {legacy_switches}회 → 히스테리시스 적용 {switches}회")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# 피라미드 모드 벤치마크
+# 해상도별로 합성 QR 프레임(무작위 위치, 프레임 높이의 15~30% 크기)을 만들어
+# 원본 전체 디코딩과 PyramidDetector의 지연 시간 / 디코딩 성공률을 비교함.
+# 축소 비율이 "-"인 해상도(1080p 미만)는 PyramidDetector도 원본 전체를 디코딩함.
+#
+# 실행: python src/benchmarks/bench_pyramid.py
+import os, sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import cv2
+import numpy as np
+
+from qr_detection import QRDecoderSession, PyramidDetector
+
+RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440), (3840, 2160)]
+SAMPLES = 20
+SEED = 1234
+
+def make_samples(width, height, rng, count=SAMPLES):
+    samples = []
+    for i in range(count):
+        payload = f"https://example.com/scooter/{i:04d}"
+        qr_size = int(height * rng.uniform(0.15, 0.30))
+        qr = cv2.QRCodeEncoder.create().encode(payload)
+        qr = cv2.resize(qr, (qr_size, qr_size), interpolation=cv2.INTER_NEAREST)
+        frame = rng.integers(90, 170, size=(height, width, 3), dtype=np.uint8)  # 잡음 배경
+        x = int(rng.integers(0, width - qr_size))
+        y = int(rng.integers(0, height - qr_size))
+        frame[y:y + qr_size, x:x + qr_size] = cv2.cvtColor(qr, cv2.COLOR_GRAY2BGR)
+        samples.append((frame, payload))
+    return samples
+
+def run(decode, samples):
+    correct = 0
+    started = time.perf_counter()
+    for frame, payload in samples:
+        data, _, _ = decode(frame)
+        correct += data == payload
+    return (time.perf_counter() - started) / len(samples), correct / len(samples)
+
+def main():
+    rng = np.random.default_rng(SEED)
+    session = QRDecoderSession()
+    pyramid = PyramidDetector(session.detector, session.decode)
+
+    print(f"{'해상도':<12}{'축소 비율':<18}{'원본':>10}{'피라미드':>10}{'성공률(원본/피라미드)':>24}")
+    with session:
+        for width, height in RESOLUTIONS:
+            samples = make_samples(width, height, rng)
+            full_time, full_rate = run(session.decode, samples)
+            pyramid_time, pyramid_rate = run(pyramid.decode, samples)
+            resolution = f"{width}x{height}"
+            scales = ",".join(f"{s:g}" for s in pyramid.scales_for(samples[0][0])) or "-"
+            print(f"{resolution:<12}{scales:<18}{full_time * 1000:>8.1f}ms{pyramid_time * 1000:>8.1f}ms"
+                  f"{full_rate * 100:>14.0f}% / {pyramid_rate * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# 리다이렉션 추적 벤치마크
+# 로컬 HTTP 서버가 리다이렉션 체인을 흉내내고(/hop/<남은 홉>/<id> → ... → 200 + 큰 본문),
+# 기존 방식(홉마다 requests.get, Session 없음)과 redirect_resolver(공유 Session, HEAD 우선)의
+# 초당 처리 홉 수를 비교함.
+#
+# 실행: python src/benchmarks/bench_redirect_resolver.py
+import os, sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import requests
+
+import redirect_resolver
+
+HOPS_PER_CHAIN = 5          # 체인당 리다이렉션 횟수 (resolve_redirects의 max_redirects와 동일)
+CHAINS = 200                # 측정할 체인 개수
+FINAL_BODY_SIZE = 256 * 1024  # 최종 페이지 본문 크기 (기존 방식은 이것을 모두 다운로드함)
+
+class RedirectChainHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive 지원
+    final_body = b"x" * FINAL_BODY_SIZE
+
+    def respond(self, send_body):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "hop" and int(parts[1]) > 0:
+            self.send_response(302)
+            self.send_header("Location", f"/hop/{int(parts[1]) - 1}/{parts[2]}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(self.final_body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(self.final_body)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def log_message(self, format, *args):
+        pass  # 요청 로그 출력 안 함
+
+# 기존 QR_Webcam_Scanner_Ver5.resolve_redirects와 같은 방식 (비교 기준)
+def legacy_resolve(url, timeout=5, max_redirects=HOPS_PER_CHAIN):
+    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+    current_url = url
+    for _ in range(max_redirects + 1):
+        response = requests.get(current_url, headers=headers, allow_redirects=False, timeout=timeout)
+        if 300 <= response.status_code < 400:
+            current_url = requests.compat.urljoin(current_url, response.headers["Location"])
+        else:
+            break
+    return current_url
+
+def pooled_resolve(url):
+    result = redirect_resolver.resolve_redirect_chain(url, max_redirects=HOPS_PER_CHAIN + 1, use_cache=False)
+    return result["final_url"]
+
+def measure(name, resolve, base_url):
+    started = time.perf_counter()
+    for i in range(CHAINS):
+        final_url = resolve(f"{base_url}/hop/{HOPS_PER_CHAIN}/{name}-{i}")
+        assert final_url.endswith(f"/hop/0/{name}-{i}"), final_url
+    elapsed = time.perf_counter() - started
+    # 체인당 요청 수 = 리다이렉션 홉 + 최종 페이지 1회
+    requests_made = CHAINS * (HOPS_PER_CHAIN + 1)
+    print(f"{name:<10}{elapsed:>10.2f}s{requests_made / elapsed:>14.0f} hops/s")
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RedirectChainHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"[설정] 체인 {CHAINS}개 x 리다이렉션 {HOPS_PER_CHAIN}회, 최종 본문 {FINAL_BODY_SIZE // 1024}KB")
+    print(f"{'방식':<10}{'소요 시간':>11}{'처리량':>15}")
+    measure("legacy", legacy_resolve, base_url)
+    measure("pooled", pooled_resolve, base_url)
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# ROI 추적 모드 벤치마크
+# 해상도별로 QR이 조금씩 움직이는 프레임을 만들어,
+# 매 프레임 전체 검색할 때와 QRTracker(직전 bbox 주변만 디코딩)를 쓸 때의 프레임당 디코딩 시간을 비교함.
+#
+# 실행: python src/benchmarks/bench_roi_tracking.py
+import os, sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import cv2
+import numpy as np
+
+from qr_detection import QRDecoderSession, QRTracker
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+FRAMES = 60
+QR_SIZE = 240
+QR_PAYLOAD = "https://example.com/kiosk/1234"
+
+# QR이 프레임마다 오른쪽으로 조금씩 이동하는 영상 흉내
+def make_moving_frames(width, height, count=FRAMES):
+    qr = cv2.QRCodeEncoder.create().encode(QR_PAYLOAD)
+    qr = cv2.cvtColor(cv2.resize(qr, (QR_SIZE, QR_SIZE), interpolation=cv2.INTER_NEAREST), cv2.COLOR_GRAY2BGR)
+    frames = []
+    for i in range(count):
+        frame = np.full((height, width, 3), 180, dtype=np.uint8)
+        x = (width - QR_SIZE) // 4 + i * 2
+        y = (height - QR_SIZE) // 2
+        frame[y:y + QR_SIZE, x:x + QR_SIZE] = qr
+        frames.append(frame)
+    return frames
+
+def run(detect, frames):
+    found = 0
+    started = time.perf_counter()
+    for frame in frames:
+        data, bbox = detect(frame)
+        found += bool(data)
+    return (time.perf_counter() - started) / len(frames), found
+
+def main():
+    session = QRDecoderSession()
+
+    def full_frame(frame):
+        data, bbox, _ = session.decode(frame)
+        return data, bbox
+
+    print(f"{'해상도':<12}{'전체 검색':>12}{'ROI 추적':>12}{'배속':>8}{'인식(전체/ROI)':>18}")
+    with session:
+        for width, height in RESOLUTIONS:
+            frames = make_moving_frames(width, height)
+            tracker = QRTracker(session.decode)
+            full_time, full_found = run(full_frame, frames)
+            roi_time, roi_found = run(tracker.detect, frames)
+            resolution = f"{width}x{height}"
+            print(f"{resolution:<12}{full_time * 1000:>10.1f}ms{roi_time * 1000:>10.1f}ms"
+                  f"{full_time / roi_time:>7.1f}x{full_found:>10}/{roi_found}")
+
+if __name__ == "__main__":
+    main()
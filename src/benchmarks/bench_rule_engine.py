@@ -0,0 +1,152 @@
+# URL 규칙 엔진 벤치마크
+# 1) 기본 규칙(9개): 기존 is_suspicious_qr의 인라인 검사(if 분기 + 호출마다 re.match)와
+#    RuleEngine(설정 파일 규칙을 한 번 컴파일, 문자열 규칙은 검사 대상별 하나의 정규식으로 합침)의
+#    처리량을 비교하고, 두 방식의 판정이 같은지 확인
+# 2) 피싱 키워드 규칙 200개 추가: 규칙을 하나씩 검사하는 방식과 합친 정규식 방식의 규칙/초 비교
+# (리다이렉션 추적은 제외하고 최종 URL = 원본으로 검사, 각 측정은 3회 중 가장 빠른 값)
+#
+# 실행: python src/benchmarks/bench_rule_engine.py
+import os, sys
+import re
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import numpy as np
+
+from domain_blocklist import load_blocklist, PHISHING_LIST_PATH, SHORTENER_LIST_PATH
+from rule_engine import RuleEngine
+
+SEED = 21
+PAYLOADS = 50_000
+EXTRA_KEYWORD_RULES = 200
+REPEAT = 3
+
+def legacy_evaluate(data, phishing_blocklist, shortener_blocklist):
+    """기존 QR_Webcam_Scanner_Ver5.is_suspicious_qr의 검사 부분 (차단 목록은 같은 인덱스 사용)"""
+    suspicion_count = 0
+    reasons = []
+    if data.startswith("http://") or data.startswith("https://"):
+        parsed = urlparse(data)
+        domain = parsed.netloc.lower()
+        dangerous_extensions = [".exe", ".apk", ".bat", ".sh"]
+        phishing_match = phishing_blocklist.match(data)
+        if phishing_match:
+            reasons.append(f"피싱 DB 등록 도메인 ({phishing_match})")
+            suspicion_count += 2
+        if shortener_blocklist.match(data):
+            reasons.append("짧은 URL 서비스 사용")
+            suspicion_count += 1
+        if any(parsed.path.lower().endswith(ext) for ext in dangerous_extensions):
+            reasons.append("위험 확장자 포함")
+            suspicion_count += 1
+        if re.match(r"^\d{1,3}(\.\d{1,3}){3}$", domain):
+            reasons.append("IP 주소 기반 URL")
+            suspicion_count += 1
+        if len(data) > 200:
+            reasons.append("URL 길이 과도함")
+            suspicion_count += 1
+    if data.strip().lower().startswith("javascript:"):
+        reasons.append("JavaScript 실행 코드 포함")
+        suspicion_count += 1
+    if re.match(r"^[A-Za-z0-9+/=]{100,}$", data):
+        reasons.append("Base64 인코딩된 긴 문자열")
+        suspicion_count += 1
+    return suspicion_count, reasons
+
+def make_payloads(rng, count):
+    # 대부분은 평범한 URL, 일부는 의심 조건을 하나 이상 포함
+    templates = [
+        lambda i: f"https://www.example{i}.com/products/{i}?ref=qr",
+        lambda i: f"https://shop{i}.co.kr/event/{i}",
+        lambda i: f"https://bit.ly/{i:x}",
+        lambda i: f"http://192.168.{i % 256}.{i % 200}/update.apk",
+        lambda i: f"https://login.free-nitro.com/claim/{i}",
+        lambda i: f"https://cdn{i}.example.org/files/setup{i}.EXE",
+        lambda i: "https://tracking.example.com/?" + "q=" + "a" * 210,
+        lambda i: " JavaScript:alert(1)",
+        lambda i: "QUJD" * 30,
+        lambda i: f"WIFI:S:cafe{i};T:WPA;P:password;;",
+    ]
+    weights = np.array([40, 20, 5, 5, 5, 5, 5, 5, 5, 5], dtype=float)
+    choices = rng.choice(len(templates), size=count, p=weights / weights.sum())
+    return [templates[choice](i) for i, choice in enumerate(choices)]
+
+class OneByOneEngine(RuleEngine):
+    """비교용: 문자열 규칙을 합치지 않고 규칙마다 개별 정규식으로 검사"""
+    def __init__(self, config, blocklists=None):
+        super().__init__(config, blocklists)
+        self.one_by_one = {}
+        for index, rule in enumerate(self.rules):
+            if rule["type"] == "substring":
+                source = "|".join(re.escape(value) for value in rule["values"])
+                pattern = re.compile(source, re.IGNORECASE if rule.get("ignore_case") else 0)
+                self.one_by_one.setdefault(rule.get("field", "data"), []).append((index, pattern))
+        for field, singles in self.singles.items():
+            self.one_by_one.setdefault(field, []).extend(singles)
+
+    def match_patterns(self, fields):
+        matched = {}
+        for field, singles in self.one_by_one.items():
+            value = fields.get(field)
+            if value is None:
+                continue
+            for index, pattern in singles:
+                m = pattern.search(value)
+                if m:
+                    matched[index] = m.group()
+        return matched
+
+def with_keyword_rules(config, rng, count):
+    # 피싱 페이지에 흔한 단어 조합을 URL 부분 문자열 규칙으로 추가
+    words = ["login", "verify", "account", "secure", "update", "wallet", "gift", "nitro", "bonus", "refund",
+             "bank", "signin", "support", "unlock", "claim", "airdrop", "prize", "invoice", "delivery", "kakao"]
+    rules = list(config["rules"])
+    for i in range(count):
+        first, second = rng.choice(len(words), size=2, replace=False)
+        rules.append({"id": f"keyword_{i}", "type": "substring", "field": "url", "ignore_case": True,
+                      "values": [f"{words[first]}-{words[second]}{i}"], "weight": 1,
+                      "reason": f"피싱 키워드 {i}"})
+    return dict(config, rules=rules)
+
+def best_time(function, payloads):
+    best = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        results = [function(data) for data in payloads]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+def main():
+    rng = np.random.default_rng(SEED)
+    payloads = make_payloads(rng, PAYLOADS)
+    phishing = load_blocklist(PHISHING_LIST_PATH)
+    shortener = load_blocklist(SHORTENER_LIST_PATH)
+    blocklists = {"phishing": phishing, "shortener": shortener}
+    engine = RuleEngine.from_file(blocklists=blocklists)
+    rules = len(engine.rules)
+    print(f"[설정] QR 데이터 {len(payloads):,}개, 기본 규칙 {rules}개 (기준 점수 {engine.threshold})")
+
+    legacy_time, legacy_results = best_time(lambda data: legacy_evaluate(data, phishing, shortener), payloads)
+    engine_time, engine_results = best_time(engine.evaluate, payloads)
+    mismatches = sum(a != b for a, b in zip(legacy_results, engine_results))
+    print(f"[기존 인라인 검사] {len(payloads) / legacy_time:>10,.0f}건/초")
+    print(f"[규칙 엔진]       {len(payloads) / engine_time:>10,.0f}건/초 ({len(payloads) * rules / engine_time:,.0f}규칙/초)")
+    print(f"[판정 비교] 불일치 {mismatches}건 / 악성 판정 {sum(engine.is_bad(score) for score, _ in engine_results):,}건")
+
+    config = with_keyword_rules({"threshold": engine.threshold, "rules": engine.rules}, rng, EXTRA_KEYWORD_RULES)
+    rules = len(config["rules"])
+    combined = RuleEngine(config, blocklists)
+    one_by_one = OneByOneEngine(config, blocklists)
+    one_time, one_results = best_time(one_by_one.evaluate, payloads)
+    combined_time, combined_results = best_time(combined.evaluate, payloads)
+    mismatches = sum(a != b for a, b in zip(one_results, combined_results))
+    print(f"[규칙 {rules}개] 규칙별 개별 검사 {len(payloads) * rules / one_time:>12,.0f}규칙/초 "
+          f"({len(payloads) / one_time:,.0f}건/초)")
+    print(f"[규칙 {rules}개] 합친 정규식     {len(payloads) * rules / combined_time:>12,.0f}규칙/초 "
+          f"({len(payloads) / combined_time:,.0f}건/초, 판정 불일치 {mismatches}건)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# 합성 QR 벤치마크 모음
+# 내용을 알고 있는 QR 이미지를 만들고 열화(축소, 원근 왜곡, 모션 블러, 잡음, 어둡게, 다중 QR)를 적용한 뒤
+# 스캐너의 디코딩 경로별 처리량 / 지연 시간(p50, p95, p99) / 디코딩 정확도를 표와 JSON으로 출력함.
+#   - detect_qr_opencv : QR_Webcam_Scanner_Ver5.detect_qr_opencv (분석 제출은 제외)
+#   - low_light        : enhance_for_low_light 전처리 후 디코딩 (야간 모드 경로 강제 적용)
+#   - multi_qr         : MULTI_QR_MODE를 켠 detect_qr_opencv
+#   - pyzbar           : qr_decoders의 pyzbar 백엔드 (설치된 경우에만)
+#
+# 실행: python src/benchmarks/bench_synthetic_qr.py [--json result.json] [--compare baseline.json]
+import os, sys
+import argparse
+import json
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import cv2
+import numpy as np
+
+import QR_Webcam_Scanner_Ver5 as scanner
+from qr_decoders import PyzbarDecoder
+
+SEED = 2024
+SAMPLES_PER_CASE = 15
+FRAME_SIZE = (640, 480)
+
+# ------------------------------
+# QR 이미지 생성
+# ------------------------------
+def render_qr(payload, size):
+    try:
+        import qrcode  # scan_noopencv.py에서 쓰던 라이브러리, 없으면 OpenCV 인코더 사용
+        image = np.array(qrcode.make(payload, border=4).convert("L"))
+    except ImportError:
+        image = cv2.QRCodeEncoder.create().encode(payload)
+    return cv2.resize(image, (size, size), interpolation=cv2.INTER_NEAREST)
+
+def place(canvas, qr, x, y):
+    canvas[y:y + qr.shape[0], x:x + qr.shape[1]] = cv2.cvtColor(qr, cv2.COLOR_GRAY2BGR)
+
+def base_frame(rng, payloads, qr_size=220):
+    width, height = FRAME_SIZE
+    frame = np.full((height, width, 3), int(rng.integers(170, 230)), dtype=np.uint8)
+    slot_width = width // len(payloads)
+    for i, payload in enumerate(payloads):
+        qr = render_qr(payload, min(qr_size, slot_width - 10))
+        x = i * slot_width + (slot_width - qr.shape[1]) // 2
+        y = (height - qr.shape[0]) // 2
+        place(frame, qr, x, y)
+    return frame
+
+# ------------------------------
+# 열화 함수 (frame, rng) → frame
+# ------------------------------
+def degrade_scale(frame, rng):
+    scale = rng.uniform(0.35, 0.6)
+    small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    out = np.full_like(frame, int(frame[0, 0, 0]))
+    out[:small.shape[0], :small.shape[1]] = small
+    return out
+
+def degrade_perspective(frame, rng):
+    height, width = frame.shape[:2]
+    src = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    jitter = rng.uniform(0.05, 0.15, size=(4, 2)) * [width, height]
+    dst = np.float32([[jitter[0][0], jitter[0][1]], [width - jitter[1][0], jitter[1][1]],
+                      [width - jitter[2][0], height - jitter[2][1]], [jitter[3][0], height - jitter[3][1]]])
+    matrix = cv2.getPerspectiveTransform(src, dst)
+    return cv2.warpPerspective(frame, matrix, (width, height), borderValue=tuple(int(v) for v in frame[0, 0]))
+
+def degrade_motion_blur(frame, rng):
+    length = int(rng.integers(5, 11))
+    kernel = np.zeros((length, length), dtype=np.float32)
+    kernel[length // 2, :] = 1.0 / length
+    angle = float(rng.uniform(0, 180))
+    rotation = cv2.getRotationMatrix2D((length / 2 - 0.5, length / 2 - 0.5), angle, 1.0)
+    kernel = cv2.warpAffine(kernel, rotation, (length, length))
+    return cv2.filter2D(frame, -1, kernel / kernel.sum())
+
+def degrade_noise(frame, rng):
+    noise = rng.normal(0, rng.uniform(20, 40), frame.shape)
+    return np.clip(frame.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+
+def degrade_dark(frame, rng):
+    gain = rng.uniform(0.08, 0.18)
+    dark = frame.astype(np.float32) * gain
+    return np.clip(dark + rng.normal(0, 2, frame.shape), 0, 255).astype(np.uint8)
+
+# 케이스 이름 → (QR 개수, 열화 함수)
+CASES = {
+    "clean": (1, lambda frame, rng: frame),
+    "scale": (1, degrade_scale),
+    "perspective": (1, degrade_perspective),
+    "motion_blur": (1, degrade_motion_blur),
+    "noise": (1, degrade_noise),
+    "dark": (1, degrade_dark),
+    "multi": (3, lambda frame, rng: frame),
+}
+
+def make_dataset(rng):
+    dataset = []
+    for case, (codes, degrade) in CASES.items():
+        for i in range(SAMPLES_PER_CASE):
+            payloads = [f"https://example.com/{case}/{i}/{j}" for j in range(codes)]
+            dataset.append((case, degrade(base_frame(rng, payloads), rng), payloads))
+    return dataset
+
+# ------------------------------
+# 디코딩 경로 (frame → 디코딩된 문자열 목록)
+# ------------------------------
+def reset_scanner_state():
+    # 샘플끼리는 서로 다른 장면이므로 추적/정지 장면 상태를 초기화
+    scanner.qr_tracker.reset()
+    scanner.change_detector.reset()
+    scanner.low_light_processor.reset()
+    scanner.last_detect_times.clear()
+    scanner.current_analyses.clear()
+
+def path_detect_qr_opencv(frame):
+    reset_scanner_state()
+    scanner.detect_qr_opencv(frame.copy())
+    detections, _ = scanner.last_decode_result
+    return [data for data, _ in detections]
+
+def path_multi_qr(frame):
+    scanner.MULTI_QR_MODE = True
+    try:
+        return path_detect_qr_opencv(frame)
+    finally:
+        scanner.MULTI_QR_MODE = False
+
+def path_low_light(frame):
+    reset_scanner_state()
+    enhanced = scanner.enhance_for_low_light(frame)
+    return [data for data, _ in scanner.decode_qr_codes(enhanced)]
+
+def make_paths():
+    paths = {"detect_qr_opencv": path_detect_qr_opencv, "low_light": path_low_light, "multi_qr": path_multi_qr}
+    if PyzbarDecoder.is_available():
+        pyzbar_decoder = PyzbarDecoder()
+        paths["pyzbar"] = lambda frame: [data for data, _ in pyzbar_decoder.decode(frame)]
+    return paths
+
+# ------------------------------
+# 측정
+# ------------------------------
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+def run_path(decode, dataset):
+    latencies = []
+    per_case = {case: {"expected": 0, "decoded": 0} for case in CASES}
+    for case, frame, payloads in dataset:
+        started = time.perf_counter()
+        decoded = decode(frame)
+        latencies.append((time.perf_counter() - started) * 1000)
+        per_case[case]["expected"] += len(payloads)
+        per_case[case]["decoded"] += len(set(decoded) & set(payloads))
+
+    total_expected = sum(c["expected"] for c in per_case.values())
+    total_decoded = sum(c["decoded"] for c in per_case.values())
+    return {
+        "images": len(dataset),
+        "throughput_ips": round(len(dataset) / (sum(latencies) / 1000), 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        },
+        "accuracy": round(total_decoded / total_expected, 4),
+        "accuracy_by_case": {case: round(c["decoded"] / c["expected"], 4) for case, c in per_case.items()},
+    }
+
+def print_table(results):
+    header = f"{'경로':<18}{'처리량':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'정확도':>8}"
+    header += "".join(f"{case:>13}" for case in CASES)
+    print(header)
+    for name, r in results.items():
+        row = (f"{name:<18}{r['throughput_ips']:>7.1f}/s{r['latency_ms']['p50']:>7.1f}ms"
+               f"{r['latency_ms']['p95']:>7.1f}ms{r['latency_ms']['p99']:>7.1f}ms{r['accuracy'] * 100:>7.1f}%")
+        row += "".join(f"{r['accuracy_by_case'][case] * 100:>12.0f}%" for case in CASES)
+        print(row)
+
+# 기준 결과와 비교하여 정확도 하락 / 지연 증가를 회귀로 보고. 회귀가 있으면 True
+def compare(results, baseline, accuracy_drop=0.02, latency_increase=0.25):
+    regressions = []
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if r["accuracy"] < base["accuracy"] - accuracy_drop:
+            regressions.append(f"{name}: 정확도 {base['accuracy'] * 100:.1f}% → {r['accuracy'] * 100:.1f}%")
+        if r["latency_ms"]["p95"] > base["latency_ms"]["p95"] * (1 + latency_increase):
+            regressions.append(f"{name}: p95 {base['latency_ms']['p95']}ms → {r['latency_ms']['p95']}ms")
+    for line in regressions:
+        print(f"[회귀] {line}")
+    if not regressions:
+        print("[회귀 없음] 기준 결과 대비 허용 범위 이내")
+    return bool(regressions)
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 QR 벤치마크")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 파일 (회귀가 있으면 종료 코드 1)")
+    args = parser.parse_args()
+
+    # 리다이렉션 추적 / GUI 팝업 없이 디코딩 경로만 측정
+    scanner.GUI_ENABLED = False
+    scanner.submit_analysis_batch = lambda items, now=None: []
+
+    rng = np.random.default_rng(SEED)
+    dataset = make_dataset(rng)
+    print(f"[설정] 케이스 {len(CASES)}종 x {SAMPLES_PER_CASE}장, 프레임 {FRAME_SIZE[0]}x{FRAME_SIZE[1]}")
+
+    results = {}
+    # 스캐너의 콘솔 확인용 출력은 표에 섞이지 않도록 숨김
+    with scanner.qr_session, open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for name, decode in make_paths().items():
+            results[name] = run_path(decode, dataset)
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": SEED, "samples_per_case": SAMPLES_PER_CASE, "results": results}, f,
+                      ensure_ascii=False, indent=2)
+        print(f"[저장] {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        sys.exit(1 if compare(results, baseline) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# 텍스트 오버레이 벤치마크
+# 기존 draw_text_opencv(매 호출마다 폰트 로드 + 프레임 전체 PIL 변환)와
+# text_overlay.TextOverlay(폰트 / 스프라이트 캐시 + 글자 영역만 블렌딩)의 호출당 시간을 해상도별로 비교함.
+# detect_qr_opencv가 한 프레임에 그리는 문구(경고 문구, 여러 줄 악성 QR 사유, 야간 모드)를 기준으로 측정.
+# 측정 전에 문구마다 기존 방식과 글자가 그려지는 영역(행 / 열 범위)이 같은지 확인함.
+#
+# 실행: python src/benchmarks/bench_text_overlay.py
+import os, sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from text_overlay import TextOverlay
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+ITERATIONS = 100
+LABELS = [
+    ("🚨 위험 QR 코드: 단축 URL 사용, IP 주소 직접 사용", (30, 30), 24, (0, 0, 255)),
+    ("⚠️ 악성 QR 의심:\n- 리다이렉션 감지됨\n- 위험 확장자 포함", (30, 90), 24, (0, 0, 255)),
+    ("🌙 야간 모드 적용됨", (30, 60), 16, (200, 200, 255)),
+]
+
+def legacy_draw_text(img, text, position, font_size, color, font_path):
+    """기존 QR_Webcam_Scanner_Ver5.draw_text_opencv와 같은 방식"""
+    img_pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    draw = ImageDraw.Draw(img_pil)
+    try:
+        font = ImageFont.truetype(font_path, font_size)
+    except (IOError, TypeError):
+        font = ImageFont.load_default()
+    draw.text(position, text, font=font, fill=color)
+    return cv2.cvtColor(np.array(img_pil), cv2.COLOR_RGB2BGR)
+
+def drawn_extent(before, after):
+    """글자가 그려진 (첫 행, 마지막 행, 첫 열, 마지막 열)"""
+    rows, cols = np.nonzero(np.any(before != after, axis=2))
+    return (rows.min(), rows.max(), cols.min(), cols.max()) if rows.size else None
+
+def check_extents(overlay, font_path):
+    if overlay.font_path is None:
+        # 기존 방식의 기본 폰트(크기 지정 없음)와 크기가 달라 비교 의미가 없음
+        print("[확인] 폰트 파일이 없어 기존 방식과의 영역 비교를 건너뜀 (QR_SCANNER_FONT로 지정 가능)")
+        return
+    blank = np.full((240, 640, 3), 128, dtype=np.uint8)
+    for text, position, size, color in LABELS:
+        legacy = drawn_extent(blank, legacy_draw_text(blank.copy(), text, position, size, color, font_path))
+        cached = drawn_extent(blank, overlay.draw(blank.copy(), text, position, size, color))
+        assert legacy == cached, (text, legacy, cached)
+    print(f"[확인] 문구 {len(LABELS)}개 모두 기존 방식과 그려지는 영역이 같음 (여러 줄 문구 포함)")
+
+def measure(draw, frame):
+    elapsed = 0.0
+    for _ in range(ITERATIONS):
+        image = frame.copy()  # 프레임 복사 비용은 측정에서 제외
+        started = time.perf_counter()
+        for text, position, size, color in LABELS:
+            image = draw(image, text, position, size, color)
+        elapsed += time.perf_counter() - started
+    return elapsed / ITERATIONS
+
+def main():
+    overlay = TextOverlay()
+    overlay.resolve_font()
+    font_path = overlay.font_path or "C:/Windows/Fonts/H2GTRM.TTF"
+    print(f"[설정] 폰트: {overlay.font_path or '기본 폰트'}, 프레임당 문구 {len(LABELS)}개, {ITERATIONS}회 반복")
+    check_extents(overlay, font_path)
+
+    rng = np.random.default_rng(7)
+    print(f"{'해상도':<12}{'기존(PIL 왕복)':>16}{'캐시 오버레이':>16}{'배속':>8}")
+    for width, height in RESOLUTIONS:
+        frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        legacy = measure(lambda image, *args: legacy_draw_text(image, *args, font_path), frame)
+        cached = measure(overlay.draw, frame)
+        resolution = f"{width}x{height}"
+        print(f"{resolution:<12}{legacy * 1000:>14.2f}ms{cached * 1000:>14.3f}ms{legacy / cached:>7.0f}x")
+    print(overlay.summary())
+
+if __name__ == "__main__":
+    main()
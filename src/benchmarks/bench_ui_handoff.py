@@ -0,0 +1,79 @@
+# UI 요청 전달 벤치마크
+# 판정이 끝날 때마다 팝업을 띄우는 쪽(분석 워커)이 얼마나 오래 붙잡히는지 비교함.
+#   - 기존: 미리보기 / 실행 여부 확인마다 스레드를 새로 만들어 시작 (스레드 안에서 tk.Tk() 생성)
+#   - ui_controller: 요청을 UI 스레드의 큐에 넣기만 함
+# 기존 방식의 스레드 대상은 빈 함수로 바꿔서 측정하므로 실제보다 유리하게 나옴 (Tk 생성 시간 제외).
+# 디스플레이가 있으면 tk.Tk() 생성 시간과 UI 스레드가 요청을 창에 반영하는 시간도 측정함.
+# (tk.Tk() 생성은 UI 스레드의 Tk 루트와 겹치지 않도록 controller.start() 전에 메인 스레드에서 측정)
+#
+# 실행: python src/benchmarks/bench_ui_handoff.py
+import os, sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+
+import numpy as np
+import tkinter as tk
+
+from ui_controller import UIController
+
+DETECTIONS = 2000
+TK_CREATIONS = 10
+PAYLOAD = ("https://bit.ly/abc", "https://example.com/landing", 1, ["리다이렉션 감지됨", "짧은 URL 서비스 사용"])
+
+def percentiles(samples):
+    samples = np.array(samples) * 1e6
+    return f"p50 {np.percentile(samples, 50):>7.1f}µs  p99 {np.percentile(samples, 99):>7.1f}µs  최대 {samples.max():>8.1f}µs"
+
+def legacy_handoff():
+    samples = []
+    for _ in range(DETECTIONS):
+        started = time.perf_counter()
+        threading.Thread(target=lambda *args: None, args=PAYLOAD, daemon=True).start()
+        threading.Thread(target=lambda url: None, args=(PAYLOAD[0],), daemon=True).start()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def controller_handoff(controller):
+    samples = []
+    for i in range(DETECTIONS):
+        data = f"{PAYLOAD[0]}/{i % 8}"   # 같은 QR이 반복 스캔되는 상황 (창 재사용)
+        started = time.perf_counter()
+        controller.show_preview(data, *PAYLOAD[1:])
+        controller.confirm_open(data)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def measure_tk_creation():
+    started = time.perf_counter()
+    for _ in range(TK_CREATIONS):
+        root = tk.Tk()
+        root.withdraw()
+        root.update()
+        root.destroy()
+    return (time.perf_counter() - started) / TK_CREATIONS
+
+def main():
+    has_display = bool(os.environ.get("DISPLAY")) or sys.platform in ("win32", "darwin")
+    print(f"[설정] 감지 {DETECTIONS}회 (감지마다 미리보기 + 실행 여부 확인 요청)")
+    print(f"[기존 스레드 생성]   {percentiles(legacy_handoff())}")
+
+    controller = UIController()
+    if has_display:
+        print(f"[tk.Tk() 생성]      {measure_tk_creation() * 1000:.1f}ms (기존 방식은 감지마다 2회)")
+        controller.start()
+    print(f"[UI 큐 전달]        {percentiles(controller_handoff(controller))}")
+
+    if not has_display:
+        print("[참고] 디스플레이가 없어 Tk 생성 / 창 반영 시간은 측정하지 않음")
+        return
+
+    # UI 스레드가 쌓인 요청을 모두 처리할 때까지 대기
+    while not controller.requests.empty():
+        time.sleep(0.05)
+    controller.stop()
+    print(controller.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# 헤드리스 실행 시작 시간 예산 확인 (예산을 넘거나 지연 로드 대상 모듈을 불러오면 종료 코드 1)
+# 저장소에 테스트 모음이 없으므로 CI / 커밋 전에 직접 실행하는 확인 스크립트로 둠.
+#   1) 빈 영상(QR 없음)으로 헤드리스 분석을 새 프로세스에서 여러 번 실행해서 중앙값이 예산 이내인지 확인
+#      (프로세스 시작 → 모듈 import → 영상 열기 / 분석 → 종료까지)
+#   2) 같은 경로를 -X importtime으로 한 번 더 실행해서 requests / tkinter / PIL 등을 불러오지 않는지 확인
+#      (시간은 기기마다 다르지만 이 확인은 기기와 관계없이 항상 같아야 함)
+#
+# 실행: python src/benchmarks/check_startup_budget.py [--budget 0.3] [--runs 5]
+import os, sys
+import argparse
+import statistics
+import tempfile
+
+from startup_report import make_blank_video, run_scanner, parse_importtime, loaded_lazy_modules
+
+# 헤드리스 시작 시간 예산(초). 이 저장소 개발 환경에서 중앙값 약 0.2초 (지연 로드 전에는 약 0.35초)
+# 느린 기기에서는 --budget 또는 환경 변수 QR_STARTUP_BUDGET으로 조정
+STARTUP_BUDGET_SECONDS = float(os.environ.get("QR_STARTUP_BUDGET", 0.3))
+RUNS = 5
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 실행 시작 시간 예산 확인")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS, help="허용하는 시작 시간(초, 중앙값)")
+    parser.add_argument("--runs", type=int, default=RUNS, help="측정 횟수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = make_blank_video(os.path.join(tmp, "blank.avi"))
+        run_scanner(True, video_path)  # 첫 실행은 바이트코드 / 디스크 캐시 준비용으로 제외
+        times = [run_scanner(True, video_path)[0] for _ in range(args.runs)]
+        _, stderr = run_scanner(True, video_path, importtime=True)
+
+    median = statistics.median(times)
+    lazy = loaded_lazy_modules(parse_importtime(stderr))
+    print(f"[시작 시간] 중앙값 {median * 1000:.0f}ms / 최소 {min(times) * 1000:.0f}ms / 최대 {max(times) * 1000:.0f}ms "
+          f"({args.runs}회, 예산 {args.budget * 1000:.0f}ms)")
+    print(f"[지연 로드 대상 중 불러온 모듈] {', '.join(lazy) if lazy else '없음'}")
+
+    failed = False
+    if median > args.budget:
+        print(f"[실패] 시작 시간이 예산을 {(median - args.budget) * 1000:.0f}ms 넘었습니다. "
+              f"startup_report.py --headless로 원인을 확인하세요.")
+        failed = True
+    if lazy:
+        print(f"[실패] 헤드리스 실행에서 불러오면 안 되는 모듈: {', '.join(lazy)}")
+        failed = True
+    if not failed:
+        print("[통과]")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
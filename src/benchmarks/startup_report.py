@@ -0,0 +1,98 @@
+# 시작 시간 보고서 (python -X importtime 결과 요약)
+# 새 파이썬 프로세스에서 스캐너를 실행하면서 모듈별 import 시간을 기록하고,
+# 누적 시간이 큰 최상위 import와 패키지별 합계를 보여 줌.
+#   - 기본: QR_Webcam_Scanner_Ver5 모듈 import만
+#   - --headless: 빈 영상(QR 없음)으로 헤드리스 분석까지 실행 (시작 → 종료까지 불러온 모든 모듈)
+# 무거운 모듈(requests, tkinter, PIL 등)은 처음 사용할 때 불러오도록 바뀌었으므로,
+# 헤드리스 / 배치 실행에서 이 목록에 나타나면 어딘가에서 다시 일찍 불러오고 있는 것.
+#
+# 실행: python src/benchmarks/startup_report.py [--headless] [--top 15]
+import os, sys
+import argparse
+import subprocess
+import tempfile
+import time
+
+FINAL_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+SCANNER_PATH = os.path.join(FINAL_DIR, "QR_Webcam_Scanner_Ver5.py")
+
+# 헤드리스 / 배치 실행에서는 불러오지 않아야 하는 모듈
+LAZY_MODULES = ("requests", "urllib3", "tkinter", "PIL", "webbrowser", "asyncio")
+
+def make_blank_video(path, frames=10, size=(320, 240)):
+    """QR이 없는 짧은 영상 (헤드리스 실행 경로 측정용)"""
+    import cv2
+    import numpy as np
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, size)
+    frame = np.full((size[1], size[0], 3), 128, dtype=np.uint8)
+    for _ in range(frames):
+        writer.write(frame)
+    writer.release()
+    return path
+
+def scanner_command(headless, video_path=None, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    if headless:
+        command += [SCANNER_PATH, "--headless", "--source", video_path, "--events", os.devnull, "--no-dns"]
+    else:
+        command += ["-c", "import QR_Webcam_Scanner_Ver5"]
+    return command
+
+def run_scanner(headless, video_path=None, importtime=False):
+    """(걸린 시간(초), 표준 오류 출력) - 프로세스 시작부터 종료까지"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    started = time.perf_counter()
+    result = subprocess.run(scanner_command(headless, video_path, importtime), cwd=FINAL_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return time.perf_counter() - started, result.stderr
+
+def parse_importtime(stderr):
+    """[(깊이, 자체 시간(µs), 누적 시간(µs), 모듈 이름), ...] (import 순서)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return entries
+
+def loaded_lazy_modules(entries):
+    names = {name for _, _, _, name in entries}
+    return [module for module in LAZY_MODULES if module in names]
+
+def report(entries, top):
+    top_level = sorted((entry for entry in entries if entry[0] <= 1), key=lambda entry: -entry[2])
+    print(f"[누적 시간이 큰 import] (전체 {sum(entry[1] for entry in entries) / 1000:.1f}ms, 모듈 {len(entries)}개)")
+    for depth, _, cumulative_us, name in top_level[:top]:
+        print(f"  {cumulative_us / 1000:>8.1f}ms  {'  ' * depth}{name}")
+
+    packages = {}
+    for _, self_us, _, name in entries:
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print("[패키지별 합계 (자체 시간)]")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {self_us / 1000:>8.1f}ms  {package}")
+
+def main():
+    parser = argparse.ArgumentParser(description="스캐너 시작 시 모듈별 import 시간 보고서")
+    parser.add_argument("--headless", action="store_true", help="빈 영상으로 헤드리스 분석까지 실행해서 측정")
+    parser.add_argument("--top", type=int, default=15, help="표시할 항목 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = make_blank_video(os.path.join(tmp, "blank.avi")) if args.headless else None
+        elapsed, stderr = run_scanner(args.headless, video_path, importtime=True)
+
+    entries = parse_importtime(stderr)
+    print(f"[설정] {'헤드리스 분석 (빈 영상)' if args.headless else '모듈 import'} / 프로세스 전체 {elapsed * 1000:.0f}ms "
+          f"(-X importtime 기록 비용 포함)")
+    report(entries, args.top)
+    lazy = loaded_lazy_modules(entries)
+    print(f"[지연 로드 대상 중 불러온 모듈] {', '.join(lazy) if lazy else '없음'}")
+
+if __name__ == "__main__":
+    main()
@@ -1,291 +1,695 @@
 import cv2
-from PIL import Image, ImageDraw, ImageFont
 import numpy as np
-import sys, os
+import sys
 import time
 
 # ver.2에 추가된 모듈은 아래와 같음.
-import webbrowser       # 웹브라우저 실행 모듈
-import tkinter as tk    # 팝업창 모듈
-from tkinter import messagebox
+# 팝업창(tkinter)과 웹브라우저 실행은 ui_controller.py로 이동 (Tk 루트 하나를 전용 UI 스레드에서 사용)
+# tkinter는 GUI 모드에서 처음 팝업을 띄울 때 불러옴 (get_ui_controller 참고)
 import threading        # tkinter 팝업이 메인 루프를 막지 않도록 스레드 사용.
+import queue            # 캡처 / 감지 / 표시 단계 사이의 버퍼
+import json             # 헤드리스 모드 이벤트 출력 (JSONL)
+import argparse
+from contextlib import redirect_stdout
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor  # 분석 작업을 캡처 루프와 분리
 
 # ver.3에 추가된 모듈은 아래와 같음.
-import re                          # 정규식 검사용
-from urllib.parse import urlparse  # URL 분석용
+# (정규식 / URL 분석은 rule_engine.py로 이동)
 import platform                    # OS 구분용
 
 # ver.4에 추가된 모듈은 아래와 같음.
-import requests         # 리다이렉션 추적 모듈 (악성 URL 변조를 통한 검사망 회피 방지.)
+# 리다이렉션 추적은 redirect_resolver.py로 분리됨 (공유 Session, HEAD 우선 조회, 결과 캐시)
+from redirect_resolver import redirect_cache_summary
+# 체인 전체에 마감 시간을 두는 asyncio 리다이렉션 추적 (시간 초과 시 부분 결과 반환)
+# async_resolver(asyncio)와 requests는 URL을 처음 추적할 때 불러옴 (아래 resolve_with_deadline / resolve_many)
 
 # --- stderr 완전 무력화 (OpenCV 내부 경고 제거 목적) ---
-class SuppressStderr:
-    def __enter__(self):
-        self.original_stderr_fd = sys.stderr.fileno()
-        self.devnull_fd = os.open(os.devnull, os.O_RDWR)
-        self.saved_stderr_fd = os.dup(self.original_stderr_fd)
-        os.dup2(self.devnull_fd, self.original_stderr_fd)
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        os.dup2(self.saved_stderr_fd, self.original_stderr_fd)
-        os.close(self.devnull_fd)
-        os.close(self.saved_stderr_fd)
-
-last_data = None
-last_detect_time = 0
-
-# ver.4에 추가됨: 리다이렉션 추적 함수, User-Agent 헤더 추가
-def resolve_redirects(url, timeout=5, max_redirects=5):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-    }
-    try:
-        current_url = url
-        for _ in range(max_redirects):
-            response = requests.get(current_url, headers=headers, allow_redirects=False, timeout=timeout)
-            if 300 <= response.status_code < 400:
-                # Location 헤더로 리다이렉션 URL 추출
-                location = response.headers.get('Location')
-                if not location:
-                    break
-                # 상대경로를 절대 URL로 변환
-                current_url = requests.compat.urljoin(current_url, location)
-            else:
-                break
-        print(f"[최종 URL] {current_url}")  # 확인용 - 리다이렉션 결과가 항상 출력
-        return current_url
-    
-    except requests.RequestException as e:
-        print(f"[리다이렉션 확인 실패] {e}")
-        return url  # 실패 시 원본 URL 그대로 사용
-    
-# ver.3에 추가됨: 전역 QR 검출기 생성
-qr_detector = cv2.QRCodeDetector()
+# SuppressStderr와 검출기 관리는 qr_detection.py로 분리됨.
+# 프레임마다 검출기를 새로 만들고 stderr를 막던 것을 세션 단위로 한 번만 하도록 변경.
+from qr_detection import QRDecoderSession, QRTracker, PyramidDetector, FrameChangeDetector
+
+# 단계별 지연 시간 측정 (기본 비활성화: --metrics / --hud 옵션으로 켬)
+from scanner_metrics import StageMetrics
+from domain_blocklist import load_blocklist, SHORTENER_LIST_PATH, PHISHING_LIST_PATH
+from blocklist_reloader import BlocklistReloader, DEFAULT_RELOAD_INTERVAL
+from text_overlay import TextOverlay
+from low_light import LowLightProcessor
+from rule_engine import RuleEngine, DEFAULT_RULES_PATH
+from ip_reputation import IpReputation, load_cidr_blocklist, BAD_NETWORKS_LIST_PATH
+metrics = StageMetrics(enabled=False)
+SHOW_METRICS_HUD = False
+
+# 도메인 차단 목록 (src/final/blocklists, 하위 도메인까지 검사). --blocklist로 피싱 피드 추가 가능
+# --watch-blocklists / --blocklist-delta를 지정하면 BlocklistReloader로 교체되어 실행 중에도 자동 갱신됨
+shortener_blocklist = load_blocklist(SHORTENER_LIST_PATH)
+phishing_blocklist = load_blocklist(PHISHING_LIST_PATH)
+
+# 위험 IP 대역 목록 (IP 주소로 된 호스트, 도메인은 DNS로 확인한 주소를 검사). --ip-blocklist로 CIDR 피드 추가 가능
+# 기본 목록은 문서용 예시 대역뿐이라 도메인은 DNS로 확인하지 않음 (실제 피드를 추가하면 DNS 조회 시작)
+ip_reputation = IpReputation(load_cidr_blocklist(BAD_NETWORKS_LIST_PATH))
+
+# URL 의심 조건 규칙 (불러올 때 한 번만 컴파일)
+rule_engine = RuleEngine.from_file(DEFAULT_RULES_PATH, {"phishing": phishing_blocklist, "shortener": shortener_blocklist,
+                                                        "bad_networks": ip_reputation})
+
+# 야간 모드 판단 / 보정 (CLAHE 객체를 한 번만 만들어 재사용)
+low_light_processor = LowLightProcessor(dark_threshold=50)
+
+# 한글 텍스트 오버레이 (폰트 / 글자 스프라이트 캐시)
+text_overlay = TextOverlay()
+
+# 같은 QR을 2초 이내에 다시 감지하지 않도록 QR 내용별 마지막 감지 시각 기록
+# (여러 QR을 동시에 인식하므로 last_data 하나 대신 dict 사용)
+DEBOUNCE_SECONDS = 2
+last_detect_times = {}
+
+# 비동기 분석 단계: 리다이렉션 추적/악성 판정은 워커 스레드에서 수행하고,
+# 캡처 루프는 Future의 완료 여부만 확인하여 프리뷰가 멈추지 않도록 함.
+ANALYSIS_WORKERS = 4          # 동시에 분석 가능한 QR 개수
+OVERLAY_HOLD_SECONDS = 3      # QR이 사라진 뒤에도 판정 결과를 화면에 유지하는 시간
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="qr-analysis")
+current_analyses = {}         # QR 내용 → 분석 항목 (submit_analysis_batch 참고)
+
+# 헤드리스 모드(영상 파일 / 스트림 분석)에서는 GUI 창과 tkinter 팝업을 띄우지 않음
+GUI_ENABLED = True
+ui_controller = None   # 미리보기 / 실행 여부 확인 요청을 UI 스레드로 전달 (get_ui_controller로 생성)
+
+def get_ui_controller():
+    """UIController (처음 호출될 때 tkinter를 불러와서 생성. 헤드리스 / 배치 실행에서는 호출되지 않음)"""
+    global ui_controller
+    if ui_controller is None:
+        from ui_controller import UIController
+        ui_controller = UIController()
+    return ui_controller
+event_sink = None             # 감지/판정 이벤트를 JSONL로 기록할 파일 객체 (헤드리스 모드)
+event_lock = threading.Lock()
+
+# 다중 QR 모드: 한 프레임의 여러 QR을 detectAndDecodeMulti로 한 번에 인식 (포스터/전단지 등)
+# 다중 모드에서는 ROI 추적/피라미드 모드 대신 전체 프레임을 검색함
+MULTI_QR_MODE = False
+
+# ver.3에 추가됨: 전역 QR 검출기 생성 (감지 스레드가 세션 동안 재사용)
+qr_session = QRDecoderSession()
+qr_detector = qr_session.detector
+
+# 피라미드 모드: 고해상도 프레임은 축소본에서 QR 위치를 찾고 원본 해상도의 해당 영역만 디코딩
+# PYRAMID_SCALES가 None이면 프레임 크기에 따라 자동 선택 (긴 변이 PYRAMID_MIN_SIZE 미만인 프레임은 그대로 디코딩)
+PYRAMID_SCALES = None         # 예: [0.25, 0.5]
+PYRAMID_TARGET_SIZE = 640     # 자동 선택 시 가장 작은 축소본의 긴 변 길이
+PYRAMID_MIN_SIZE = 1920       # 1080p 이상에서만 사용 (720p는 축소하면 작은 QR을 놓침)
+qr_pyramid = PyramidDetector(qr_session.detector, qr_session.decode, scales=PYRAMID_SCALES,
+                             target_long_side=PYRAMID_TARGET_SIZE, min_long_side=PYRAMID_MIN_SIZE)
+
+# ROI 추적 모드: QR을 찾은 뒤에는 직전 위치 주변만 디코딩하고, 전체 검색은 N프레임마다만 수행
+ROI_TRACKING = True
+ROI_PADDING = 0.5             # bbox 크기 대비 crop 여유 비율
+FULL_SCAN_INTERVAL = 15       # 추적 중 전체 프레임을 다시 검색하는 간격 (프레임)
+qr_tracker = QRTracker(qr_pyramid.decode, padding=ROI_PADDING, full_scan_interval=FULL_SCAN_INTERVAL)
+
+# 정지 장면 감지: 화면 변화가 없으면 밝기 검사/디코딩을 건너뛰고 직전 결과를 재사용
+SKIP_STATIC_FRAMES = True
+STATIC_DIFF_THRESHOLD = 3.0   # 축소 썸네일의 평균 밝기 차이가 이 값 미만이면 정지 장면
+change_detector = FrameChangeDetector(threshold=STATIC_DIFF_THRESHOLD)
+last_decode_result = ([], False)   # (감지된 QR 목록, dark_env) - 정지 장면일 때 재사용
+
+# 리다이렉션 추적 (async_resolver는 처음 호출될 때 불러옴 → URL이 없는 영상 분석은 asyncio / requests를 불러오지 않음)
+def resolve_with_deadline(url, *args, **kwargs):
+    from async_resolver import resolve_with_deadline as resolve
+    return resolve(url, *args, **kwargs)
+
+def resolve_many(urls, *args, **kwargs):
+    from async_resolver import resolve_many as resolve
+    return resolve(urls, *args, **kwargs)
 
 # ver.3에 추가됨: 악성 QR 코드 탐지 함수
-def is_suspicious_qr(data):
+def is_suspicious_qr(data, resolution=None):
     """
     QR 데이터가 의심스럽거나 악성일 가능성이 있는지 검사
     ver.4에 추가됨: 아래 조건 중, 최소 2개 이상 조건이 충족되어야 악성으로 판단
     + 리다이렉션된 최종 URL까지 검사 포함됨
+    검사 조건과 가중치, 기준 점수는 규칙 파일(rules/url_rules.json, --rules로 변경 가능)에서 불러옴.
+    resolution: 이미 추적한 리다이렉션 결과(async_resolver 결과 dict). 없으면 여기서 추적함.
+    체인이 끝까지 추적되지 않은 경우(부분 결과) 마지막으로 확인된 URL 기준으로 검사함.
     """
-    suspicion_count = 0
-    reasons = []
-
-    url_to_check = data
     final_url = data  # ver.5에서 수정됨: 기본값 추가
 
     if data.startswith("http://") or data.startswith("https://"):
         # ver.4에 추가됨: 리다이렉션 추적
-        final_url = resolve_redirects(data)
-        if final_url != data:
-            reasons.append("리다이렉션 감지됨")
-            suspicion_count += 1
-        url_to_check = final_url
-
-        parsed = urlparse(url_to_check)  # 최종 리다이렉션된 URL 기준으로 검사
-        domain = parsed.netloc.lower()
-
-        suspicious_domains = ["bit.ly", "tinyurl.com", "t.co", "goo.gl"]
-        dangerous_extensions = [".exe", ".apk", ".bat", ".sh"]
-
-        if any(domain.endswith(sd) for sd in suspicious_domains):
-            reasons.append("짧은 URL 서비스 사용")
-            suspicion_count += 1
-
-        if any(parsed.path.endswith(ext) for ext in dangerous_extensions):
-            reasons.append("위험 확장자 포함")
-            suspicion_count += 1
+        resolution = resolution or resolve_with_deadline(data)
+        final_url = resolution["final_url"]
+        print(f"[최종 URL] {final_url}")  # 확인용 - 리다이렉션 결과가 항상 출력
 
-        if re.match(r"^\d{1,3}(\.\d{1,3}){3}$", domain):
-            reasons.append("IP 주소 기반 URL")
-            suspicion_count += 1
+    suspicion_count, reasons = rule_engine.evaluate(data, final_url, resolution)
 
-        if len(data) > 200:
-            reasons.append("URL 길이 과도함")
-            suspicion_count += 1
-
-    if data.strip().lower().startswith("javascript:"):
-        reasons.append("JavaScript 실행 코드 포함")
-        suspicion_count += 1
-
-    if re.match(r"^[A-Za-z0-9+/=]{100,}$", data):
-        reasons.append("Base64 인코딩된 긴 문자열")
-        suspicion_count += 1
-    
     # 의심 카운트 최종 확인용 출력 / ver.5에선 의심 이유까지 출력되도록 추가.
     print(f"[최종 의심 카운트] {suspicion_count} / 사유: {', '.join(reasons) if reasons else '없음'}")
 
-    return suspicion_count >= 2, final_url, suspicion_count, reasons
+    return rule_engine.is_bad(suspicion_count), final_url, suspicion_count, reasons
 
 # ver.2에 추가됨: 사용자에게 실행 여부 묻고 URL 열기
+# 미리보기 창 안에 예/아니오 버튼으로 표시 (Tk 생성 / 대화상자는 ui_controller의 UI 스레드에서 처리)
 def ask_open_url(url):
-        # ver.4에서 수정됨: tkinter 팝업을 메인 쓰레드에서 직접 실행하도록 변경 (스레드 제거)
-        root = tk.Tk()
-        root.withdraw()  # 창 숨기기
-
-        result = messagebox.askyesno("QR 코드 실행", "정말로 여시겠습니까?")
-        if result:
-            webbrowser.open(url)
-        root.destroy()
+    get_ui_controller().confirm_open(url)
 
 # ver.3에 추가됨: 야간 환경 감지 함수
-def is_dark_environment(frame, threshold=50):
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    return np.mean(gray) < threshold
+# (격자 샘플로 밝기 추정, 진입/해제 기준을 달리해서 모드가 깜빡이지 않게 함)
+def is_dark_environment(frame):
+    return low_light_processor.is_dark(frame)
 
 # ver.3에 추가됨: 저조도 환경 대비 전처리 함수
+# 보정 결과는 단일 채널(그레이) 그대로 반환 → 디코더에 바로 전달 (화면 표시 직전에만 BGR 변환)
 def enhance_for_low_light(frame):
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(gray)
-    return cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR)
+    return low_light_processor.enhance(frame)
 
 # ver.5에 추가됨: QR코드 미리보기 창 띄우기 함수
+# 창 구성은 ui_controller.PreviewWindow로 이동. 같은 QR 내용이면 기존 창을 갱신해서 재사용함
 def show_preview_window(qr_data, final_url, suspicion_count, reasons):  # 매개변수 확장
-    window = tk.Tk()
-    window.title("QR 코드 미리보기")
-    window.geometry("700x500")
-
-    label = tk.Label(window, text="QR 코드 데이터 미리보기", font=("Arial", 14, "bold"))
-    label.pack(pady=10)
-
-    # QR 코드 내용 출력
-    text_label = tk.Label(window, text="[원본 QR 내용]", font=("Arial", 12, "bold"))  # [수정됨] 제목 추가
-    text_label.pack()
-    text_area = tk.Text(window, wrap=tk.WORD, height=5, width=80)
-    text_area.insert(tk.END, qr_data)
-    text_area.configure(state='disabled')
-    text_area.pack(padx=10, pady=5)
-
-    # 최종 URL 출력 (원본과 다르면 표시)
-    if final_url and final_url != qr_data:  # [수정됨] 최종 URL 출력 조건
-        url_label = tk.Label(window, text=f"[최종 URL]", font=("Arial", 12, "bold"))
-        url_label.pack()
-        url_display = tk.Text(window, wrap=tk.WORD, height=2, width=80)
-        url_display.insert(tk.END, final_url)
-        url_display.configure(state='disabled')
-        url_display.pack(padx=10, pady=5)
-
-    if suspicion_count > 0 and reasons:
-        count_label = tk.Label(window, text=f"[의심 카운트] {suspicion_count}", font=("Arial", 12, "bold"), fg="red")
-        count_label.pack(pady=(10, 0))
-
-        reasons_label = tk.Label(window, text="의심 사유:", font=("Arial", 12, "bold"), fg="red")
-        reasons_label.pack(pady=(10, 0))
-        for reason in reasons:
-            reason_text = tk.Label(window, text=f"• {reason}", font=("Arial", 11), fg="red")
-            reason_text.pack()
-
-    close_button = tk.Button(window, text="닫기", command=window.destroy)
-    close_button.pack(pady=20)
-
-    window.mainloop()
+    get_ui_controller().show_preview(qr_data, final_url, suspicion_count, reasons)
+
+# 한 프레임에서 새로 감지된 QR들을 하나의 배치로 분석 워커에 제출
+# 배치 안의 URL은 리다이렉션을 동시에 추적하고, 항목마다 Future로 결과를 받음
+def submit_analysis_batch(items, now=None):
+    now = time.time() if now is None else now
+    entries = []
+    for data, bbox in items:
+        entry = {
+            "data": data,
+            "bbox": bbox,
+            "submitted": time.perf_counter(),
+            "last_seen": now,
+            "latency": None,
+            "future": Future(),
+        }
+        entry["future"].add_done_callback(lambda future, entry=entry: on_analysis_done(entry, future))
+        entries.append(entry)
+
+    analysis_executor.submit(run_analysis_batch, entries)
+    return entries
+
+# QR 하나만 제출하는 경우
+def submit_analysis(data, bbox):
+    return submit_analysis_batch([(data, bbox)])[0]
+
+# 분석 워커에서 실행됨: 배치의 URL들을 한 번에 추적한 뒤 항목별로 악성 여부 판정
+def run_analysis_batch(entries):
+    urls = list(dict.fromkeys(
+        entry["data"] for entry in entries
+        if entry["data"].startswith("http://") or entry["data"].startswith("https://")
+    ))
+    try:
+        with metrics.timer("resolve"):
+            resolutions = dict(zip(urls, resolve_many(urls))) if urls else {}
+    except Exception as e:
+        for entry in entries:
+            entry["future"].set_exception(e)
+        return
 
-# QR코드만 필터링
-def detect_qr_opencv(frame):
-    global last_data, last_detect_time
+    for entry in entries:
+        try:
+            entry["future"].set_result(is_suspicious_qr(entry["data"], resolutions.get(entry["data"])))
+        except Exception as e:
+            entry["future"].set_exception(e)
 
-    # ver.3에 추가됨: 야간 모드 여부 판단 및 전처리
-    dark_env = is_dark_environment(frame)
-    if dark_env:
-        frame = enhance_for_low_light(frame)
+# 헤드리스 모드: 이벤트 한 건을 JSONL 한 줄로 기록 (분석 워커와 감지 루프에서 동시에 호출됨)
+def emit_event(event):
+    if event_sink is None:
+        return
+    with event_lock:
+        event_sink.write(json.dumps(event, ensure_ascii=False) + "\n")
+        event_sink.flush()
 
-    with SuppressStderr():  # stderr 강제 차단 (콘솔 출력 완벽 차단)
-        detector = cv2.QRCodeDetector()
-        data, bbox, _ = detector.detectAndDecode(frame)
+# 분석 완료 시 호출됨 (워커 스레드에서 실행되므로 화면에는 그리지 않음)
+def on_analysis_done(entry, future):
+    entry["latency"] = time.perf_counter() - entry["submitted"]
+    data = entry["data"]
 
-    # QR이 없거나 디코딩된 내용이 없으면 바로 원본 리턴
-    if not data or bbox is None:
-        return frame
-    
-    # 2초 이내에는 재감지하지 않음
-    now = time.time()
-    if data == last_data and now - last_detect_time < 2:
-        return frame
+    if future.cancelled():
+        return
+    if future.exception() is not None:
+        print(f"[분석 실패] {future.exception()}")
+        emit_event({"event": "analysis_error", "data": data, "error": str(future.exception())})
+        return
 
-    last_data = data
-    last_detect_time = now
+    is_bad, final_url, suspicion_count, reasons_list = future.result()
+    print(f"[분석 소요 시간] {entry['latency'] * 1000:.0f}ms")
 
-    bbox = bbox.astype(int)  # 꼭 int로 변환 (OpenCV 그리기 함수 호환)
-    for i in range(len(bbox[0])):
-            pt1 = tuple(bbox[0][i])
-            pt2 = tuple(bbox[0][(i + 1) % len(bbox[0])])
-            cv2.line(frame, pt1, pt2, (0, 255, 0), 2)
+    if is_bad:
+        print("⚠️ 악성 QR 의심:\n- " + "\n- ".join(reasons_list))
+
+    emit_event({
+        "event": "verdict",
+        "data": data,
+        "video_time": entry.get("video_time"),
+        "is_bad": is_bad,
+        "final_url": final_url,
+        "suspicion_count": suspicion_count,
+        "reasons": reasons_list,
+        "latency_ms": round(entry["latency"] * 1000, 1),
+    })
+
+    if not GUI_ENABLED:
+        return
 
-    top_left = tuple(bbox[0][0])
-    print(f"[디코딩된 QR 내용] {data}")  # 콘솔 확인용
-    
-    # ver.3에 추가됨: 악성 QR 탐지 적용
-    is_bad, final_url, suspicion_count, reasons_list = is_suspicious_qr(data)
+    # GUI 미리보기 띄우기 (판정이 끝난 뒤에 띄워야 사유를 표시할 수 있음)
+    # 요청을 UI 스레드의 큐에 넣기만 하므로 분석 워커를 붙잡지 않음 (스레드 / Tk를 새로 만들지 않음)
+    show_preview_window(data, final_url, suspicion_count, reasons_list)
 
-    # GUI 미리보기 띄우기, 이 부분은 별도 스레드로 띄우거나 UI 충돌 주의 필요 (여기서는 바로 호출)
-    # 만약 UI 충돌 발생하면 threading.Thread(target=show_preview_window, args=...).start() 로 수정 가능
-    threading.Thread(target=show_preview_window, args=(data, final_url, suspicion_count, reasons_list), daemon=True).start()
+    # ver.2에 추가됨: URL이면 실행 여부 묻기
+    if data.startswith("http://") or data.startswith("https://"):
+        # ver.5에 수정됨 : 두 개의 tkinter 윈도우가 동시에 메인 루프를 차지하려 하는 상황 방지. (충돌방지)
+        # → 같은 미리보기 창 안에 확인 버튼으로 표시
+        ask_open_url(data)
+
+# 분석 상태에 따라 "검사 중…" 또는 판정 결과를 프레임에 표시
+def draw_analysis_overlay(frame, entry):
+    future = entry["future"]
+    top_left = tuple(entry["bbox"][0][0])
+
+    if not future.done():
+        return draw_text_opencv(frame, "검사 중…", (top_left[0], top_left[1] - 20), color=(0, 255, 255))
 
+    if future.cancelled() or future.exception() is not None:
+        return draw_text_opencv(frame, "분석 실패", (top_left[0], top_left[1] - 20), color=(0, 0, 255))
+
+    is_bad, _, _, reasons_list = future.result()
     if is_bad:
         reason_text = "⚠️ 악성 QR 의심:\n- " + "\n- ".join(reasons_list)
-        print(reason_text)
-        frame = draw_text_opencv(frame, reason_text, (30, 30), font_size=24, color=(0, 0, 255))
+        # 다중 모드에서는 경고끼리 겹치지 않도록 각 QR 위치에 표시
+        position = (top_left[0], top_left[1] - 20) if MULTI_QR_MODE else (30, 30)
+        return draw_text_opencv(frame, reason_text, position, font_size=24, color=(0, 0, 255))
+    return draw_text_opencv(frame, f"QR 내용: {entry['data']}", (top_left[0], top_left[1] - 20))
+
+# 프레임에서 QR 코드를 찾아 [(data, bbox), ...] 형태로 반환 (bbox는 (1, 4, 2) 형태)
+def decode_qr_codes(frame):
+    # stderr 차단은 main()에서 qr_session으로 세션 동안 한 번만 설정함
+    if MULTI_QR_MODE:
+        found, decoded_info, points, _ = qr_session.decode_multi(frame)
+        if not found or points is None:
+            return []
+        return [(data, bbox[np.newaxis]) for data, bbox in zip(decoded_info, points) if data]
+
+    if ROI_TRACKING:
+        data, bbox = qr_tracker.detect(frame)
     else:
-        frame = draw_text_opencv(frame, f"QR 내용: {data}", (top_left[0], top_left[1] - 20))
-    
+        data, bbox, _ = qr_pyramid.decode(frame)
+    return [(data, bbox)] if data and bbox is not None else []
+
+# 프레임 한 장 처리: 정지 장면 확인 → 야간 보정 → 디코딩 → 새 QR 분석 제출 (화면 그리기 없음)
+# now: 재감지 판단 기준 시각 (실시간은 time.time(), 영상 파일은 영상 내 시각)
+# 반환: (보정된 프레임, [(data, 정수 bbox), ...], 야간 여부, 새로 제출된 분석 항목 목록)
+#       야간 모드에서는 보정된 프레임이 단일 채널(그레이) 이미지임
+def process_frame(frame, now=None):
+    global last_decode_result
+
+    if SKIP_STATIC_FRAMES and change_detector.is_static(frame):
+        # 정지 장면: 직전 디코딩 결과 재사용 (야간 모드면 화면 표시용 보정만 적용)
+        detections, dark_env = last_decode_result
+        if dark_env:
+            with metrics.timer("low_light"):
+                frame = enhance_for_low_light(frame)
+    else:
+        # ver.3에 추가됨: 야간 모드 여부 판단 및 전처리
+        with metrics.timer("dark_check"):
+            dark_env = is_dark_environment(frame)
+        if dark_env:
+            with metrics.timer("low_light"):
+                frame = enhance_for_low_light(frame)
+
+        with metrics.timer("decode"):
+            detections = decode_qr_codes(frame)
+        last_decode_result = (detections, dark_env)
+
+    now = time.time() if now is None else now
+    detections = [(data, bbox.astype(int)) for data, bbox in detections]  # 꼭 int로 변환 (OpenCV 그리기 함수 호환)
+    new_items = []
+
+    for data, bbox in detections:
+        # 2초 이내에는 재감지하지 않음 (분석 결과 표시 위치만 갱신)
+        last_time = last_detect_times.get(data)
+        if last_time is not None and 0 <= now - last_time < DEBOUNCE_SECONDS:
+            entry = current_analyses.get(data)
+            if entry is not None:
+                entry["bbox"] = bbox
+                entry["last_seen"] = now
+        else:
+            last_detect_times[data] = now
+            print(f"[디코딩된 QR 내용] {data}")  # 콘솔 확인용
+            new_items.append((data, bbox))
+
+    # ver.3에 추가됨: 악성 QR 탐지 적용 (한 프레임의 새 QR들을 배치로 묶어 워커 스레드에서 비동기로 실행)
+    new_entries = submit_analysis_batch(new_items, now) if new_items else []
+    for entry in new_entries:
+        current_analyses[entry["data"]] = entry
+
+    # 결과 유지 시간이 지난 항목 정리 (dict가 계속 커지지 않도록)
+    for data in [d for d, t in last_detect_times.items() if now - t >= max(DEBOUNCE_SECONDS, OVERLAY_HOLD_SECONDS)]:
+        del last_detect_times[data]
+    for data in [d for d, e in current_analyses.items() if now - e["last_seen"] >= OVERLAY_HOLD_SECONDS]:
+        del current_analyses[data]
+
+    return frame, detections, dark_env, new_entries
+
+# QR코드만 필터링
+def detect_qr_opencv(frame):
+    frame, detections, dark_env, _ = process_frame(frame)
+    if frame.ndim == 2:
+        # 야간 보정된 그레이 이미지는 컬러로 그리기 위해 표시 직전에만 BGR로 변환
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+    for _, bbox in detections:
+        for i in range(len(bbox[0])):
+            pt1 = tuple(bbox[0][i])
+            pt2 = tuple(bbox[0][(i + 1) % len(bbox[0])])
+            cv2.line(frame, pt1, pt2, (0, 255, 0), 2)
+
+    # QR이 없거나 결과 유지 시간이 지났으면 원본 리턴
+    if not current_analyses:
+        return frame
+
+    for entry in list(current_analyses.values()):
+        frame = draw_analysis_overlay(frame, entry)
+
     # ver.3에 추가됨: 야간 모드 안내 텍스트
     if dark_env:
         frame = draw_text_opencv(frame, "🌙 야간 모드 적용됨", (30, 60), font_size=16, color=(200, 200, 255))
-    
-    # ver.2에 추가됨: URL이면 실행 여부 묻기
-    if data.startswith("http://") or data.startswith("https://"):
-        # ver.5에 수정됨 : 두 개의 tkinter 윈도우가 동시에 메인 루프를 차지하려 하는 상황 방지. (충돌방지)
-        threading.Thread(target=ask_open_url, args=(data,), daemon=True).start()
-    
+
     return frame
-        
+
+# 프레임 간격을 기록하여 FPS와 최대 정지 시간(스톨)을 측정
+class FrameRateMeter:
+    def __init__(self, window=120, name="프레임"):
+        self.name = name
+        self.intervals = deque(maxlen=window)   # 최근 프레임 간격 (초)
+        self.last_tick = None
+        self.frame_count = 0
+        self.worst_interval = 0.0               # 세션 전체에서 가장 길었던 프레임 간격
+        self.started = time.perf_counter()
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last_tick is not None:
+            interval = now - self.last_tick
+            self.intervals.append(interval)
+            self.worst_interval = max(self.worst_interval, interval)
+        self.last_tick = now
+        self.frame_count += 1
+
+    @property
+    def fps(self):
+        if not self.intervals:
+            return 0.0
+        return len(self.intervals) / sum(self.intervals)
+
+    @property
+    def recent_max_interval(self):
+        return max(self.intervals) if self.intervals else 0.0
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        average_fps = self.frame_count / elapsed if elapsed > 0 else 0.0
+        return (f"[{self.name} 통계] 총 {self.frame_count}프레임 / 평균 {average_fps:.1f} FPS / "
+                f"최대 프레임 간격 {self.worst_interval * 1000:.0f}ms")
 
 def draw_text_opencv(img, text, position, font_size=20, color=(255, 255, 0)):
     """
     Pillow를 이용해 OpenCV 이미지에 한글 텍스트를 표시
+    (폰트와 글자 스프라이트를 캐시하고, 글자 영역만 블렌딩하여 img를 직접 수정)
     """
-    # OpenCV 이미지를 PIL 이미지로 변환
-    img_pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-    draw = ImageDraw.Draw(img_pil)
+    with metrics.timer("draw_text"):
+        return text_overlay.draw(img, text, position, font_size, color)
 
-    # 한글 폰트 설정 (Windows 기본 H2GTRM.TTF 사용)
-    try:
-        font_path = "C:/Windows/Fonts/H2GTRM.TTF"  # 절대 경로 지정
-        font = ImageFont.truetype(font_path, font_size)
-    except IOError:
-        print("폰트를 불러올 수 없습니다. 경로를 확인하세요.")
-        font = ImageFont.load_default()
+# 캡처 → 감지 → 표시 3단계 파이프라인
+# 단계 사이 큐는 크기 1로 제한하고, 꽉 차 있으면 오래된 프레임을 버리고 최신 프레임으로 교체함.
+# (감지가 느려도 카메라 버퍼에 지난 프레임이 쌓이지 않고, 감지는 항상 가장 최근 프레임을 처리)
+PIPELINE_QUEUE_SIZE = 1
 
-    draw.text(position, text, font=font, fill=color)
+# 큐가 꽉 찼으면 가장 오래된 항목을 버리고 넣기. 버린 개수를 반환
+def put_latest(q, item):
+    dropped = 0
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+# 1단계: 카메라에서 프레임을 계속 읽어 capture_queue에 넣음
+def run_capture_stage(cap, capture_queue, stop_event, meter, drop_counts):
+    while not stop_event.is_set():
+        with metrics.timer("capture"):
+            ret, frame = cap.read()
+        if not ret:
+            stop_event.set()
+            break
+        meter.tick()
+        drop_counts["capture"] += put_latest(capture_queue, frame)
 
-    # 다시 OpenCV 이미지로 변환
-    return cv2.cvtColor(np.array(img_pil), cv2.COLOR_RGB2BGR)
+# 2단계: 최신 프레임만 꺼내서 QR 감지 후 display_queue에 넣음
+def run_detection_stage(capture_queue, display_queue, stop_event, meter, drop_counts):
+    while not stop_event.is_set():
+        try:
+            frame = capture_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
 
-def main():
-    cap = cv2.VideoCapture(0)
+        # OpenCV 기반 QR 감지 함수 호출
+        frame_display = detect_qr_opencv(frame)
+        meter.tick()
+        drop_counts["detection"] += put_latest(display_queue, frame_display)
+
+# 단계별 FPS 표시 (어느 단계가 처리량을 제한하는지 확인용)
+def draw_stage_stats(frame, meters, drop_counts):
+    y = frame.shape[0] - 10
+    for name, meter in reversed(list(meters.items())):
+        text = f"{name} {meter.fps:5.1f} FPS / max {meter.recent_max_interval * 1000:4.0f}ms"
+        if name in drop_counts:
+            text += f" / drop {drop_counts[name]}"
+        cv2.putText(frame, text, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 1)
+        y -= 18
+
+# "0", "1" 같은 숫자는 카메라 번호, 그 외는 영상 파일 경로 / 스트림 URL
+def open_capture(source):
+    return cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+
+# 헤드리스 모드: 영상 파일 / 스트림을 GUI 없이 분석하여 감지 결과를 JSONL 이벤트로 출력
+# stride: N프레임마다 1프레임만 디코딩, sample_interval: 영상 시간 기준 N초마다 1프레임 디코딩
+def run_headless(source, stride=1, sample_interval=None, events_path="-"):
+    global GUI_ENABLED, event_sink
+
+    cap = open_capture(source)
+    if not cap.isOpened():
+        print(f"영상을 열 수 없습니다: {source}", file=sys.stderr)
+        return None
+
+    GUI_ENABLED = False
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    stdout = sys.stdout
+    event_sink = stdout if events_path == "-" else open(events_path, "w", encoding="utf-8")
+
+    frame_index = -1
+    decoded_frames = 0
+    next_sample_time = 0.0
+    video_time = 0.0
+    started = time.perf_counter()
+
+    # 이벤트를 표준출력으로 내보낼 때 콘솔 확인용 출력은 표준에러로 보냄
+    # qr_session이 fd 2를 막으면서 sys.stderr를 원래 출력으로 다시 연결하므로, 그 뒤의 sys.stderr로 보내야 함
+    with qr_session, redirect_stdout(sys.stderr):
+        while True:
+            # 건너뛸 프레임은 grab()만 하여 디코딩(영상 압축 해제 후 변환) 비용을 줄임
+            with metrics.timer("capture"):
+                grabbed = cap.grab()
+            if not grabbed:
+                break
+            frame_index += 1
+            position_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            video_time = position_ms / 1000 if position_ms > 0 else (
+                frame_index / source_fps if source_fps > 0 else time.perf_counter() - started)
+
+            if frame_index % stride != 0:
+                continue
+            if sample_interval is not None:
+                if video_time < next_sample_time:
+                    continue
+                next_sample_time = video_time + sample_interval
+
+            with metrics.timer("retrieve"):
+                ret, frame = cap.retrieve()
+            if not ret:
+                break
+            decoded_frames += 1
+
+            _, detections, _, new_entries = process_frame(frame, now=video_time)
+            for entry in new_entries:
+                entry["video_time"] = round(video_time, 3)
+                emit_event({
+                    "event": "detection",
+                    "source": str(source),
+                    "frame": frame_index,
+                    "video_time": round(video_time, 3),
+                    "data": entry["data"],
+                    "bbox": entry["bbox"][0].tolist(),
+                })
+
+        # 남은 분석이 끝나야 판정 이벤트가 모두 기록됨
+        analysis_executor.shutdown(wait=True)
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "event": "summary",
+        "source": str(source),
+        "frames_read": frame_index + 1,
+        "frames_decoded": decoded_frames,
+        "elapsed_seconds": round(elapsed, 3),
+        "read_fps": round((frame_index + 1) / elapsed, 1) if elapsed > 0 else 0.0,
+        "decode_fps": round(decoded_frames / elapsed, 1) if elapsed > 0 else 0.0,
+        "realtime_factor": round(video_time / elapsed, 2) if elapsed > 0 else 0.0,  # 1보다 크면 실시간보다 빠름
+    }
+    emit_event(stats)
+    print(f"[헤드리스 통계] {stats['frames_read']}프레임 읽기 ({stats['read_fps']} FPS), "
+          f"{stats['frames_decoded']}프레임 디코딩 ({stats['decode_fps']} FPS), "
+          f"실시간 대비 {stats['realtime_factor']}배속", file=sys.stderr)
+
+    if event_sink is not stdout:
+        event_sink.close()
+    event_sink = None
+    cap.release()
+    return stats
+
+def main(source=0):
+    cap = open_capture(source)
     if not cap.isOpened():
         print("카메라를 열 수 없습니다.")
         return
     
     print("실시간 QR 코드 감지를 시작합니다. 종료하려면 'q'를 누르세요.")
+    get_ui_controller().start()
+
+    capture_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    display_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop_event = threading.Event()
+    meters = {
+        "capture": FrameRateMeter(name="캡처"),
+        "detection": FrameRateMeter(name="감지"),
+        "display": FrameRateMeter(name="표시"),
+    }
+    drop_counts = {"capture": 0, "detection": 0}  # 다음 단계가 가져가기 전에 버려진 프레임 수
+
+    stages = [
+        threading.Thread(target=run_capture_stage, name="qr-capture", daemon=True,
+                         args=(cap, capture_queue, stop_event, meters["capture"], drop_counts)),
+        threading.Thread(target=run_detection_stage, name="qr-detection", daemon=True,
+                         args=(capture_queue, display_queue, stop_event, meters["detection"], drop_counts)),
+    ]
+    # stderr 강제 차단 (콘솔 출력 완벽 차단) - 세션 동안 한 번만 설정
+    with qr_session:
+        for stage in stages:
+            stage.start()
+
+        # 3단계: 표시 (cv2.imshow / waitKey는 메인 스레드에서 호출해야 함)
+        while not stop_event.is_set():
+            try:
+                frame_display = display_queue.get(timeout=0.1)
+            except queue.Empty:
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        # OpenCV 기반 QR 감지 함수 호출
-        frame_display = detect_qr_opencv(frame)
-
-        cv2.imshow("QR Scanner", frame_display)
+            meters["display"].tick()
+            draw_stage_stats(frame_display, meters, drop_counts)
+            if SHOW_METRICS_HUD:
+                metrics.draw_hud(frame_display)
+            with metrics.timer("imshow"):
+                cv2.imshow("QR Scanner", frame_display)
 
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
 
+        stop_event.set()
+        for stage in stages:
+            stage.join(timeout=1)
+
+    for meter in meters.values():
+        print(meter.summary())
+    print(f"[버려진 프레임] 캡처→감지 {drop_counts['capture']}개 / 감지→표시 {drop_counts['detection']}개")
+    print(qr_tracker.summary())
+    print(change_detector.summary())
+    print(redirect_cache_summary())
+    print(phishing_blocklist.summary())
+    print(ip_reputation.summary())
+    print(low_light_processor.summary())
+    print(text_overlay.summary())
+    print(get_ui_controller().summary())
+    if metrics.enabled:
+        print(metrics.summary())
+    analysis_executor.shutdown(wait=False, cancel_futures=True)
+    get_ui_controller().stop()
     cap.release()
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="실시간 QR 코드 스캐너")
+    parser.add_argument("--source", default="0", help="카메라 번호, 영상 파일 경로 또는 스트림 URL (기본: 0)")
+    parser.add_argument("--headless", action="store_true", help="GUI 없이 분석하고 감지 결과를 JSONL 이벤트로 출력")
+    parser.add_argument("--stride", type=int, default=1, help="헤드리스: N프레임마다 1프레임만 디코딩")
+    parser.add_argument("--sample-interval", type=float, default=None,
+                        help="헤드리스: 영상 시간 기준 N초마다 1프레임만 디코딩")
+    parser.add_argument("--events", default="-", help="헤드리스: 이벤트 JSONL 파일 경로 (기본: 표준출력)")
+    parser.add_argument("--multi", action="store_true", help="한 프레임의 여러 QR을 모두 인식")
+    parser.add_argument("--metrics", metavar="PATH", help="단계별 지연 시간 스냅샷을 주기적으로 기록할 파일")
+    parser.add_argument("--metrics-format", choices=("prom", "json"), default="prom",
+                        help="스냅샷 형식: Prometheus 텍스트(prom) 또는 JSON")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="스냅샷 기록 간격(초)")
+    parser.add_argument("--hud", action="store_true", help="화면에 단계별 지연 시간 표시")
+    parser.add_argument("--blocklist", action="append", default=[], metavar="PATH",
+                        help="추가로 불러올 피싱 도메인 목록 파일 (한 줄에 도메인/URL 하나, 여러 번 지정 가능)")
+    parser.add_argument("--blocklist-delta", action="append", default=[], metavar="PATH",
+                        help="피싱 목록 변경분 파일 (한 줄에 +도메인 / -도메인, 덧붙인 줄만 실행 중에 반영)")
+    parser.add_argument("--watch-blocklists", action="store_true",
+                        help="목록 파일이 바뀌면 재시작 없이 백그라운드에서 다시 불러옴 "
+                             "(수십만 개 이상의 피드는 .qrbl로 컴파일해서 지정하면 재구축 중 조회가 멈추지 않음)")
+    parser.add_argument("--reload-interval", type=float, default=DEFAULT_RELOAD_INTERVAL,
+                        help="목록 파일 변경 확인 간격(초)")
+    parser.add_argument("--rules", default=DEFAULT_RULES_PATH, help="URL 의심 조건 규칙 파일 (JSON)")
+    parser.add_argument("--ip-blocklist", action="append", default=[], metavar="PATH",
+                        help="추가로 불러올 위험 IP 대역 목록 파일 (한 줄에 CIDR 하나, 여러 번 지정 가능)")
+    parser.add_argument("--no-dns", action="store_true", help="도메인의 IP 주소를 DNS로 확인하지 않음")
+    args = parser.parse_args()
+
+    MULTI_QR_MODE = args.multi
+    if args.watch_blocklists or args.blocklist_delta:
+        phishing_blocklist = BlocklistReloader([PHISHING_LIST_PATH] + args.blocklist, args.blocklist_delta,
+                                               args.reload_interval, name="피싱 목록").start()
+        shortener_blocklist = BlocklistReloader([SHORTENER_LIST_PATH], interval=args.reload_interval,
+                                                name="단축 URL 목록").start()
+    else:
+        for path in args.blocklist:
+            phishing_blocklist.load_file(path)
+    if args.blocklist or args.blocklist_delta:
+        print(phishing_blocklist.summary(), file=sys.stderr)
+    for path in args.ip_blocklist:
+        ip_reputation.networks.load_file(path)
+    if args.ip_blocklist:
+        print(ip_reputation.networks.summary(), file=sys.stderr)
+    if args.no_dns:
+        ip_reputation.resolve_hostnames = False
+    rule_engine = RuleEngine.from_file(args.rules, {"phishing": phishing_blocklist, "shortener": shortener_blocklist,
+                                                    "bad_networks": ip_reputation})
+    SHOW_METRICS_HUD = args.hud
+    metrics.enabled = bool(args.metrics or args.hud)
+    if args.metrics:
+        metrics.start_writer(args.metrics, args.metrics_format, args.metrics_interval)
+    if args.headless:
+        if args.stride < 1:
+            parser.error("--stride는 1 이상이어야 합니다.")
+        run_headless(args.source, args.stride, args.sample_interval, args.events)
+        if metrics.enabled:
+            print(metrics.summary(), file=sys.stderr)
+    else:
+        main(args.source)
+    metrics.stop_writer()
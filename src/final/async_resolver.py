@@ -0,0 +1,129 @@
+# asyncio 기반 리다이렉션 추적 모듈
+# 기존 resolve_redirects는 최악의 경우 max_redirects × timeout (5 × 5초 = 25초)까지 걸림.
+#   - 체인 전체에 하나의 마감 시간(deadline)을 적용하여 그 이상 기다리지 않음
+#   - 호스트별 동시 요청 수 제한 (같은 서버에 요청이 몰리지 않도록)
+#   - 여러 URL을 동시에 추적 가능 (resolve_many)
+#   - 마감 시간을 넘기면 그때까지 확인한 홉까지만 담아서 "부분 결과"로 반환
+#   - requests는 실제로 HTTP 요청을 보낼 때만 불러옴 (시작 시간 단축)
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urljoin
+
+from redirect_resolver import probe_redirect, get_redirect_cache
+
+REDIRECT_DEADLINE_SECONDS = 8   # 체인 전체 추적에 허용하는 시간(초)
+HOP_TIMEOUT_SECONDS = 5         # 홉 하나에 허용하는 최대 시간(초)
+PER_HOST_LIMIT = 2              # 호스트당 동시 요청 수
+PROBE_WORKERS = 16              # 실제 HTTP 요청(블로킹)을 수행하는 스레드 수
+
+# asyncio.run의 기본 실행기는 종료 시 남은 요청이 끝날 때까지 기다리므로,
+# 마감 시간을 넘긴 요청을 기다리지 않도록 별도 실행기를 사용
+probe_executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix="redirect-probe")
+
+# 호스트별 세마포어 (이벤트 루프마다 새로 만들어야 하므로 resolve 호출마다 생성)
+class HostLimiter:
+    def __init__(self, per_host=PER_HOST_LIMIT):
+        self.per_host = per_host
+        self.semaphores = {}
+
+    def get(self, url):
+        host = urlparse(url).netloc.lower()
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self.semaphores[host]
+
+def connect_failure_reason(chain):
+    """연결 실패 사유 (실패한 홉 번호 = 체인 길이, 캐시에서 다시 만들 때도 같은 문자열이 되도록)"""
+    return f"{len(chain)}번째 홉에서 체인 중단 (연결 실패)"
+
+def make_result(url, final_url, chain, status, ok=True, truncated_reason=None):
+    """
+    redirect_cache 항목과 같은 키에 완료 여부를 더한 dict
+    complete=False이면 final_url은 "마지막으로 확인된 URL"이며 truncated_reason에 중단 사유가 들어감
+    """
+    return {
+        "url": url,
+        "final_url": final_url,
+        "chain": list(chain),
+        "status": status,
+        "ok": ok,
+        "complete": truncated_reason is None,
+        "truncated_reason": truncated_reason,
+        "hops": len(chain) - 1,
+    }
+
+async def resolve_chain_async(url, deadline, limiter, max_redirects=5, hop_timeout=HOP_TIMEOUT_SECONDS, use_cache=True,
+                              executor=None):
+    """
+    deadline: 이벤트 루프 시간(loop.time()) 기준 마감 시각
+    마감 시각이 지나면 남은 홉을 추적하지 않고 부분 결과를 반환
+    executor: HTTP 요청을 수행할 실행기 (None이면 공용 probe_executor)
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or probe_executor
+
+    if use_cache:
+        cached = get_redirect_cache().get(url)
+        if cached is not None:
+            # 실패 캐시도 처음 조회했을 때와 같은 부분 결과(마지막 URL, 홉 체인, 중단 사유)로 반환
+            reason = None if cached["ok"] else connect_failure_reason(cached["chain"])
+            return make_result(url, cached["final_url"], cached["chain"], cached["status"], cached["ok"], reason)
+
+    import requests
+
+    current_url = url
+    chain = [url]   # 거쳐간 URL 목록 (홉 체인)
+    status = None
+
+    for hop in range(1, max_redirects + 1):
+        timeout_reason = f"{hop}번째 홉에서 체인 중단 (시간 초과)"
+        try:
+            async with limiter.get(current_url):
+                # 세마포어를 기다리는 동안 흐른 시간까지 반영하여 남은 시간 계산
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return make_result(url, current_url, chain, status, truncated_reason=timeout_reason)
+                status, location = await asyncio.wait_for(
+                    loop.run_in_executor(executor, probe_redirect, current_url, min(hop_timeout, remaining)),
+                    remaining,
+                )
+        except asyncio.TimeoutError:
+            return make_result(url, current_url, chain, status, truncated_reason=timeout_reason)
+        except requests.Timeout:
+            return make_result(url, current_url, chain, status, truncated_reason=timeout_reason)
+        except requests.RequestException as e:
+            print(f"[리다이렉션 확인 실패] {e}")
+            if use_cache:
+                # 실패도 잠시 기억 (네거티브 캐시). 반환하는 부분 결과와 같은 내용을 저장해야
+                # 다시 스캔했을 때 판정(리다이렉션 / 위험 확장자 / IP 주소 등)이 달라지지 않음
+                get_redirect_cache().put(url, current_url, chain, status, ok=False)
+            return make_result(url, current_url, chain, status, ok=False,
+                               truncated_reason=connect_failure_reason(chain))
+
+        if not (300 <= status < 400) or not location:
+            if use_cache:
+                get_redirect_cache().put(url, current_url, chain, status)
+            return make_result(url, current_url, chain, status)
+
+        # 상대경로를 절대 URL로 변환
+        current_url = urljoin(current_url, location)
+        chain.append(current_url)
+
+    # 최대 홉 수까지 따라갔는데도 계속 리다이렉션되는 경우
+    return make_result(url, current_url, chain, status,
+                       truncated_reason=f"최대 리다이렉션 횟수({max_redirects}) 초과")
+
+async def resolve_many_async(urls, deadline_seconds=REDIRECT_DEADLINE_SECONDS, per_host=PER_HOST_LIMIT, **kwargs):
+    """여러 URL을 동시에 추적. 모든 URL이 같은 마감 시각을 공유함"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+    limiter = HostLimiter(per_host)
+    return await asyncio.gather(*(resolve_chain_async(url, deadline, limiter, **kwargs) for url in urls))
+
+def resolve_with_deadline(url, deadline_seconds=REDIRECT_DEADLINE_SECONDS, **kwargs):
+    """동기 코드(분석 워커 스레드)에서 호출하는 버전: URL 하나의 결과 dict 반환"""
+    return resolve_many([url], deadline_seconds, **kwargs)[0]
+
+def resolve_many(urls, deadline_seconds=REDIRECT_DEADLINE_SECONDS, per_host=PER_HOST_LIMIT, **kwargs):
+    """동기 코드에서 호출하는 버전: 입력 순서대로 결과 dict 리스트 반환"""
+    return asyncio.run(resolve_many_async(list(urls), deadline_seconds, per_host, **kwargs))
@@ -0,0 +1,174 @@
+# 차단 목록 자동 갱신 (재시작 없이 새 위협 목록 반영)
+# 목록 파일은 몇 분마다 갱신되지만, 스캐너는 시작할 때 불러온 목록을 계속 사용했음.
+# 오래 켜 두는 웹캠 세션이나 배치 작업도 새 목록을 바로 쓸 수 있도록 백그라운드에서 갱신함.
+#   - 목록 파일(텍스트 / .qrbl)의 변경 시각과 크기를 주기적으로 확인
+#   - 목록 파일이 바뀌면 백그라운드 스레드에서 새 인덱스를 만든 뒤 참조를 한 번에 교체
+#     (교체는 속성 대입 한 번이므로 조회 중인 스레드를 멈추지 않음. 교체 전까지는 기존 인덱스로 조회)
+#     텍스트 목록은 아직 교체 전인 새 인덱스에 REBUILD_BATCH개씩 등록하며 사이마다 조회 스레드에 실행을 양보함
+#     교체된 이전 인덱스는 절대 수정하지 않음 (교체 직전에 가져간 조회가 끝까지 같은 내용으로 판정하도록)
+#     참조가 모두 사라지면 GC가 해제하며, 해제하는 동안은 GIL을 놓지 않으므로
+#     집합 재배치와 함께 목록 크기에 비례하는 정지가 남음 (50만 개에서 수~수십 ms).
+#     수십만 개 이상의 피드는 .qrbl로 컴파일해서 쓰는 것을 권장 (재구축 = 메모리 매핑만 다시 함, bench_blocklist_reload.py 참고)
+#   - 변경분(델타) 파일: 한 줄에 "+도메인"(추가) / "-도메인"(삭제), 부호가 없으면 추가
+#     뒤에 덧붙인 줄만 읽어서 현재 인덱스에 바로 반영 (전체 피드를 다시 파싱하지 않음)
+#     델타 파일이 잘리거나 교체되면 처음부터 다시 적용
+#   - 스캐너 쪽에서는 DomainBlocklist와 같은 방식(match / in / len / summary)으로 사용
+import os
+import threading
+import time
+from itertools import islice
+
+from blocklist_store import is_compiled_blocklist
+from domain_blocklist import DomainBlocklist, iter_feed_lines
+
+DEFAULT_RELOAD_INTERVAL = 5.0
+REBUILD_BATCH = 2000            # 재구축 중 이 개수만큼 처리할 때마다 조회 스레드에 실행을 양보
+
+class DeltaResetError(Exception):
+    """델타 파일이 잘리거나 교체되어 이어서 읽을 수 없음"""
+
+def file_signature(path):
+    """변경 확인용 (inode, 크기, 수정 시각). 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+class BlocklistReloader:
+    def __init__(self, paths, delta_paths=(), interval=DEFAULT_RELOAD_INTERVAL, scope="suffix", name="차단 목록"):
+        self.paths = list(paths)
+        self.delta_paths = list(delta_paths)
+        self.interval = interval
+        self.scope = scope
+        self.name = name
+        self.signatures = {}        # 목록 파일 → 마지막으로 불러온 시점의 file_signature
+        self.delta_offsets = {}     # 델타 파일 → (inode, 지금까지 읽은 바이트 수)
+        self.update_lock = threading.Lock()  # 재구축과 델타 반영이 겹치지 않도록 (조회는 잠그지 않음)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.stats = {"reloads": 0, "delta_added": 0, "delta_removed": 0, "errors": 0, "last_build_seconds": 0.0}
+        self.current = None
+        self.rebuild()
+
+    # ------------------------------
+    # 조회 (현재 인덱스에 위임)
+    # ------------------------------
+    def match(self, value):
+        return self.current.match(value)
+
+    def __contains__(self, value):
+        return self.current.match(value) is not None
+
+    def __len__(self):
+        return len(self.current)
+
+    # ------------------------------
+    # 갱신
+    # ------------------------------
+    def rebuild(self):
+        """목록 파일 전체로 새 인덱스를 만들고 델타를 처음부터 적용한 뒤 교체"""
+        with self.update_lock:
+            started = time.perf_counter()
+            signatures = {path: file_signature(path) for path in self.paths}
+            blocklist = self.build([path for path in self.paths if signatures[path]])
+            self.delta_offsets = {}
+            for path in self.delta_paths:
+                self.apply_delta(blocklist, path)
+            self.current = blocklist  # 원자적 교체 (이전 인덱스는 그대로 두고 참조만 버림)
+            self.signatures = signatures
+            self.stats["reloads"] += 1
+            self.stats["last_build_seconds"] = time.perf_counter() - started
+
+    def build(self, paths):
+        """
+        목록 파일들로 새 DomainBlocklist 생성 (load_blocklist와 같은 결과)
+        텍스트 목록은 REBUILD_BATCH개씩 나눠 등록하고 사이마다 GIL을 양보해서 조회가 밀리지 않도록 함
+        """
+        blocklist = DomainBlocklist(scope=self.scope)
+        for path in paths:
+            if is_compiled_blocklist(path):
+                blocklist.load_file(path, self.scope)
+                continue
+            lines = iter_feed_lines(path)
+            while True:
+                batch = list(islice(lines, REBUILD_BATCH))
+                if not batch:
+                    break
+                blocklist.update(batch, self.scope)
+                time.sleep(0)
+        return blocklist
+
+    def apply_delta(self, blocklist, path):
+        """델타 파일에서 아직 읽지 않은 완전한 줄만 blocklist에 반영"""
+        signature = file_signature(path)
+        if signature is None:
+            return
+        inode, size, _ = signature
+        known_inode, offset = self.delta_offsets.get(path, (inode, 0))
+        if known_inode != inode or size < offset:
+            raise DeltaResetError(path)
+        if size == offset:
+            return
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+        end = chunk.rfind(b"\n") + 1  # 쓰는 중인 마지막 줄은 다음 확인 때 읽음
+        for line in chunk[:end].decode("utf-8", errors="replace").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("-"):
+                blocklist.remove(line[1:].strip())
+                self.stats["delta_removed"] += 1
+            else:
+                blocklist.add(line.lstrip("+").strip(), self.scope)
+                self.stats["delta_added"] += 1
+        self.delta_offsets[path] = (inode, offset + end)
+
+    def check(self):
+        """파일 변경을 확인해서 필요한 만큼만 갱신. 갱신 종류("rebuild" / "delta" / None)를 반환"""
+        if any(file_signature(path) != signature for path, signature in self.signatures.items()):
+            self.rebuild()
+            return "rebuild"
+        try:
+            with self.update_lock:
+                before = self.stats["delta_added"] + self.stats["delta_removed"]
+                for path in self.delta_paths:
+                    self.apply_delta(self.current, path)
+                changed = self.stats["delta_added"] + self.stats["delta_removed"] != before
+        except DeltaResetError:
+            # 델타 파일이 잘렸거나 교체됨 → 이미 반영한 내용을 되돌릴 수 없으므로 전체 재구축
+            self.rebuild()
+            return "rebuild"
+        return "delta" if changed else None
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                kind = self.check()
+            except Exception as e:  # 갱신에 실패해도 기존 인덱스로 계속 검사
+                self.stats["errors"] += 1
+                print(f"[{self.name}] 목록 갱신 실패, 기존 목록을 계속 사용합니다: {e}")
+                continue
+            if kind == "rebuild":
+                print(f"[{self.name}] 목록 다시 불러옴: {len(self.current)}개 "
+                      f"({self.stats['last_build_seconds']:.2f}초)")
+
+    def start(self):
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, name="blocklist-reloader", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def summary(self):
+        return (f"{self.current.summary()} / 자동 갱신: 재구축 {self.stats['reloads']}회, "
+                f"델타 +{self.stats['delta_added']} -{self.stats['delta_removed']}, 실패 {self.stats['errors']}회")
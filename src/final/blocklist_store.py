@@ -0,0 +1,148 @@
+# 컴파일된 차단 목록 파일 (.qrbl)
+# 수백만 개 도메인 피드를 스캐너 프로세스마다 파이썬 set으로 불러오면 수 초와 수백 MB가 듦.
+# 피드를 미리 정렬된 64비트 해시 배열 파일로 컴파일해 두고, 스캐너는 파일을 메모리 매핑(mmap)해서 바로 조회함.
+#   - 여는 데 드는 시간은 헤더 확인뿐이고, 실제로 읽은 페이지만 메모리에 올라옴
+#   - 여러 스캐너 프로세스가 같은 파일을 열면 OS 페이지 캐시를 함께 사용
+#   - 조회: 정렬된 해시 배열을 이진 탐색 (페이지 약 20개 접근)
+#     선택적으로 블룸 필터를 앞에 두면 목록에 없는 도메인은 블룸 필터 페이지 몇 개만 읽고 끝남
+#     (파일이 페이지 캐시에 없을 때 유리, 캐시에 올라온 뒤에는 이진 탐색만 쓰는 쪽이 더 빠름)
+#
+# 파일 구조 (리틀 엔디언)
+#   헤더 32바이트 : 매직 "QRBL"(4), 버전(2), 예약(2), 항목 수(8), 블룸 비트 수(8), 블룸 해시 개수(4), 예약(4)  ※ 괄호 안은 바이트 수
+#   블룸 필터     : 블룸 비트 수 / 8 바이트 (8바이트 단위로 맞춤, 블룸 미사용 시 0바이트)
+#   해시 배열     : 정렬된 uint64 항목 수만큼 (하위 포함 항목은 "도메인", 정확 일치 항목은 "=도메인"의 해시)
+#
+# 컴파일: python src/final/blocklist_store.py feed.txt [feed2.txt ...] -o feed.qrbl [--bloom-bits 10]
+# 사용:   DomainBlocklist.load_file("feed.qrbl") 또는 스캐너 실행 시 --blocklist feed.qrbl
+import os, sys
+import argparse
+import hashlib
+import mmap
+import struct
+import time
+from bisect import bisect_left
+
+import numpy as np
+
+MAGIC = b"QRBL"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQII")
+DEFAULT_BLOOM_BITS_PER_ENTRY = 0    # 기본은 블룸 필터 없이 이진 탐색만 (10이면 항목당 10비트, 오탐률 약 1%)
+EXTENSION = ".qrbl"
+
+def domain_hash(key):
+    """프로세스가 달라도 같은 값이 나오는 64비트 해시 (파이썬 hash()는 실행마다 달라짐)"""
+    return int.from_bytes(hashlib.blake2b(key.encode("ascii", "replace"), digest_size=8).digest(), "little")
+
+def is_compiled_blocklist(path):
+    if path.endswith(EXTENSION):
+        return True
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+class CompiledBlocklist:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, bloom_bits, bloom_k, _ = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"컴파일된 차단 목록 파일이 아닙니다 (또는 버전이 다름): {path}")
+        self.count = count
+        self.bloom_bits = bloom_bits
+        self.bloom_k = bloom_k
+        bloom_bytes = padded_bloom_bytes(bloom_bits)
+        self.bloom = memoryview(self.mm)[HEADER.size:HEADER.size + bloom_bytes]
+        offset = HEADER.size + bloom_bytes
+        self.hashes = memoryview(self.mm)[offset:offset + count * 8].cast("Q")
+        self.stats = {"lookups": 0, "bloom_rejects": 0}
+
+    def contains_hash(self, value):
+        self.stats["lookups"] += 1
+        if self.bloom_bits:
+            # 이중 해싱: 64비트 해시의 하위/상위 32비트로 k개의 비트 위치를 만듦 (하나라도 0이면 없음)
+            h1, h2 = value & 0xFFFFFFFF, (value >> 32) | 1
+            for i in range(self.bloom_k):
+                position = (h1 + i * h2) % self.bloom_bits
+                if not self.bloom[position >> 3] & (1 << (position & 7)):
+                    self.stats["bloom_rejects"] += 1
+                    return False
+        i = bisect_left(self.hashes, value)
+        return i < self.count and self.hashes[i] == value
+
+    def contains(self, host, exact=False):
+        """host가 하위 포함 항목으로 (exact=True면 정확 일치 항목으로도) 등록되어 있는지"""
+        if self.contains_hash(domain_hash(host)):
+            return True
+        return exact and self.contains_hash(domain_hash("=" + host))
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.bloom.release()
+        self.hashes.release()
+        self.mm.close()
+
+def padded_bloom_bytes(bloom_bits):
+    # 해시 배열이 8바이트 경계에서 시작하도록 맞춤
+    return ((bloom_bits + 7) // 8 + 7) // 8 * 8
+
+def compile_blocklist(sources, output_path, scope="suffix", bloom_bits_per_entry=DEFAULT_BLOOM_BITS_PER_ENTRY):
+    """
+    목록 파일(한 줄에 도메인/URL 하나)들을 .qrbl 파일로 컴파일. 등록한 항목 수를 반환
+    도메인 정규화 / 공개 접미사 제외 규칙은 DomainBlocklist와 같음
+    """
+    from domain_blocklist import DomainBlocklist, iter_feed_lines  # 컴파일할 때만 필요 (순환 import 방지)
+
+    rules = DomainBlocklist()
+    prefix = "=" if scope == "exact" else ""
+    hashes = []
+    for path in sources:
+        for domain in iter_feed_lines(path):
+            host = rules.prepare(domain, scope)
+            if host is not None:
+                hashes.append(domain_hash(prefix + host))
+    hashes = np.unique(np.array(hashes, dtype=np.uint64))  # 정렬 + 중복 제거
+
+    count = len(hashes)
+    bloom_bits, bloom_k = 0, 0
+    bloom = np.zeros(0, dtype=np.uint8)
+    if bloom_bits_per_entry and count:
+        bloom_bits = max(count * bloom_bits_per_entry, 64)
+        bloom_k = max(1, round(bloom_bits_per_entry * 0.693))  # 최적 해시 개수 ≈ (m/n)·ln2
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        bits = np.zeros(padded_bloom_bytes(bloom_bits) * 8, dtype=bool)
+        for i in range(bloom_k):
+            bits[(h1 + np.uint64(i) * h2) % np.uint64(bloom_bits)] = True
+        bloom = np.packbits(bits, bitorder="little")
+
+    # 읽는 쪽이 쓰다 만 파일을 열지 않도록 임시 파일에 쓰고 교체
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, count, bloom_bits, bloom_k, 0))
+        f.write(bloom.tobytes())
+        f.write(hashes.astype("<u8").tobytes())
+    os.replace(tmp_path, output_path)
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="도메인 피드를 메모리 매핑용 차단 목록 파일(.qrbl)로 컴파일")
+    parser.add_argument("sources", nargs="+", help="목록 파일 (한 줄에 도메인/URL 하나)")
+    parser.add_argument("-o", "--output", required=True, help="출력 파일 경로 (.qrbl)")
+    parser.add_argument("--scope", choices=("suffix", "exact", "registrable"), default="suffix",
+                        help="차단 범위 (기본: 하위 도메인 포함)")
+    parser.add_argument("--bloom-bits", type=int, default=DEFAULT_BLOOM_BITS_PER_ENTRY,
+                        help="항목당 블룸 필터 비트 수 (기본 0: 블룸 필터 없이 이진 탐색만 사용, 예: 10)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = compile_blocklist(args.sources, args.output, args.scope, args.bloom_bits)
+    size = os.path.getsize(args.output)
+    print(f"[컴파일 완료] {count}개 항목 → {args.output} ({size / 1024 / 1024:.1f}MB, "
+          f"{time.perf_counter() - started:.2f}초)", file=sys.stderr)
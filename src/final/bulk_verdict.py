@@ -0,0 +1,199 @@
+# 대량 URL 판정 (메일 게이트웨이 등에서 추출한 URL 수만 개를 한 번에 검사)
+# is_suspicious_qr / scan_noopencv 모드 2는 호출 한 번에 URL 하나만 검사함.
+#   - 입력(리스트, 제너레이터, 파일)을 앞에서부터 읽으면서 중복 URL은 한 번만 검사
+#   - 리다이렉션 추적은 async_resolver를 그대로 사용 (호스트별 동시 요청 제한, URL마다 마감 시간)
+#     동시에 추적하는 URL 수 = workers (HTTP 요청 스레드 수와 같음, 늘리면 처리량이 비례해서 늘어남)
+#   - 판정은 웹캠 스캐너와 같은 규칙 엔진(rules/url_rules.json)과 리다이렉션 캐시(redirect_cache)를 사용
+#   - 결과는 끝나는 순서대로 바로 돌려줌 (입력 순서와 다를 수 있음, 항목마다 "url"이 들어 있음)
+#   - 결과를 받는 쪽이 멈추면 새 URL도 꺼내지 않음 (입력을 한꺼번에 메모리에 올리지 않음)
+#   - 형식이 잘못된 URL 등으로 검사 중 오류가 나면 그 URL만 "error"가 들어간 결과로 돌려주고 나머지는 계속 검사
+#
+# 사용: for verdict in BulkScanner(workers=32).scan(urls): ...
+# 실행: python src/final/bulk_verdict.py urls.txt [--workers 32] [--only-bad] > verdicts.jsonl
+import sys
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from async_resolver import resolve_chain_async, HostLimiter, REDIRECT_DEADLINE_SECONDS, HOP_TIMEOUT_SECONDS, PER_HOST_LIMIT
+from domain_blocklist import load_blocklist, SHORTENER_LIST_PATH, PHISHING_LIST_PATH
+from ip_reputation import IpReputation, load_cidr_blocklist, BAD_NETWORKS_LIST_PATH
+from redirect_resolver import redirect_cache_summary
+from rule_engine import RuleEngine, DEFAULT_RULES_PATH
+
+DEFAULT_WORKERS = 16
+
+def default_rule_engine(rules_path=DEFAULT_RULES_PATH):
+    """웹캠 스캐너와 같은 규칙 / 차단 목록으로 규칙 엔진 생성"""
+    return RuleEngine.from_file(rules_path, {
+        "phishing": load_blocklist(PHISHING_LIST_PATH),
+        "shortener": load_blocklist(SHORTENER_LIST_PATH),
+        "bad_networks": IpReputation(load_cidr_blocklist(BAD_NETWORKS_LIST_PATH)),
+    })
+
+def iter_url_file(path):
+    """한 줄에 URL 하나씩 적힌 파일 ("-"이면 표준 입력)"""
+    if path == "-":
+        yield from sys.stdin
+        return
+    with open(path, encoding="utf-8", errors="replace") as f:
+        yield from f
+
+class BulkScanner:
+    def __init__(self, engine=None, workers=DEFAULT_WORKERS, per_host=PER_HOST_LIMIT,
+                 deadline_seconds=REDIRECT_DEADLINE_SECONDS, hop_timeout=HOP_TIMEOUT_SECONDS, use_cache=True):
+        self.engine = engine or default_rule_engine()
+        self.workers = workers
+        self.per_host = per_host
+        self.deadline_seconds = deadline_seconds    # URL 하나의 리다이렉션 체인 추적에 허용하는 시간(초)
+        self.hop_timeout = hop_timeout
+        self.use_cache = use_cache
+        self.stats = {"inputs": 0, "duplicates": 0, "scanned": 0, "bad": 0, "truncated": 0, "failed": 0,
+                      "errors": 0, "seconds": 0.0}
+
+    def iter_unique(self, urls):
+        """빈 줄 / # 주석을 건너뛰고 처음 나온 URL만"""
+        seen = set()
+        for url in urls:
+            url = url.strip()
+            if not url or url.startswith("#"):
+                continue
+            self.stats["inputs"] += 1
+            if url in seen:
+                self.stats["duplicates"] += 1
+                continue
+            seen.add(url)
+            yield url
+
+    async def verdict(self, url, limiter, executor):
+        """URL 하나의 판정. 검사 중 오류가 나도 예외를 올리지 않고 오류 결과를 반환 (대량 검사 전체가 멈추지 않도록)"""
+        try:
+            return await self.evaluate(url, limiter, executor)
+        # requests.RequestException은 OSError(IOError)의 하위 클래스라 여기서 함께 처리됨
+        except (ValueError, UnicodeError, OSError) as e:   # 예: http://[::1/x → urlparse의 ValueError
+            self.stats["errors"] += 1
+            return {
+                "url": url,
+                "final_url": url,
+                "bad": False,
+                "score": 0,
+                "reasons": [],
+                "hops": 0,
+                "complete": False,
+                "error": f"{type(e).__name__}: {e}",
+            }
+
+    async def evaluate(self, url, limiter, executor):
+        resolution = None
+        final_url = url
+        if url.startswith("http://") or url.startswith("https://"):
+            deadline = asyncio.get_running_loop().time() + self.deadline_seconds
+            resolution = await resolve_chain_async(url, deadline, limiter, hop_timeout=self.hop_timeout,
+                                                   use_cache=self.use_cache, executor=executor)
+            final_url = resolution["final_url"]
+            if not resolution["ok"]:
+                self.stats["failed"] += 1
+            elif not resolution["complete"]:
+                self.stats["truncated"] += 1
+
+        # 판정 중 DNS 조회(IP 대역 규칙)가 있을 수 있으므로 이벤트 루프가 아닌 작업 스레드에서 실행
+        score, reasons = await asyncio.get_running_loop().run_in_executor(
+            executor, self.engine.evaluate, url, final_url, resolution)
+        bad = self.engine.is_bad(score)
+        self.stats["scanned"] += 1
+        self.stats["bad"] += bad
+        return {
+            "url": url,
+            "final_url": final_url,
+            "bad": bad,
+            "score": score,
+            "reasons": reasons,
+            "hops": resolution["hops"] if resolution else 0,
+            "complete": resolution["complete"] if resolution else True,
+            "error": None,
+        }
+
+    def scan(self, urls):
+        """
+        URL들을 검사해서 판정 dict를 끝나는 순서대로 반환하는 제너레이터
+        {"url", "final_url", "bad", "score", "reasons", "hops", "complete", "error"}
+        """
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-probe")
+        limiter = HostLimiter(self.per_host)
+        unique = self.iter_unique(urls)
+        pending = set()
+        exhausted = False
+        started = time.perf_counter()
+        try:
+            while True:
+                # 동시에 추적하는 URL이 workers개가 되도록 채움 (더 채우면 스레드를 기다리는 시간도 마감 시간에 포함됨)
+                while not exhausted and len(pending) < self.workers:
+                    url = next(unique, None)
+                    if url is None:
+                        exhausted = True
+                    else:
+                        pending.add(loop.create_task(self.verdict(url, limiter, executor)))
+                if not pending:
+                    break
+                # 하나라도 끝날 때까지만 이벤트 루프를 돌리고 끝난 결과를 바로 넘김
+                done, pending = loop.run_until_complete(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))
+                for task in done:
+                    yield task.result()
+        finally:
+            # 중간에 그만 받는 경우: 남은 추적은 취소하고 HTTP 요청을 기다리지 않음
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.stats["seconds"] += time.perf_counter() - started
+
+    def summary(self):
+        rate = self.stats["scanned"] / self.stats["seconds"] if self.stats["seconds"] else 0.0
+        return (f"[대량 판정] 입력 {self.stats['inputs']}개 (중복 {self.stats['duplicates']}개 제외), "
+                f"검사 {self.stats['scanned']}개 / 악성 {self.stats['bad']}개, "
+                f"추적 중단 {self.stats['truncated']}개 / 연결 실패 {self.stats['failed']}개 / "
+                f"오류 {self.stats['errors']}개, "
+                f"{self.stats['seconds']:.1f}초 ({rate:.0f}개/초, 동시 {self.workers}개)")
+
+def scan_urls(urls, **kwargs):
+    """BulkScanner(**kwargs).scan(urls)의 축약형"""
+    return BulkScanner(**kwargs).scan(urls)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="URL 목록을 한 번에 검사해서 판정 결과를 JSON Lines로 출력")
+    parser.add_argument("sources", nargs="+", help="URL 목록 파일 (한 줄에 하나, -이면 표준 입력)")
+    parser.add_argument("-o", "--output", default="-", help="결과 파일 (기본: 표준 출력)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 추적할 URL 수")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_LIMIT, help="호스트당 동시 요청 수")
+    parser.add_argument("--deadline", type=float, default=REDIRECT_DEADLINE_SECONDS,
+                        help="URL 하나의 리다이렉션 추적 마감 시간(초)")
+    parser.add_argument("--rules", default=DEFAULT_RULES_PATH, help="URL 의심 조건 규칙 파일 (JSON)")
+    parser.add_argument("--only-bad", action="store_true", help="악성으로 판정된 URL만 출력")
+    parser.add_argument("--no-cache", action="store_true", help="리다이렉션 캐시를 사용하지 않음")
+    args = parser.parse_args()
+
+    scanner = BulkScanner(default_rule_engine(args.rules), workers=args.workers, per_host=args.per_host,
+                          deadline_seconds=args.deadline, use_cache=not args.no_cache)
+    urls = (line for path in args.sources for line in iter_url_file(path))
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        # 추적 중 로그(연결 실패 등)가 결과 출력(JSON Lines)에 섞이지 않도록 표준 오류로 보냄
+        with contextlib.redirect_stdout(sys.stderr):
+            for verdict in scanner.scan(urls):
+                if verdict["bad"] or not args.only_bad:
+                    output.write(json.dumps(verdict, ensure_ascii=False) + "\n")
+                    output.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(scanner.summary(), file=sys.stderr)
+    if not args.no_cache:
+        print(redirect_cache_summary(), file=sys.stderr)
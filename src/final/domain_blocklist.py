@@ -0,0 +1,199 @@
+# 도메인 차단 목록 인덱스
+# 기존에는 스캐너마다 작은 리스트를 따로 두고 any(domain.endswith(...)) / `in 리스트`로 선형 검사했음.
+# (QR_Webcam_Scanner_Ver5의 단축 URL 목록, QR_Domain_Scanner.SUSPICIOUS_DOMAINS, scan_noopencv.known_phishing_domains)
+# 수백만 개 도메인이 들어 있는 위협 피드도 그대로 불러올 수 있도록 공용 인덱스로 통일함.
+#   - 등록된 도메인은 해시 집합(set)에 보관. 조회할 때 호스트를 라벨 단위로 잘라
+#     "a.b.evil.com" → "b.evil.com" → "evil.com" 순서로 집합을 확인 (라벨 하나당 해시 조회 1회)
+#   - scope="suffix"       : 등록한 도메인과 그 하위 도메인을 모두 차단 (기본값)
+#     scope="exact"        : 정확히 같은 호스트만 차단
+#     scope="registrable"  : 등록 가능 도메인(eTLD+1) 전체를 차단 (login.evil.co.kr → evil.co.kr 이하 전부)
+#   - 공개 접미사(com, co.kr 등) 자체는 등록하지 않음 (모든 도메인이 걸리는 것을 방지)
+#   - 컴파일된 목록 파일(.qrbl, blocklist_store.py 참고)은 집합에 풀지 않고 메모리 매핑한 채로 함께 조회
+import os
+import threading
+from urllib.parse import urlsplit
+
+from blocklist_store import is_compiled_blocklist, CompiledBlocklist
+
+# 기본 목록 파일 위치 (src/final/blocklists)
+BLOCKLIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blocklists")
+SHORTENER_LIST_PATH = os.path.join(BLOCKLIST_DIR, "url_shorteners.txt")
+PHISHING_LIST_PATH = os.path.join(BLOCKLIST_DIR, "phishing_domains.txt")
+
+SCOPES = ("suffix", "exact", "registrable")
+
+# 두 라벨 이상으로 이루어진 공개 접미사 (등록 가능 도메인 계산용, 자주 쓰이는 것만)
+# 한 라벨짜리 최상위 도메인(com, net, kr 등)은 목록 없이도 공개 접미사로 취급함
+MULTI_LABEL_SUFFIXES = frozenset([
+    "co.kr", "or.kr", "ne.kr", "go.kr", "ac.kr", "re.kr", "pe.kr", "ms.kr", "hs.kr", "es.kr", "sc.kr",
+    "kg.kr", "mil.kr", "seoul.kr", "busan.kr",
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "com.cn", "net.cn", "org.cn", "gov.cn",
+    "com.br", "com.tw", "com.hk", "com.sg", "com.my", "com.tr", "com.mx", "com.ar",
+    "co.in", "co.nz", "co.za", "co.id", "co.th",
+    "github.io", "blogspot.com", "herokuapp.com", "appspot.com", "web.app", "firebaseapp.com",
+    "netlify.app", "vercel.app", "pages.dev", "workers.dev", "azurewebsites.net", "cloudfront.net",
+])
+
+def normalize_domain(value):
+    """
+    도메인 또는 URL에서 비교용 호스트 이름 추출 (소문자, 포트/사용자 정보/끝의 점 제거, IDN은 punycode로 변환)
+    호스트를 찾을 수 없으면 None
+    """
+    value = value.strip()
+    if not value:
+        return None
+    if "://" in value:
+        host = urlsplit(value).hostname
+    else:
+        host = value.split("/", 1)[0].rsplit("@", 1)[-1]
+        if not host.startswith("["):
+            host = host.split(":", 1)[0]
+    if not host:
+        return None
+    host = host.strip(".").lower()
+    if host.startswith("*."):  # 와일드카드 표기는 하위 도메인 포함(suffix)과 같은 의미
+        host = host[2:]
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            return None
+    return host or None
+
+def is_ip_address(host):
+    return host.replace(".", "").isdigit() or ":" in host
+
+def iter_feed_lines(path):
+    """
+    한 줄에 도메인/URL 하나씩 적힌 목록 파일의 항목들
+    빈 줄과 # 주석은 무시하고, hosts 파일 형식("0.0.0.0 evil.com")은 마지막 칸을 사용
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield line.split()[-1]
+
+class DomainBlocklist:
+    def __init__(self, domains=(), scope="suffix", public_suffixes=MULTI_LABEL_SUFFIXES):
+        self.public_suffixes = public_suffixes
+        self.suffixes = set()   # 자신과 하위 도메인까지 차단하는 도메인
+        self.exact = set()      # 정확히 일치하는 호스트만 차단
+        self.compiled = []      # 메모리 매핑된 컴파일 목록 (CompiledBlocklist)
+        self.removed = set()    # 컴파일 목록에서 제외할 도메인 (컴파일 파일은 수정할 수 없으므로 따로 기록)
+        self.lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "rejected": 0}
+        self.update(domains, scope)
+
+    def is_public_suffix(self, host):
+        return "." not in host or host in self.public_suffixes
+
+    def registrable_domain(self, host):
+        """등록 가능 도메인(eTLD+1). 예: login.evil.co.kr → evil.co.kr / IP 주소, 공개 접미사는 None"""
+        if is_ip_address(host) or self.is_public_suffix(host):
+            return None
+        labels = host.split(".")
+        # 가장 긴 공개 접미사를 찾아 그 앞 라벨 하나까지
+        for i in range(1, len(labels) - 1):
+            if ".".join(labels[i:]) in self.public_suffixes:
+                return ".".join(labels[i - 1:])
+        return ".".join(labels[-2:])
+
+    def prepare(self, domain, scope="suffix"):
+        """등록할 호스트 이름 (등록할 수 없으면(형식 오류, 공개 접미사) None)"""
+        if scope not in SCOPES:
+            raise ValueError(f"알 수 없는 차단 범위: {scope} (사용 가능: {', '.join(SCOPES)})")
+        host = normalize_domain(domain)
+        if host and scope == "registrable":
+            host = self.registrable_domain(host)
+        if not host or (scope != "exact" and self.is_public_suffix(host)):
+            self.stats["rejected"] += 1
+            return None
+        return host
+
+    def add(self, domain, scope="suffix"):
+        """도메인(또는 URL) 등록. 등록하지 못하면 False"""
+        host = self.prepare(domain, scope)
+        if host is None:
+            return False
+        with self.lock:
+            (self.exact if scope == "exact" else self.suffixes).add(host)
+            self.removed.discard(host)
+        return True
+
+    def update(self, domains, scope="suffix"):
+        return sum(self.add(domain, scope) for domain in domains)
+
+    def remove(self, domain):
+        host = normalize_domain(domain)
+        if not host:
+            return
+        with self.lock:
+            self.suffixes.discard(host)
+            self.exact.discard(host)
+            if self.compiled:
+                self.removed.add(host)
+
+    def load_file(self, path, scope="suffix"):
+        """
+        목록 파일 불러오기. 등록한 개수를 반환
+        컴파일된 목록(.qrbl)은 파싱하지 않고 메모리 매핑으로 연결함 (scope는 컴파일할 때 정해짐)
+        """
+        if is_compiled_blocklist(path):
+            compiled = CompiledBlocklist(path)
+            with self.lock:
+                self.compiled.append(compiled)
+            return len(compiled)
+        return sum(self.add(domain, scope) for domain in iter_feed_lines(path))
+
+    def in_sets(self, host, exact):
+        """host가 등록되어 있는지 (exact=True면 정확 일치 항목도 확인)"""
+        if host in self.suffixes or (exact and host in self.exact):
+            return True
+        if host in self.removed:
+            return False
+        return any(compiled.contains(host, exact) for compiled in self.compiled)
+
+    def match(self, value):
+        """차단 목록에 걸린 항목(도메인 문자열)을 반환. 걸리지 않으면 None"""
+        self.stats["lookups"] += 1
+        host = normalize_domain(value)
+        if not host:
+            return None
+        if self.in_sets(host, exact=True):
+            self.stats["hits"] += 1
+            return host
+        if is_ip_address(host):
+            return None
+        # 상위 도메인으로 올라가며 확인 (라벨 하나당 해시 조회 1회). 공개 접미사는 등록되지 않으므로 거기서 멈춤
+        dot = host.find(".")
+        while dot != -1:
+            parent = host[dot + 1:]
+            if self.is_public_suffix(parent):
+                break
+            if self.in_sets(parent, exact=False):
+                self.stats["hits"] += 1
+                return parent
+            dot = host.find(".", dot + 1)
+        return None
+
+    def __contains__(self, value):
+        return self.match(value) is not None
+
+    def __len__(self):
+        return len(self.suffixes) + len(self.exact) + sum(len(compiled) for compiled in self.compiled)
+
+    def summary(self):
+        compiled = f", 컴파일 목록 {len(self.compiled)}개" if self.compiled else ""
+        return (f"[차단 목록] {len(self)}개 도메인 (하위 포함 {len(self.suffixes)} / 정확 일치 {len(self.exact)}"
+                f"{compiled}), 조회 {self.stats['lookups']}회 / 일치 {self.stats['hits']}회")
+
+def load_blocklist(*paths, domains=(), scope="suffix"):
+    """목록 파일들과 추가 도메인을 합쳐서 DomainBlocklist 생성"""
+    blocklist = DomainBlocklist(domains, scope)
+    for path in paths:
+        blocklist.load_file(path, scope)
+    return blocklist
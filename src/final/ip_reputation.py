@@ -0,0 +1,268 @@
+# IP / CIDR 평판 검사
+# 기존에는 호스트가 IPv4 주소 형태인지만 정규식(\d{1,3} 네 개)으로 확인했음 (999.1.1.1도 통과, IPv6는 놓침).
+# 도메인 이름도 DNS로 주소를 확인해서, 위험 IP 대역 목록(CIDR)에 속하는지 검사함.
+#   - IP 주소 판별은 ipaddress 모듈 사용 (IPv4 / IPv6, 잘못된 옥텟은 IP로 보지 않음)
+#   - CIDR 목록은 주소 버전별로 (시작 주소, 끝 주소)를 정렬해 둔 구간 배열로 보관하고 이진 탐색으로 조회
+#     (대역 수십만 개도 조회 한 번에 비교 약 20회. 다른 대역 안에 포함된 대역은 미리 제거)
+#   - DNS 조회 결과는 TTL 동안 캐시 (조회 실패도 짧게 기억). 조회 함수는 교체 가능 (테스트용 가짜 resolver 등)
+#   - DNS 조회는 별도 스레드에서 실행하고 timeout초까지만 기다림 (느린 DNS 서버가 분석 워커를 붙잡지 않도록)
+#   - 목록에 문서용 예시 대역(RFC 5737 / RFC 3849)만 있으면 DNS를 조회하지 않음
+#     (실제 호스트가 그 대역으로 확인될 일이 없으므로 URL마다 조회해도 결과가 없음)
+#   - 규칙 엔진에서는 도메인 차단 목록과 같은 방식(match)으로 사용: blocklist 규칙의 list에 이름으로 연결
+import os
+import ipaddress
+import socket
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from domain_blocklist import BLOCKLIST_DIR
+
+BAD_NETWORKS_LIST_PATH = os.path.join(BLOCKLIST_DIR, "bad_networks.txt")
+
+DNS_CACHE_TTL = 300             # DNS 조회 결과 유지 시간(초)
+DNS_CACHE_NEGATIVE_TTL = 60     # 조회 실패 결과 유지 시간(초)
+DNS_CACHE_MAX_ENTRIES = 4096
+DNS_LOOKUP_TIMEOUT = 2.0        # 호스트 하나의 DNS 조회를 기다리는 최대 시간(초)
+
+# 문서 / 예시 전용 대역 (bad_networks.txt 기본 항목). 이 대역만 있는 목록은 DNS 조회가 필요 없음
+DOCUMENTATION_NETWORKS = [ipaddress.ip_network(network) for network in
+                          ("192.0.2.0/24", "198.51.100.0/24", "203.0.113.0/24", "2001:db8::/32")]
+
+def parse_ip(host):
+    """호스트 이름이 IP 주소면 ipaddress 객체, 아니면 None (대괄호로 감싼 IPv6도 허용)"""
+    if not host:
+        return None
+    try:
+        address = ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return None
+    # IPv4가 포함된 IPv6 주소(::ffff:1.2.3.4)는 IPv4 주소로 검사
+    if address.version == 6 and address.ipv4_mapped:
+        return address.ipv4_mapped
+    return address
+
+def iter_network_lines(path):
+    """
+    한 줄에 CIDR 대역 하나씩 적힌 목록 파일의 항목들
+    # / ; 뒤는 주석 (Spamhaus DROP 형식: "1.10.16.0/20 ; SBL256894")
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.split("#", 1)[0].split(";", 1)[0].strip()
+            if line:
+                yield line.split()[0]
+
+class CidrBlocklist:
+    def __init__(self, networks=()):
+        self.entries = []       # (버전, 시작 주소, 끝 주소, 대역 문자열) - 등록한 그대로
+        self.index = {4: ([], [], []), 6: ([], [], [])}   # 버전 → (시작 주소 목록, 끝 주소 목록, 대역 문자열 목록)
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "rejected": 0}
+        self.routable = 0       # 문서용 예시 대역이 아닌 대역 수 (0이면 도메인을 DNS로 확인할 필요 없음)
+        self.update(networks)
+
+    def add(self, network):
+        """CIDR 대역(또는 단일 주소) 등록. 형식이 잘못되었으면 False"""
+        try:
+            network = ipaddress.ip_network(network.strip(), strict=False)
+        except ValueError:
+            self.stats["rejected"] += 1
+            return False
+        documentation = any(network.version == example.version and network.subnet_of(example)
+                            for example in DOCUMENTATION_NETWORKS)
+        with self.lock:
+            self.entries.append((network.version, int(network.network_address), int(network.broadcast_address),
+                                 str(network)))
+            self.routable += not documentation
+            self.dirty = True
+        return True
+
+    def update(self, networks):
+        return sum(self.add(network) for network in networks)
+
+    def load_file(self, path):
+        return self.update(iter_network_lines(path))
+
+    def build(self):
+        """구간 배열 다시 만들기 (등록 후 첫 조회 때 자동으로 호출됨)"""
+        with self.lock:
+            index = {4: ([], [], []), 6: ([], [], [])}
+            # 시작 주소 순, 같으면 넓은 대역이 먼저 → 앞 대역 안에 포함된 대역은 건너뜀
+            # (CIDR 대역끼리는 일부만 겹치는 경우가 없으므로 남은 구간은 서로 겹치지 않음)
+            for version, start, end, label in sorted(self.entries, key=lambda entry: (entry[0], entry[1], -entry[2])):
+                starts, ends, labels = index[version]
+                if ends and start <= ends[-1]:
+                    continue
+                starts.append(start)
+                ends.append(end)
+                labels.append(label)
+            self.index = index  # 조회 중인 스레드는 이전 배열을 계속 사용
+            self.dirty = False
+
+    def lookup(self, address):
+        """address(ipaddress 객체)가 속한 대역 문자열, 없으면 None"""
+        if self.dirty:
+            self.build()
+        self.stats["lookups"] += 1
+        starts, ends, labels = self.index[address.version]
+        value = int(address)
+        i = bisect_right(starts, value) - 1
+        if i >= 0 and value <= ends[i]:
+            self.stats["hits"] += 1
+            return labels[i]
+        return None
+
+    def __contains__(self, address):
+        address = parse_ip(address) if isinstance(address, str) else address
+        return address is not None and self.lookup(address) is not None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def summary(self):
+        return (f"[IP 대역 목록] {len(self)}개 대역, 조회 {self.stats['lookups']}회 / 일치 {self.stats['hits']}회"
+                f" (형식 오류 {self.stats['rejected']}개)")
+
+def load_cidr_blocklist(*paths, networks=()):
+    """목록 파일들과 추가 대역을 합쳐서 CidrBlocklist 생성"""
+    blocklist = CidrBlocklist(networks)
+    for path in paths:
+        blocklist.load_file(path)
+    blocklist.build()
+    return blocklist
+
+def system_resolve(host):
+    """운영체제 resolver로 호스트의 IPv4 / IPv6 주소 목록 조회"""
+    infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    return sorted({info[4][0] for info in infos})
+
+class CachingResolver:
+    def __init__(self, resolve=system_resolve, ttl=DNS_CACHE_TTL, negative_ttl=DNS_CACHE_NEGATIVE_TTL,
+                 max_entries=DNS_CACHE_MAX_ENTRIES, clock=time.monotonic, timeout=DNS_LOOKUP_TIMEOUT):
+        """
+        resolve: 호스트 이름 → 주소 문자열 목록 (또는 (주소 목록, TTL초)) 함수. 실패하면 OSError
+        clock: 만료 시각 계산용 시계 (테스트에서 시간을 앞당길 수 있도록 교체 가능)
+        timeout: 조회 한 번을 기다리는 최대 시간(초). 넘기면 조회 실패로 처리 (None이면 제한 없음)
+        """
+        self.resolve = resolve
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.timeout = timeout
+        self.cache = OrderedDict()   # 호스트 → (만료 시각, [ipaddress 객체, ...])
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "failures": 0, "timeouts": 0, "expired": 0}
+
+    def resolve_with_timeout(self, host):
+        """
+        resolve(host)를 조회 스레드에서 실행하고 timeout초까지만 기다림 (getaddrinfo에는 시간 제한이 없음)
+        캐시 미적중 때만 호출되므로 조회마다 데몬 스레드를 만듦 (끝나지 않는 조회가 종료를 막지 않도록)
+        """
+        if self.timeout is None:
+            return self.resolve(host)
+        outcome = {}
+        done = threading.Event()
+
+        def run():
+            try:
+                outcome["result"] = self.resolve(host)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=run, name="dns-lookup", daemon=True).start()
+        if not done.wait(self.timeout):
+            # 조회 스레드는 끝날 때까지 그대로 두고 결과는 버림
+            self.stats["timeouts"] += 1
+            raise OSError(f"DNS 조회 시간 초과 ({self.timeout}초): {host}")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def lookup(self, host):
+        """호스트의 주소 목록 (ipaddress 객체). 조회에 실패하면 빈 리스트"""
+        host = host.lower()
+        now = self.clock()
+        with self.lock:
+            entry = self.cache.get(host)
+            if entry is not None:
+                if now < entry[0]:
+                    self.cache.move_to_end(host)
+                    self.stats["hits"] += 1
+                    return entry[1]
+                del self.cache[host]
+                self.stats["expired"] += 1
+            self.stats["misses"] += 1
+
+        # DNS 조회는 잠금 밖에서 (느린 조회가 다른 호스트 조회를 막지 않도록)
+        ttl = self.ttl
+        try:
+            result = self.resolve_with_timeout(host)
+            if isinstance(result, tuple):
+                result, ttl = result
+            addresses = [address for address in map(parse_ip, result) if address is not None]
+        except (OSError, UnicodeError):
+            self.stats["failures"] += 1
+            addresses, ttl = [], self.negative_ttl
+
+        with self.lock:
+            self.cache[host] = (now + ttl, addresses)
+            self.cache.move_to_end(host)
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        return addresses
+
+    def summary(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / total * 100 if total else 0.0
+        return (f"[DNS 캐시] 적중 {self.stats['hits']}회 / 미적중 {self.stats['misses']}회 "
+                f"(만료 {self.stats['expired']}, 실패 {self.stats['failures']}, 시간 초과 {self.stats['timeouts']}) / "
+                f"적중률 {hit_rate:.1f}%")
+
+class IpReputation:
+    def __init__(self, networks, resolver=None, resolve_hostnames=None):
+        """
+        networks: CidrBlocklist
+        resolver: CachingResolver (None이면 기본 resolver 생성)
+        resolve_hostnames: 도메인을 DNS로 확인할지 여부. False면 IP 주소로 된 호스트만 검사,
+                           None(기본)이면 목록에 문서용 예시 대역이 아닌 대역이 있을 때만 DNS 조회
+        """
+        self.networks = networks
+        self.resolver = resolver or CachingResolver()
+        self.resolve_hostnames = resolve_hostnames
+
+    def addresses(self, host):
+        address = parse_ip(host)
+        if address is not None:
+            return [address]
+        if self.resolve_hostnames is False or not self.networks:
+            return []
+        if self.resolve_hostnames is None and not self.networks.routable:
+            return []
+        return self.resolver.lookup(host)
+
+    def match(self, value):
+        """호스트(또는 URL)의 주소가 위험 대역에 속하면 "주소 ∈ 대역" 문자열, 아니면 None"""
+        host = urlsplit(value).hostname if "://" in value else value
+        if not host:
+            return None
+        for address in self.addresses(host):
+            network = self.networks.lookup(address)
+            if network:
+                return f"{address} ∈ {network}"
+        return None
+
+    def __contains__(self, value):
+        return self.match(value) is not None
+
+    def __len__(self):
+        return len(self.networks)
+
+    def summary(self):
+        return f"{self.networks.summary()} / {self.resolver.summary()}"
@@ -0,0 +1,59 @@
+# 저조도(야간 모드) 처리 모듈
+# 기존에는 is_dark_environment / enhance_for_low_light가 같은 프레임을 각각 그레이로 변환하고,
+# 어두운 프레임마다 CLAHE 객체를 새로 만들며, 보정한 그레이 이미지를 다시 BGR로 바꿔서 디코딩했음.
+#   - 밝기는 일정 간격으로 샘플링한 격자에서만 추정 (그레이 변환 없이 채널 평균으로 계산)
+#   - 야간 모드 진입 / 해제 기준을 다르게 두어(히스테리시스) 경계 밝기에서 모드가 깜빡이지 않게 함
+#   - CLAHE 객체는 한 번만 생성해서 재사용
+#   - 보정 결과는 단일 채널 그대로 디코딩에 사용 (화면 표시할 때만 BGR로 변환)
+import cv2
+
+# BGR → 밝기(Y) 변환 가중치 (cv2.COLOR_BGR2GRAY와 동일)
+LUMA_WEIGHTS = (0.114, 0.587, 0.299)
+
+class LowLightProcessor:
+    def __init__(self, dark_threshold=50, hysteresis=8, grid_step=8, clip_limit=3.0, tile_grid_size=(8, 8)):
+        self.dark_threshold = dark_threshold  # 평균 밝기가 이 값 미만이면 야간 모드 진입
+        self.hysteresis = hysteresis          # 평균 밝기가 dark_threshold + hysteresis 이상이 되어야 해제
+        self.grid_step = grid_step            # 밝기 추정 시 가로/세로 샘플링 간격 (픽셀)
+        self.clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid_size)
+        self.dark = False
+        self.brightness = None                # 마지막으로 추정한 평균 밝기
+        self.stats = {"frames": 0, "dark_frames": 0, "switches": 0}
+
+    def estimate_brightness(self, frame):
+        """격자 샘플의 평균 밝기 (0~255)"""
+        sample = frame[::self.grid_step, ::self.grid_step]
+        means = cv2.mean(sample)
+        if sample.ndim == 2:
+            return means[0]
+        # 밝기는 채널의 선형 결합이므로 채널 평균에 가중치를 곱하면 그레이 평균과 같음
+        return sum(weight * mean for weight, mean in zip(LUMA_WEIGHTS, means))
+
+    def is_dark(self, frame):
+        """히스테리시스를 적용한 야간 모드 여부 (상태를 갱신함)"""
+        self.brightness = self.estimate_brightness(frame)
+        if self.dark:
+            dark = self.brightness < self.dark_threshold + self.hysteresis
+        else:
+            dark = self.brightness < self.dark_threshold
+        if dark != self.dark:
+            self.stats["switches"] += 1
+            self.dark = dark
+        self.stats["frames"] += 1
+        self.stats["dark_frames"] += dark
+        return dark
+
+    def enhance(self, frame):
+        """CLAHE 대비 보정. 단일 채널(그레이) 이미지를 반환"""
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return self.clahe.apply(gray)
+
+    def reset(self):
+        self.dark = False
+        self.brightness = None
+
+    def summary(self):
+        frames = self.stats["frames"]
+        rate = self.stats["dark_frames"] / frames * 100 if frames else 0.0
+        return (f"[야간 모드] {self.stats['dark_frames']}/{frames}프레임 적용 ({rate:.1f}%), "
+                f"모드 전환 {self.stats['switches']}회")
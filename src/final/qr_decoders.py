@@ -0,0 +1,138 @@
+# QR 디코더 백엔드 모듈
+# 웹캠 스캐너는 OpenCV QRCodeDetector, 프로토타입(QR_Domain_Scanner, Scam_scanner, scan_noopencv)은
+# pyzbar.decode를 사용하고 있었음. 이를 하나의 인터페이스로 통일함.
+#   - 모든 백엔드는 decode(image) → [(data, bbox), ...] 형태로 반환 (bbox는 (1, N, 2) 꼭짓점 배열)
+#   - DecoderCascade: 빠른 백엔드부터 시도하고, 실패했을 때만 다음 백엔드로 넘어감
+#   - pyzbar, WeChat QR(opencv-contrib)은 설치되어 있을 때만 사용
+import time
+
+import cv2
+import numpy as np
+
+# 기본 시도 순서 (일반적으로 빠른 순서). 설치되지 않은 백엔드는 건너뜀
+DEFAULT_CASCADE = ("pyzbar", "opencv", "wechat")
+
+class OpenCVDecoder:
+    name = "opencv"
+
+    def __init__(self, multi=True):
+        self.detector = cv2.QRCodeDetector()
+        self.multi = multi    # True면 한 이미지의 여러 QR을 모두 디코딩
+
+    @staticmethod
+    def is_available():
+        return True
+
+    def decode(self, image):
+        if self.multi:
+            try:
+                found, decoded_info, points, _ = self.detector.detectAndDecodeMulti(image)
+            except cv2.error:
+                # 후보 영역이 부족하면 OpenCV 내부(kmeans)에서 예외가 발생하는 경우가 있음 → 못 찾은 것으로 처리
+                return []
+            if not found or points is None:
+                return []
+            return [(data, bbox[np.newaxis]) for data, bbox in zip(decoded_info, points) if data]
+
+        data, bbox, _ = self.detector.detectAndDecode(image)
+        return [(data, bbox)] if data and bbox is not None else []
+
+class PyzbarDecoder:
+    name = "pyzbar"
+
+    def __init__(self):
+        from pyzbar import pyzbar
+        self.pyzbar = pyzbar
+
+    @staticmethod
+    def is_available():
+        # zbar 공유 라이브러리가 없으면 import 단계에서 실패함
+        try:
+            from pyzbar import pyzbar  # noqa: F401
+        except (ImportError, OSError):
+            return False
+        return True
+
+    def decode(self, image):
+        results = []
+        for obj in self.pyzbar.decode(image, symbols=[self.pyzbar.ZBarSymbol.QRCODE]):
+            bbox = np.array([[(point.x, point.y) for point in obj.polygon]], dtype=np.float32)
+            results.append((obj.data.decode("utf-8", errors="replace"), bbox))
+        return results
+
+class WeChatDecoder:
+    """OpenCV contrib의 WeChat QR 검출기 (opencv-contrib-python 설치 시에만 사용 가능)"""
+    name = "wechat"
+
+    def __init__(self):
+        self.detector = cv2.wechat_qrcode_WeChatQRCode()
+
+    @staticmethod
+    def is_available():
+        return hasattr(cv2, "wechat_qrcode_WeChatQRCode")
+
+    def decode(self, image):
+        decoded_info, points = self.detector.detectAndDecode(image)
+        return [(data, np.asarray(bbox, dtype=np.float32)[np.newaxis])
+                for data, bbox in zip(decoded_info, points) if data]
+
+BACKENDS = {
+    OpenCVDecoder.name: OpenCVDecoder,
+    PyzbarDecoder.name: PyzbarDecoder,
+    WeChatDecoder.name: WeChatDecoder,
+}
+
+def available_backends():
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+def create_decoder(name):
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 디코더 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    if not BACKENDS[name].is_available():
+        raise RuntimeError(f"디코더 백엔드를 사용할 수 없습니다 (미설치): {name}")
+    return BACKENDS[name]()
+
+class DecoderCascade:
+    """
+    여러 백엔드를 순서대로 시도 (앞 백엔드가 QR을 찾으면 뒤 백엔드는 실행하지 않음)
+    백엔드별 시도/성공 횟수와 누적 시간을 stats에 기록
+    """
+    def __init__(self, backends):
+        self.backends = list(backends)
+        if not self.backends:
+            raise RuntimeError("사용 가능한 디코더 백엔드가 없습니다.")
+        self.stats = {backend.name: {"attempts": 0, "hits": 0, "seconds": 0.0} for backend in self.backends}
+
+    @property
+    def names(self):
+        return [backend.name for backend in self.backends]
+
+    def decode_with_backend(self, image):
+        """([(data, bbox), ...], 성공한 백엔드 이름) 반환. 모두 실패하면 ([], None)"""
+        for backend in self.backends:
+            stats = self.stats[backend.name]
+            started = time.perf_counter()
+            results = backend.decode(image)
+            stats["seconds"] += time.perf_counter() - started
+            stats["attempts"] += 1
+            if results:
+                stats["hits"] += 1
+                return results, backend.name
+        return [], None
+
+    def decode(self, image):
+        return self.decode_with_backend(image)[0]
+
+    def summary(self):
+        parts = []
+        for name, stats in self.stats.items():
+            average = stats["seconds"] / stats["attempts"] * 1000 if stats["attempts"] else 0.0
+            parts.append(f"{name} {stats['hits']}/{stats['attempts']}회 성공, 평균 {average:.1f}ms")
+        return "[디코더] " + " / ".join(parts)
+
+def create_decoder_cascade(order=DEFAULT_CASCADE):
+    """order 순서대로 설치된 백엔드만 모아서 DecoderCascade 생성"""
+    unknown = [name for name in order if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 디코더 백엔드: {', '.join(unknown)} (사용 가능: {', '.join(BACKENDS)})")
+    return DecoderCascade(BACKENDS[name]() for name in order if BACKENDS[name].is_available())
@@ -0,0 +1,257 @@
+# QR 검출기 관리 모듈
+# 기존 detect_qr_opencv는 프레임마다 cv2.QRCodeDetector()를 새로 만들고,
+# SuppressStderr로 dup/dup2/open/close 시스템 콜을 프레임마다 반복했음.
+#   - QRDecoderSession: 검출기 1개 + stderr 차단을 세션 동안 한 번만 설정 (단일 감지 스레드용)
+#   - DetectorPool: 여러 스레드가 동시에 디코딩할 때 검출기를 빌려 쓰는 풀
+import os, sys
+import queue
+import threading
+from contextlib import contextmanager
+
+import cv2
+
+# --- stderr 완전 무력화 (OpenCV 내부 경고 제거 목적) ---
+class SuppressStderr:
+    def __enter__(self):
+        self.original_stderr_fd = sys.stderr.fileno()
+        self.devnull_fd = os.open(os.devnull, os.O_RDWR)
+        self.saved_stderr_fd = os.dup(self.original_stderr_fd)
+        os.dup2(self.devnull_fd, self.original_stderr_fd)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        os.dup2(self.saved_stderr_fd, self.original_stderr_fd)
+        os.close(self.devnull_fd)
+        os.close(self.saved_stderr_fd)
+
+class QRDecoderSession:
+    """
+    세션 동안 재사용하는 QR 검출기
+    with 블록에 들어갈 때 stderr(fd 2)를 한 번만 차단하고, 나올 때 복구함.
+    fd 2를 막아도 파이썬 오류 메시지는 보이도록 sys.stderr는 원래 출력으로 다시 연결함.
+    decode()는 한 스레드(감지 스레드)에서만 호출해야 함. 여러 스레드는 DetectorPool 사용.
+    """
+    def __init__(self):
+        self.detector = cv2.QRCodeDetector()
+        self.suppressor = None
+        self.python_stderr = None
+
+    def __enter__(self):
+        sys.stderr.flush()
+        self.suppressor = SuppressStderr()
+        self.suppressor.__enter__()
+        self.python_stderr = sys.stderr
+        sys.stderr = open(os.dup(self.suppressor.saved_stderr_fd), "w", buffering=1,
+                          encoding=self.python_stderr.encoding or "utf-8", errors="backslashreplace")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        sys.stderr.close()
+        sys.stderr = self.python_stderr
+        self.suppressor.__exit__(exc_type, exc_val, exc_tb)
+        self.suppressor = None
+
+    def decode(self, frame):
+        """detectAndDecode 결과 (data, bbox, straight_qrcode) 그대로 반환"""
+        return self.detector.detectAndDecode(frame)
+
+    def decode_multi(self, frame):
+        """detectAndDecodeMulti 결과 (found, decoded_info, points, straight_qrcodes) 그대로 반환"""
+        try:
+            return self.detector.detectAndDecodeMulti(frame)
+        except cv2.error:
+            # 후보 영역이 부족하면 OpenCV 내부(kmeans)에서 예외가 발생하는 경우가 있음 → 못 찾은 것으로 처리
+            return False, (), None, None
+
+class DetectorPool:
+    """
+    스레드 안전한 QR 검출기 풀 (검출기 하나를 여러 스레드가 동시에 쓰지 않도록 빌려주고 돌려받음)
+    stderr 차단은 프로세스 전체에 적용되므로 QRDecoderSession 하나로 감싸서 사용하면 됨.
+    """
+    def __init__(self, size=4):
+        self.detectors = queue.LifoQueue()   # 최근에 쓴 검출기를 먼저 재사용 (캐시 효율)
+        self.created = 0
+        self.max_size = size
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        detector = self.take()
+        try:
+            yield detector
+        finally:
+            self.detectors.put(detector)
+
+    def take(self):
+        try:
+            return self.detectors.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.created < self.max_size:
+                self.created += 1
+                return cv2.QRCodeDetector()
+        return self.detectors.get()  # 모두 사용 중이면 반납될 때까지 대기
+
+    def decode(self, frame):
+        with self.acquire() as detector:
+            return detector.detectAndDecode(frame)
+
+# bbox(검출된 네 꼭짓점) 주변을 여유(padding)를 두고 잘라냄. (잘라낸 이미지, 좌상단 좌표) 반환
+def crop_around(frame, bbox, padding=0.5, min_padding=40):
+    points = bbox.reshape(-1, 2)
+    x_min, y_min = points.min(axis=0)
+    x_max, y_max = points.max(axis=0)
+    pad_x = max(min_padding, (x_max - x_min) * padding)
+    pad_y = max(min_padding, (y_max - y_min) * padding)
+
+    height, width = frame.shape[:2]
+    x0 = int(max(0, x_min - pad_x))
+    y0 = int(max(0, y_min - pad_y))
+    x1 = int(min(width, x_max + pad_x))
+    y1 = int(min(height, y_max + pad_y))
+    return frame[y0:y1, x0:x1], (x0, y0)
+
+class QRTracker:
+    """
+    ROI 추적 모드
+    QR을 한 번 찾으면 다음 프레임부터는 직전 bbox 주변(crop)만 디코딩함.
+    전체 프레임 검색은 full_scan_interval 프레임마다, 또는 crop에서 디코딩에 실패했을 때만 수행.
+    반환하는 bbox는 항상 전체 프레임 좌표 기준.
+    """
+    def __init__(self, decode, padding=0.5, full_scan_interval=15):
+        self.decode = decode                  # detectAndDecode와 같은 형태의 함수
+        self.padding = padding                # bbox 크기 대비 여유 비율
+        self.full_scan_interval = full_scan_interval
+        self.last_bbox = None
+        self.frames_since_full_scan = 0
+        self.stats = {"roi_hits": 0, "roi_misses": 0, "full_scans": 0}
+
+    def detect(self, frame):
+        """(data, bbox) 반환. 못 찾으면 ("", None)"""
+        if self.last_bbox is not None and self.frames_since_full_scan < self.full_scan_interval:
+            crop, (x0, y0) = crop_around(frame, self.last_bbox, self.padding)
+            data, bbox, _ = self.decode(crop)
+            if data and bbox is not None:
+                bbox = bbox + (x0, y0)   # crop 좌표 → 전체 프레임 좌표
+                self.last_bbox = bbox
+                self.frames_since_full_scan += 1
+                self.stats["roi_hits"] += 1
+                return data, bbox
+            self.stats["roi_misses"] += 1
+
+        # 전체 프레임 검색
+        data, bbox, _ = self.decode(frame)
+        self.stats["full_scans"] += 1
+        self.frames_since_full_scan = 0
+        self.last_bbox = bbox if data and bbox is not None else None
+        return data, self.last_bbox
+
+    def reset(self):
+        self.last_bbox = None
+        self.frames_since_full_scan = 0
+
+    def summary(self):
+        return (f"[ROI 추적] crop 디코딩 성공 {self.stats['roi_hits']}회 / 실패 {self.stats['roi_misses']}회 / "
+                f"전체 프레임 검색 {self.stats['full_scans']}회")
+
+# 프레임 크기에 맞춰 피라미드 축소 비율을 자동 선택 (긴 변이 target_long_side 이하가 될 때까지 1/2씩)
+# 작은 비율(가장 많이 축소한 이미지)부터 검색하도록 오름차순으로 반환
+def choose_pyramid_scales(width, height, target_long_side=640):
+    scales = []
+    scale = 1.0
+    while max(width, height) * scale > target_long_side:
+        scale /= 2
+        scales.append(scale)
+    return sorted(scales)
+
+class PyramidDetector:
+    """
+    고해상도(1080p/4K) 카메라용 피라미드 모드
+    축소한 프레임에서 QR 꼭짓점만 찾고(detect), 해당 영역을 원본 해상도에서 잘라 디코딩함.
+    scales를 주지 않으면 프레임 크기에 따라 choose_pyramid_scales로 자동 선택.
+    자동 선택일 때 긴 변이 min_long_side 미만인 프레임(720p 등)은 원본 전체를 디코딩함
+    (720p를 0.5로 줄이면 작은 QR의 꼭짓점을 찾지 못해 성공률이 85% → 45%로 떨어졌음, bench_pyramid.py 참고).
+    decode()는 detectAndDecode와 같은 (data, bbox, None) 형태라서 QRTracker에 그대로 넣을 수 있음.
+    """
+    def __init__(self, detector, decode, scales=None, target_long_side=640, min_long_side=1920, padding=0.15,
+                 full_resolution_fallback=False):
+        self.detector = detector              # 꼭짓점 검출용 cv2.QRCodeDetector
+        self.decode_full = decode             # 원본 해상도 영역 디코딩 함수
+        self.scales = scales
+        self.target_long_side = target_long_side
+        self.min_long_side = min_long_side    # 자동 선택 시 피라미드를 사용하는 최소 긴 변 길이 (1080p 이상)
+        self.padding = padding
+        self.full_resolution_fallback = full_resolution_fallback
+        self.stats = {"pyramid_hits": 0, "full_decodes": 0}
+
+    def scales_for(self, frame):
+        if self.scales is not None:
+            return self.scales
+        height, width = frame.shape[:2]
+        if max(width, height) < self.min_long_side:
+            return []
+        return choose_pyramid_scales(width, height, self.target_long_side)
+
+    def decode(self, frame):
+        scales = self.scales_for(frame)
+        for scale in scales:
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            found, points = self.detector.detect(small)
+            if not found or points is None:
+                continue
+
+            # 축소 좌표 → 원본 좌표로 변환 후 해당 영역만 원본 해상도로 디코딩
+            crop, (x0, y0) = crop_around(frame, points / scale, self.padding)
+            data, bbox, straight = self.decode_full(crop)
+            if data and bbox is not None:
+                self.stats["pyramid_hits"] += 1
+                return data, bbox + (x0, y0), straight
+
+        # 작은 프레임이거나(축소 불필요), 설정에 따라 원본 전체를 디코딩
+        if not scales or self.full_resolution_fallback:
+            self.stats["full_decodes"] += 1
+            return self.decode_full(frame)
+        return "", None, None
+
+class FrameChangeDetector:
+    """
+    정지 장면 감지 (변화 없는 프레임은 디코딩 생략)
+    프레임을 아주 작은 그레이 썸네일로 줄여서, 마지막으로 디코딩한 프레임의 썸네일과
+    평균 절대 차이(MAD)를 비교함. threshold 미만이면 정지 장면으로 판단.
+    정지 장면이 계속되더라도 max_skip 프레임마다 한 번은 디코딩함 (안전장치).
+    """
+    def __init__(self, threshold=3.0, thumb_size=(32, 24), max_skip=30):
+        self.threshold = threshold            # 0~255 밝기 단위의 평균 차이
+        self.thumb_size = thumb_size          # (가로, 세로)
+        self.max_skip = max_skip
+        self.reference = None                 # 마지막으로 디코딩한 프레임의 썸네일
+        self.skipped_in_row = 0
+        self.stats = {"decoded": 0, "skipped": 0}
+
+    def is_static(self, frame):
+        """True면 디코딩을 건너뛰고 직전 결과를 재사용해도 됨"""
+        # 컬러 상태에서 먼저 축소한 뒤 그레이 변환 (변환 비용 최소화)
+        thumb = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 3:
+            thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+
+        if (self.reference is not None and self.skipped_in_row < self.max_skip
+                and cv2.absdiff(thumb, self.reference).mean() < self.threshold):
+            self.skipped_in_row += 1
+            self.stats["skipped"] += 1
+            return True
+
+        self.reference = thumb
+        self.skipped_in_row = 0
+        self.stats["decoded"] += 1
+        return False
+
+    def reset(self):
+        self.reference = None
+        self.skipped_in_row = 0
+
+    def summary(self):
+        total = self.stats["decoded"] + self.stats["skipped"]
+        rate = self.stats["skipped"] / total * 100 if total else 0.0
+        return (f"[정지 장면 감지] 디코딩 {self.stats['decoded']}회 / 생략 {self.stats['skipped']}회 "
+                f"({rate:.1f}% 생략)")
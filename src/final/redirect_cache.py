@@ -0,0 +1,145 @@
+# 리다이렉션 추적 결과 캐시
+# 같은 QR(킥보드, 키오스크 등)이 반복해서 스캔될 때 리다이렉션 체인을 매번 다시 따라가지 않도록
+# URL → (최종 URL, 홉 체인, 상태 코드, 저장 시각)을 저장함.
+#   - 1차: 메모리 LRU (최대 개수 제한)
+#   - 2차: SQLite 파일 (프로그램을 재시작해도 유지)
+#   - 실패한 조회도 짧은 TTL로 저장 (네거티브 캐시)
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".qr_scanner", "redirect_cache.db")
+
+class RedirectCache:
+    def __init__(self, db_path=DEFAULT_DB_PATH, ttl=3600, negative_ttl=300, max_entries=1024):
+        """
+        db_path: SQLite 파일 경로 (None이면 메모리 캐시만 사용)
+        ttl: 정상 조회 결과 유지 시간(초), negative_ttl: 실패한 조회 결과 유지 시간(초)
+        max_entries: 메모리 LRU에 보관할 최대 URL 개수
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()  # 분석 워커 여러 개가 동시에 접근함
+
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "negative_hits": 0, "misses": 0, "expired": 0}
+
+        self.db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS redirect_cache ("
+                " url TEXT PRIMARY KEY, final_url TEXT, chain TEXT, status INTEGER,"
+                " ok INTEGER, timestamp REAL)"
+            )
+            self.db.commit()
+
+    def is_expired(self, entry, now=None):
+        now = time.time() if now is None else now
+        ttl = self.ttl if entry["ok"] else self.negative_ttl
+        return now - entry["timestamp"] >= ttl
+
+    def get(self, url):
+        """캐시된 항목(dict)을 반환, 없거나 만료되었으면 None"""
+        with self.lock:
+            entry = self.memory.get(url)
+            if entry is not None:
+                if not self.is_expired(entry):
+                    self.memory.move_to_end(url)
+                    self.count_hit("memory_hits", entry)
+                    return entry
+                del self.memory[url]
+                self.stats["expired"] += 1
+
+            entry = self.load_from_disk(url)
+            if entry is not None:
+                if not self.is_expired(entry):
+                    self.remember(url, entry)
+                    self.count_hit("disk_hits", entry)
+                    return entry
+                self.stats["expired"] += 1
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, url, final_url, chain, status, ok=True):
+        """조회 결과 저장. ok=False이면 실패한 조회로 간주하여 negative_ttl 적용"""
+        entry = {
+            "url": url,
+            "final_url": final_url,
+            "chain": list(chain),
+            "status": status,
+            "ok": ok,
+            "timestamp": time.time(),
+        }
+        with self.lock:
+            self.remember(url, entry)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO redirect_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, final_url, json.dumps(entry["chain"]), status, int(ok), entry["timestamp"]),
+                )
+                self.db.commit()
+        return entry
+
+    def remember(self, url, entry):
+        # 메모리 LRU에 추가, 최대 개수를 넘으면 가장 오래 안 쓴 항목 제거
+        self.memory[url] = entry
+        self.memory.move_to_end(url)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def load_from_disk(self, url):
+        if self.db is None:
+            return None
+        row = self.db.execute(
+            "SELECT final_url, chain, status, ok, timestamp FROM redirect_cache WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        final_url, chain, status, ok, timestamp = row
+        return {
+            "url": url,
+            "final_url": final_url,
+            "chain": json.loads(chain),
+            "status": status,
+            "ok": bool(ok),
+            "timestamp": timestamp,
+        }
+
+    def count_hit(self, kind, entry):
+        self.stats[kind] += 1
+        if not entry["ok"]:
+            self.stats["negative_hits"] += 1
+
+    def purge_expired(self):
+        """SQLite에 남아있는 만료 항목 정리"""
+        if self.db is None:
+            return 0
+        now = time.time()
+        with self.lock:
+            cursor = self.db.execute(
+                "DELETE FROM redirect_cache WHERE (ok = 1 AND ? - timestamp >= ?) OR (ok = 0 AND ? - timestamp >= ?)",
+                (now, self.ttl, now, self.negative_ttl),
+            )
+            self.db.commit()
+            return cursor.rowcount
+
+    def summary(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        hit_rate = hits / total * 100 if total else 0.0
+        return (f"[리다이렉션 캐시] 적중 {hits}회 (메모리 {self.stats['memory_hits']}, "
+                f"디스크 {self.stats['disk_hits']}, 실패 캐시 {self.stats['negative_hits']}) / "
+                f"미적중 {self.stats['misses']}회 / 적중률 {hit_rate:.1f}%")
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
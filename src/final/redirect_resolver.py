@@ -0,0 +1,118 @@
+# 리다이렉션 추적 모듈
+# QR_Webcam_Scanner_Ver5.py의 resolve_redirects를 분리한 것.
+#   - 공유 Session + 호스트별 커넥션 풀(keep-alive)로 홉마다 TCP/TLS 핸드셰이크를 반복하지 않음
+#   - HEAD 요청을 먼저 보내고, 서버가 HEAD를 거부하면 본문을 읽지 않는 GET(stream)으로 재시도
+#   - 추적 결과는 RedirectCache에 저장 (캐시 파일은 처음 조회할 때 열어서, import만 하는 경우에는 만들지 않음)
+#   - requests는 처음 HTTP 요청을 보낼 때 불러옴 (URL이 없는 QR만 검사하는 실행의 시작 시간 단축)
+import threading
+
+from redirect_cache import RedirectCache
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+}
+
+POOL_CONNECTIONS = 16   # 커넥션 풀을 유지할 호스트 수
+POOL_MAXSIZE = 8        # 호스트당 유지할 keep-alive 연결 수 (분석 워커 수 이상)
+
+# HEAD를 지원하지 않는 서버가 돌려주는 상태 코드 → GET으로 재시도
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 501}
+
+# 같은 QR을 반복 스캔할 때 리다이렉션 체인을 다시 따라가지 않도록 결과를 캐시
+REDIRECT_CACHE_TTL = 3600           # 정상 조회 결과 유지 시간(초)
+REDIRECT_CACHE_NEGATIVE_TTL = 300   # 실패한 조회 결과 유지 시간(초)
+
+_redirect_cache = None
+_redirect_cache_lock = threading.Lock()
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_redirect_cache():
+    """모든 분석 워커가 공유하는 RedirectCache (처음 호출될 때 ~/.qr_scanner/redirect_cache.db를 열어서 생성)"""
+    global _redirect_cache
+    with _redirect_cache_lock:
+        if _redirect_cache is None:
+            _redirect_cache = RedirectCache(ttl=REDIRECT_CACHE_TTL, negative_ttl=REDIRECT_CACHE_NEGATIVE_TTL)
+        return _redirect_cache
+
+def redirect_cache_summary():
+    """캐시 통계 (한 번도 사용하지 않았으면 캐시 파일을 열지 않고 그대로 알려 줌)"""
+    if _redirect_cache is None:
+        return "[리다이렉션 캐시] 사용 안 함"
+    return _redirect_cache.summary()
+
+def get_session():
+    """모든 분석 워커가 공유하는 Session (처음 호출될 때 생성)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+def probe_redirect(url, timeout=5, session=None):
+    """
+    한 홉만 확인하여 (상태 코드, Location 헤더)를 반환
+    본문은 절대 읽지 않음: HEAD 우선, 실패 시 stream=True GET 후 바로 닫음
+    """
+    session = session or get_session()
+
+    response = session.head(url, allow_redirects=False, timeout=timeout)
+    response.close()
+    if response.status_code not in HEAD_FALLBACK_STATUSES:
+        return response.status_code, response.headers.get("Location")
+
+    response = session.get(url, allow_redirects=False, timeout=timeout, stream=True)
+    response.close()  # 본문을 다운로드하지 않고 연결 종료
+    return response.status_code, response.headers.get("Location")
+
+def resolve_redirect_chain(url, timeout=5, max_redirects=5, use_cache=True):
+    """
+    리다이렉션 체인을 따라가서 캐시 항목과 같은 형태의 dict를 반환
+    {"url", "final_url", "chain", "status", "ok", ...}
+    """
+    import requests
+    if use_cache:
+        cached = get_redirect_cache().get(url)
+        if cached is not None:
+            return cached
+
+    current_url = url
+    chain = [url]   # 거쳐간 URL 목록 (홉 체인)
+    status = None
+    try:
+        for _ in range(max_redirects):
+            status, location = probe_redirect(current_url, timeout)
+            if 300 <= status < 400:
+                # Location 헤더로 리다이렉션 URL 추출
+                if not location:
+                    break
+                # 상대경로를 절대 URL로 변환
+                current_url = requests.compat.urljoin(current_url, location)
+                chain.append(current_url)
+            else:
+                break
+    except requests.RequestException as e:
+        print(f"[리다이렉션 확인 실패] {e}")
+        # 실패 시 원본 URL 그대로 사용, 실패도 잠시 기억 (네거티브 캐시)
+        return store_result(url, url, chain, status, ok=False, use_cache=use_cache)
+
+    return store_result(url, current_url, chain, status, use_cache=use_cache)
+
+def store_result(url, final_url, chain, status, ok=True, use_cache=True):
+    if use_cache:
+        return get_redirect_cache().put(url, final_url, chain, status, ok=ok)
+    return {"url": url, "final_url": final_url, "chain": chain, "status": status, "ok": ok}
+
+# ver.4에 추가됨: 리다이렉션 추적 함수, User-Agent 헤더 추가
+def resolve_redirects(url, timeout=5, max_redirects=5):
+    result = resolve_redirect_chain(url, timeout=timeout, max_redirects=max_redirects)
+    print(f"[최종 URL] {result['final_url']}")  # 확인용 - 리다이렉션 결과가 항상 출력
+    return result["final_url"]
@@ -0,0 +1,241 @@
+# URL 의심 조건 규칙 엔진
+# is_suspicious_qr의 검사 조건(인라인 리스트, if 분기, 호출마다 실행되는 re.match)과 고정된 "2개 이상" 기준을
+# 설정 파일(rules/url_rules.json)의 가중치 규칙으로 옮기고, 불러올 때 한 번만 컴파일함.
+#   - substring 규칙의 문자열은 검사 대상(field)별로 모두 모아 접두사 트라이 형태의 정규식 하나로 컴파일
+#     (공통 접두사를 공유하는 Aho-Corasick식 다중 패턴 검색. 규칙이 수백 개여도 문자열을 한 번만 훑음)
+#     일치한 문자열 → 규칙 번호는 사전으로 찾음
+#   - prefix / suffix / regex 규칙은 검사 대상별로 하나의 정규식으로 합침 (규칙마다 이름 있는 그룹)
+#     같은 위치에서 여러 규칙이 겹쳐 합친 정규식이 하나만 보고한 경우를 대비해,
+#     무언가 일치한 검사 대상에 대해서만 나머지 규칙을 개별 정규식으로 다시 확인
+#   - 그 밖의 규칙: blocklist(도메인 차단 목록 / IP 대역 목록), ip_host(호스트가 IPv4/IPv6 주소), max_length,
+#     redirected / incomplete_redirect(리다이렉션 추적 결과)
+#   - 점수 합계가 threshold 이상이면 악성으로 판단
+#
+# 검사 대상(field)
+#   data : QR 원본 문자열 / url : 리다이렉션 최종 URL / host : 최종 URL의 호스트(netloc) / path : 최종 URL의 경로
+#   url, host, path는 http(s) URL인 경우에만 존재 (그 외 QR에서는 해당 규칙을 건너뜀)
+#   blocklist 규칙의 fields와 ip_host 규칙의 field는 url / data 중에서 고르며, 각 URL의 호스트 이름으로 검사함
+#   blocklist 규칙의 list는 match(호스트 이름)을 가진 객체의 이름 (DomainBlocklist, IpReputation 등)
+import os
+import json
+import re
+from urllib.parse import urlparse
+
+from ip_reputation import parse_ip
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules", "url_rules.json")
+
+FIELDS = ("data", "url", "host", "path")
+PATTERN_TYPES = ("substring", "prefix", "suffix", "regex")
+OTHER_TYPES = ("blocklist", "ip_host", "max_length", "redirected", "incomplete_redirect")
+
+def pattern_source(rule):
+    """prefix / suffix / regex 규칙 하나를 정규식 문자열로 변환"""
+    if rule["type"] == "regex":
+        source = rule["pattern"]
+    else:
+        alternatives = "|".join(re.escape(value) for value in rule["values"])
+        source = {
+            "prefix": fr"\A(?:{alternatives})",
+            "suffix": fr"(?:{alternatives})\Z",
+        }[rule["type"]]
+    # 규칙별 대소문자 무시는 인라인 플래그 그룹으로 (합친 정규식 안에서도 해당 규칙에만 적용)
+    return f"(?i:{source})" if rule.get("ignore_case") else f"(?:{source})"
+
+def trie_regex(words):
+    """
+    문자열 목록을 공통 접두사를 공유하는 정규식으로 변환
+    예: ["login", "logout", "bank"] → (?:bank|log(?:in|out))
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True  # 단어 끝 표시
+
+    def build(node):
+        if "" in node and len(node) == 1:
+            return ""
+        branches, single_chars = [], []
+        for ch in sorted(key for key in node if key):
+            rest = build(node[ch])
+            if rest:
+                branches.append(re.escape(ch) + rest)
+            else:
+                single_chars.append(re.escape(ch))
+        if single_chars:
+            branches.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+        source = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # 여기서 끝나는 단어가 있으면 뒤쪽은 선택 (탐욕적으로 가장 긴 단어를 먼저 찾음)
+        return f"(?:{source})?" if "" in node else source
+
+    return build(trie)
+
+class LiteralMatcher:
+    """
+    여러 문자열 중 값에 포함된 것을 모두 찾음
+    각 위치에서 전방 탐색(?=...)으로 가장 긴 일치를 찾고, 그 일치의 접두사인 다른 문자열도 함께 보고
+    """
+    def __init__(self, ignore_case):
+        self.ignore_case = ignore_case
+        self.rules_by_literal = {}   # 문자열 → [규칙 번호, ...]
+        self.pattern = None
+        self.hits = {}               # 가장 긴 일치 문자열 → 함께 일치한 규칙 번호 목록
+
+    def add(self, index, values):
+        for value in values:
+            literal = value.lower() if self.ignore_case else value
+            self.rules_by_literal.setdefault(literal, []).append(index)
+
+    def compile(self):
+        literals = [literal for literal in self.rules_by_literal if literal]
+        if not literals:
+            return
+        self.pattern = re.compile(f"(?=({trie_regex(literals)}))")
+        for literal in literals:
+            self.hits[literal] = sorted({index for other in literals if literal.startswith(other)
+                                         for index in self.rules_by_literal[other]})
+
+    def find(self, value):
+        """[(규칙 번호, 일치한 문자열), ...]"""
+        if self.pattern is None:
+            return []
+        if self.ignore_case:
+            value = value.lower()
+        return [(index, m.group(1)) for m in self.pattern.finditer(value) for index in self.hits[m.group(1)]]
+
+class RuleEngine:
+    def __init__(self, config, blocklists=None):
+        self.threshold = config.get("threshold", 2)
+        self.rules = config["rules"]
+        self.blocklists = dict(blocklists or {})   # 이름 → DomainBlocklist (또는 BlocklistReloader)
+        self.stats = {"evaluations": 0, "rules_evaluated": 0, "fallback_checks": 0}
+
+        self.literals = {}      # (field, 대소문자 무시 여부) → LiteralMatcher (substring 규칙)
+        self.combined = {}      # field → 합친 정규식 (prefix / suffix / regex 규칙)
+        self.singles = {}       # field → [(규칙 번호, 개별 정규식), ...]
+        self.other_rules = []   # 문자열 규칙이 아닌 규칙 (규칙 번호, 규칙)
+        grouped = {}
+        for index, rule in enumerate(self.rules):
+            rule_type = rule.get("type")
+            if rule_type in PATTERN_TYPES:
+                field = rule.get("field", "data")
+                if field not in FIELDS:
+                    raise ValueError(f"알 수 없는 검사 대상: {field} (규칙 {rule.get('id', index)})")
+                if rule_type == "substring":
+                    ignore_case = bool(rule.get("ignore_case"))
+                    key = (field, ignore_case)
+                    if key not in self.literals:
+                        self.literals[key] = LiteralMatcher(ignore_case)
+                    self.literals[key].add(index, rule["values"])
+                else:
+                    grouped.setdefault(field, []).append((index, pattern_source(rule)))
+            elif rule_type in OTHER_TYPES:
+                self.other_rules.append((index, rule))
+            else:
+                raise ValueError(f"알 수 없는 규칙 종류: {rule_type} (사용 가능: {', '.join(PATTERN_TYPES + OTHER_TYPES)})")
+
+        for matcher in self.literals.values():
+            matcher.compile()
+        for field, patterns in grouped.items():
+            self.combined[field] = re.compile("|".join(f"(?P<r{index}>{source})" for index, source in patterns))
+            self.singles[field] = [(index, re.compile(source)) for index, source in patterns]
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_RULES_PATH, blocklists=None):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), blocklists)
+
+    def fields_for(self, data, final_url=None):
+        fields = {"data": data}
+        if data.startswith("http://") or data.startswith("https://"):
+            final_url = final_url or data
+            parsed = urlparse(final_url)
+            fields.update(url=final_url, host=parsed.netloc.lower(), path=parsed.path)
+            # 차단 목록 조회용 호스트 이름 (URL을 다시 파싱하지 않도록 미리 계산)
+            fields["url_hostname"] = parsed.hostname
+            fields["data_hostname"] = parsed.hostname if final_url == data else urlparse(data).hostname
+        return fields
+
+    def match_patterns(self, fields):
+        """문자열 규칙 중 일치한 것: {규칙 번호: 일치한 문자열}"""
+        matched = {}
+        for (field, _), matcher in self.literals.items():
+            value = fields.get(field)
+            if value is not None:
+                for index, literal in matcher.find(value):
+                    matched.setdefault(index, literal)
+        for field, combined in self.combined.items():
+            value = fields.get(field)
+            if value is None:
+                continue
+            found = False
+            for m in combined.finditer(value):
+                found = True
+                matched.setdefault(int(m.lastgroup[1:]), m.group())
+            if found:
+                # 같은 위치에서 먼저 일치한 규칙에 가려진 규칙이 있을 수 있으므로 나머지만 개별 확인
+                for index, pattern in self.singles[field]:
+                    if index not in matched:
+                        self.stats["fallback_checks"] += 1
+                        m = pattern.search(value)
+                        if m:
+                            matched[index] = m.group()
+        return matched
+
+    def match_other(self, rule, fields, resolution):
+        """문자열 규칙 이외의 규칙. 일치하면 사유에 넣을 문자열(없으면 ""), 일치하지 않으면 None"""
+        rule_type = rule["type"]
+        if rule.get("url_only") and "url" not in fields:
+            return None
+        if rule_type == "blocklist":
+            blocklist = self.blocklists.get(rule["list"])
+            if blocklist is None:
+                return None
+            checked = set()
+            for field in rule.get("fields", ["url"]):
+                hostname = fields.get(f"{field}_hostname")
+                if hostname and hostname not in checked:
+                    checked.add(hostname)
+                    match = blocklist.match(hostname)
+                    if match:
+                        return match
+            return None
+        if rule_type == "ip_host":
+            hostname = fields.get(f"{rule.get('field', 'url')}_hostname")
+            return hostname if hostname and parse_ip(hostname) is not None else None
+        if rule_type == "max_length":
+            value = fields.get(rule.get("field", "data"))
+            return "" if value is not None and len(value) > rule["value"] else None
+        if resolution is None or "url" not in fields:
+            return None
+        if rule_type == "redirected":
+            return "" if fields["url"] != fields["data"] else None
+        if rule_type == "incomplete_redirect":
+            # 마감 시간 초과 / 과도한 리다이렉션 (연결 실패는 의심 조건으로 보지 않음)
+            if not resolution.get("complete", True) and resolution.get("ok"):
+                return resolution.get("truncated_reason") or ""
+        return None
+
+    def evaluate(self, data, final_url=None, resolution=None):
+        """(점수 합계, [사유, ...]) 반환. 사유는 설정 파일의 규칙 순서대로"""
+        fields = self.fields_for(data, final_url)
+        matched = self.match_patterns(fields)
+        for index, rule in self.other_rules:
+            match = self.match_other(rule, fields, resolution)
+            if match is not None:
+                matched[index] = match
+
+        score = 0
+        reasons = []
+        for index in sorted(matched):
+            rule = self.rules[index]
+            score += rule.get("weight", 1)
+            reasons.append(rule["reason"].format(match=matched[index]))
+        self.stats["evaluations"] += 1
+        self.stats["rules_evaluated"] += len(self.rules)
+        return score, reasons
+
+    def is_bad(self, score):
+        return score >= self.threshold
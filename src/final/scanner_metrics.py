@@ -0,0 +1,152 @@
+# 단계별 지연 시간 측정 모듈
+# cap.read / is_dark_environment / enhance_for_low_light / detectAndDecode / 리다이렉션 추적 /
+# draw_text_opencv / imshow 중 어디서 시간이 걸리는지 확인하기 위한 가벼운 타이머.
+#   - 비활성화 상태에서는 미리 만들어 둔 빈 타이머를 돌려주므로 비용이 거의 없음
+#   - 단계별 최근 측정값(롤링 윈도우)으로 p50/p95/p99 계산, 누적 히스토그램 버킷도 유지
+#   - 화면 HUD 표시, Prometheus 텍스트 형식 / JSON 스냅샷 파일을 주기적으로 기록
+import os
+import json
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+# Prometheus 히스토그램 버킷 경계 (초)
+HISTOGRAM_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+class NullTimer:
+    """측정 비활성화 시 사용하는 빈 타이머 (하나만 만들어서 재사용)"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+NULL_TIMER = NullTimer()
+
+class StageTimer:
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.metrics.record(self.stage, time.perf_counter() - self.started)
+        return False
+
+class StageMetrics:
+    def __init__(self, enabled=False, window=300):
+        self.enabled = enabled
+        self.window = window                  # 단계별로 보관할 최근 측정값 개수
+        self.lock = threading.Lock()          # 캡처 / 감지 / 분석 스레드에서 동시에 기록함
+        self.recent = {}                      # 단계 → deque(최근 측정값, 초)
+        self.totals = {}                      # 단계 → {"count", "sum", "buckets"}
+        self.writer = None
+        self.writer_stop = threading.Event()
+
+    def timer(self, stage):
+        """with metrics.timer("decode"): ... 형태로 사용"""
+        if not self.enabled:
+            return NULL_TIMER
+        return StageTimer(self, stage)
+
+    def record(self, stage, seconds):
+        with self.lock:
+            if stage not in self.recent:
+                self.recent[stage] = deque(maxlen=self.window)
+                self.totals[stage] = {"count": 0, "sum": 0.0, "buckets": [0] * len(HISTOGRAM_BUCKETS)}
+            self.recent[stage].append(seconds)
+            total = self.totals[stage]
+            total["count"] += 1
+            total["sum"] += seconds
+            for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                if seconds <= bound:
+                    total["buckets"][i] += 1
+
+    def snapshot(self):
+        """단계별 통계 dict (밀리초 단위 백분위 포함)"""
+        with self.lock:
+            recent = {stage: list(values) for stage, values in self.recent.items()}
+            totals = {stage: dict(total, buckets=list(total["buckets"])) for stage, total in self.totals.items()}
+
+        stages = {}
+        for stage, values in recent.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000 if values else (0.0, 0.0, 0.0)
+            stages[stage] = {
+                "count": totals[stage]["count"],
+                "sum_seconds": round(totals[stage]["sum"], 6),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(max(values) * 1000, 3) if values else 0.0,
+                "buckets": totals[stage]["buckets"],
+            }
+        return {"timestamp": time.time(), "stages": stages}
+
+    def to_prometheus(self, snapshot=None):
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            "# HELP qr_scanner_stage_seconds QR 스캐너 단계별 처리 시간",
+            "# TYPE qr_scanner_stage_seconds histogram",
+        ]
+        for stage, stats in snapshot["stages"].items():
+            for bound, count in zip(HISTOGRAM_BUCKETS, stats["buckets"]):
+                lines.append(f'qr_scanner_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'qr_scanner_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'qr_scanner_stage_seconds_sum{{stage="{stage}"}} {stats["sum_seconds"]}')
+            lines.append(f'qr_scanner_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def to_json(self, snapshot=None):
+        snapshot = snapshot or self.snapshot()
+        for stats in snapshot["stages"].values():
+            stats.pop("buckets", None)
+        return json.dumps(snapshot, ensure_ascii=False, indent=2)
+
+    def write_snapshot(self, path, fmt="prom"):
+        # 수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 교체
+        text = self.to_prometheus() if fmt == "prom" else self.to_json()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def start_writer(self, path, fmt="prom", interval=5.0):
+        """interval초마다 스냅샷 파일을 기록하는 백그라운드 스레드 시작"""
+        def run():
+            while not self.writer_stop.wait(interval):
+                self.write_snapshot(path, fmt)
+            self.write_snapshot(path, fmt)  # 종료 시 마지막 스냅샷
+
+        self.writer_stop.clear()
+        self.writer = threading.Thread(target=run, name="metrics-writer", daemon=True)
+        self.writer.start()
+
+    def stop_writer(self):
+        if self.writer is not None:
+            self.writer_stop.set()
+            self.writer.join(timeout=2)
+            self.writer = None
+
+    def draw_hud(self, frame, origin=(10, 20)):
+        """프레임 왼쪽 위에 단계별 p50 / p95 표시"""
+        x, y = origin
+        for stage, stats in self.snapshot()["stages"].items():
+            text = f"{stage:<10} p50 {stats['p50_ms']:6.1f}ms  p95 {stats['p95_ms']:6.1f}ms"
+            cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+            y += 16
+        return frame
+
+    def summary(self):
+        lines = []
+        for stage, stats in self.snapshot()["stages"].items():
+            lines.append(f"  {stage:<12} {stats['count']:>7}회  p50 {stats['p50_ms']:8.2f}ms  "
+                         f"p95 {stats['p95_ms']:8.2f}ms  p99 {stats['p99_ms']:8.2f}ms")
+        return "[단계별 지연 시간]\n" + "\n".join(lines) if lines else "[단계별 지연 시간] 기록 없음"
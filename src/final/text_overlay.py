@@ -0,0 +1,139 @@
+# 한글 텍스트 오버레이 모듈
+# 기존 draw_text_opencv는 호출할 때마다 폰트 파일을 다시 읽고,
+# 짧은 문구 하나를 그리려고 프레임 전체를 BGR → RGB → PIL → numpy → BGR로 변환했음.
+#   - 폰트는 크기별로 한 번만 로드해서 재사용
+#   - (문구, 크기, 색상)별로 글자 마스크(스프라이트)를 한 번만 렌더링해서 LRU 캐시에 보관
+#   - 프레임에는 글자가 놓이는 영역만 알파 블렌딩 (프레임을 제자리에서 수정)
+#   - Windows(H2GTRM, 맑은 고딕) 외에 Linux(나눔고딕, Noto CJK) / macOS 한글 폰트도 탐색
+#   - 폰트 탐색과 PIL 로드는 처음 글자를 그릴 때 (글자를 그리지 않는 헤드리스 실행의 시작 시간 단축)
+import glob
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 한글 폰트 후보 (앞에서부터 먼저 찾은 것을 사용)
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/H2GTRM.TTF",
+    "C:/Windows/Fonts/malgun.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+]
+# 후보 경로에 없으면 폰트 디렉터리에서 파일 이름으로 검색
+FONT_SEARCH_DIRS = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+                    os.path.expanduser("~/.local/share/fonts")]
+FONT_SEARCH_PATTERNS = ["NanumGothic*.ttf", "NotoSansCJK*.tt[fc]", "NotoSansKR*.[ot]tf", "UnDotum*.ttf"]
+
+def find_korean_font():
+    """사용 가능한 한글 폰트 파일 경로. 없으면 None"""
+    env_path = os.environ.get("QR_SCANNER_FONT")
+    if env_path and os.path.isfile(env_path):
+        return env_path
+    for path in FONT_CANDIDATES:
+        if os.path.isfile(path):
+            return path
+    for pattern in FONT_SEARCH_PATTERNS:
+        for directory in FONT_SEARCH_DIRS:
+            matches = sorted(glob.glob(os.path.join(directory, "**", pattern), recursive=True))
+            if matches:
+                return matches[0]
+    return None
+
+class TextOverlay:
+    def __init__(self, font_path=None, max_sprites=256):
+        self.font_path = font_path      # None이면 처음 그릴 때 find_korean_font()로 탐색
+        self.font_resolved = font_path is not None
+        self.fonts = {}                 # 크기 → ImageFont
+        self.sprites = OrderedDict()    # (문구, 크기, 색상) → (x 오프셋, y 오프셋, 알파, 색상 배열)
+        self.max_sprites = max_sprites
+        self.lock = threading.Lock()    # 감지 스레드와 표시 스레드에서 함께 사용
+        self.stats = {"hits": 0, "misses": 0}
+
+    def resolve_font(self):
+        """사용할 폰트 파일 경로 (처음 호출될 때 탐색)"""
+        if not self.font_resolved:
+            self.font_path = find_korean_font()
+            self.font_resolved = True
+            if self.font_path is None:
+                print("[폰트] 한글 폰트를 찾지 못했습니다. 기본 폰트를 사용합니다 (QR_SCANNER_FONT로 지정 가능).")
+        return self.font_path
+
+    def get_font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            from PIL import ImageFont
+            self.resolve_font()
+            try:
+                font = ImageFont.truetype(self.font_path, size) if self.font_path else None
+            except OSError:
+                print(f"[폰트] 폰트를 불러올 수 없습니다: {self.font_path}")
+                self.font_path = None
+                font = None
+            if font is None:
+                try:
+                    font = ImageFont.load_default(size)
+                except TypeError:  # 크기 지정을 지원하지 않는 이전 Pillow
+                    font = ImageFont.load_default()
+            self.fonts[size] = font
+        return font
+
+    def render_sprite(self, text, size, color):
+        from PIL import Image, ImageDraw
+        font = self.get_font(size)
+        # font.getbbox는 한 줄만 측정하므로, 여러 줄 문구("...\n- 사유")도 전부 들어가도록 Draw 기준으로 측정
+        scratch = ImageDraw.Draw(Image.new("L", (1, 1)))
+        left, top, right, bottom = scratch.multiline_textbbox((0, 0), text, font=font)
+        width, height = max(right - left, 1), max(bottom - top, 1)
+        mask = Image.new("L", (width, height), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+        alpha = np.asarray(mask, dtype=np.uint16)[:, :, np.newaxis]
+        # 기존 구현과 같이 color는 PIL(RGB) 순서로 해석 → 프레임(BGR)에 맞게 뒤집음
+        bgr = np.array(color[::-1], dtype=np.uint16)
+        return left, top, alpha, alpha * bgr
+
+    def get_sprite(self, text, size, color):
+        key = (text, size, tuple(color))
+        with self.lock:
+            sprite = self.sprites.get(key)
+            if sprite is not None:
+                self.sprites.move_to_end(key)
+                self.stats["hits"] += 1
+                return sprite
+            self.stats["misses"] += 1
+            sprite = self.render_sprite(text, size, color)
+            self.sprites[key] = sprite
+            if len(self.sprites) > self.max_sprites:
+                self.sprites.popitem(last=False)
+            return sprite
+
+    def draw(self, img, text, position, font_size=20, color=(255, 255, 0)):
+        """img(BGR)의 position에 text를 그림. img를 직접 수정하고 그대로 반환"""
+        if not text:
+            return img
+        offset_x, offset_y, alpha, premultiplied = self.get_sprite(text, font_size, color)
+        x, y = int(position[0]) + offset_x, int(position[1]) + offset_y
+        height, width = alpha.shape[:2]
+
+        # 프레임 밖으로 나가는 부분은 잘라냄
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, img.shape[1]), min(y + height, img.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return img
+        sx, sy = x0 - x, y0 - y
+        a = alpha[sy:sy + y1 - y0, sx:sx + x1 - x0]
+        fg = premultiplied[sy:sy + y1 - y0, sx:sx + x1 - x0]
+
+        roi = img[y0:y1, x0:x1]
+        roi[:] = (roi * (255 - a) + fg + 127) // 255
+        return img
+
+    def summary(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / total * 100 if total else 0.0
+        return (f"[텍스트 오버레이] 폰트 {self.font_path or '기본'} / 스프라이트 {len(self.sprites)}개, "
+                f"캐시 적중률 {hit_rate:.1f}%")
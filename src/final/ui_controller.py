@@ -0,0 +1,218 @@
+# tkinter 팝업 관리 (Tk 루트 하나를 전용 스레드에서 계속 사용)
+# 기존에는 판정이 끝날 때마다 스레드를 새로 만들고, 그 안에서 tk.Tk()를 새로 생성했음
+# (미리보기 창 / 실행 여부 확인 창 각각). Tk 인터프리터 생성은 느리고, 여러 스레드에서 Tk를 만들면
+# 충돌할 수 있으며, QR을 빠르게 연속 스캔하면 창이 계속 쌓였음.
+#   - Tk 루트는 UI 스레드에서 한 번만 생성하고, 모든 tkinter 호출은 UI 스레드에서만 실행
+#   - 감지 / 분석 스레드는 요청을 큐에 넣기만 함 (Queue.put 한 번, 프레임 시간보다 훨씬 짧음)
+#   - UI 스레드는 poll_interval_ms마다 큐를 비우면서 요청 처리
+#   - 같은 QR 내용의 미리보기는 기존 창을 갱신해서 앞으로 가져옴 (창을 새로 만들지 않음)
+#     열린 창은 max_windows개까지만 유지하고, 넘치면 가장 오래된 창을 닫음
+#   - 실행 여부 확인은 모달 대화상자 대신 미리보기 창 안의 예/아니오 버튼으로 표시
+#     (대화상자가 UI 스레드를 붙잡고 있는 동안 다른 요청이 밀리지 않도록)
+# macOS에서는 Tk를 메인 스레드에서만 쓸 수 있으므로 이 방식이 동작하지 않을 수 있음.
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import tkinter as tk
+
+POLL_INTERVAL_MS = 30       # UI 스레드가 요청 큐를 확인하는 간격
+MAX_PREVIEW_WINDOWS = 4     # 동시에 열어 둘 미리보기 창 수
+
+class PreviewWindow:
+    """QR 내용 하나에 대한 미리보기 창 (내용만 바꿔서 재사용)"""
+    def __init__(self, root, on_close):
+        self.window = tk.Toplevel(root)
+        self.window.title("QR 코드 미리보기")
+        self.window.geometry("700x500")
+        self.window.protocol("WM_DELETE_WINDOW", on_close)
+        self.url = None
+
+        label = tk.Label(self.window, text="QR 코드 데이터 미리보기", font=("Arial", 14, "bold"))
+        label.pack(pady=10)
+
+        # QR 코드 내용 출력
+        tk.Label(self.window, text="[원본 QR 내용]", font=("Arial", 12, "bold")).pack()
+        self.text_area = tk.Text(self.window, wrap=tk.WORD, height=5, width=80)
+        self.text_area.pack(padx=10, pady=5)
+
+        # 최종 URL 출력 (원본과 다를 때만 표시)
+        self.url_frame = tk.Frame(self.window)
+        tk.Label(self.url_frame, text="[최종 URL]", font=("Arial", 12, "bold")).pack()
+        self.url_display = tk.Text(self.url_frame, wrap=tk.WORD, height=2, width=80)
+        self.url_display.pack(padx=10, pady=5)
+
+        # 의심 카운트 / 사유 (의심 조건이 있을 때만 표시)
+        self.reason_frame = tk.Frame(self.window)
+        self.count_label = tk.Label(self.reason_frame, font=("Arial", 12, "bold"), fg="red")
+        self.count_label.pack(pady=(10, 0))
+        tk.Label(self.reason_frame, text="의심 사유:", font=("Arial", 12, "bold"), fg="red").pack(pady=(10, 0))
+        self.reasons_label = tk.Label(self.reason_frame, font=("Arial", 11), fg="red", justify=tk.LEFT)
+        self.reasons_label.pack()
+
+        # 실행 여부 확인 (URL인 경우)
+        self.confirm_frame = tk.Frame(self.window)
+        tk.Label(self.confirm_frame, text="정말로 여시겠습니까?", font=("Arial", 12, "bold")).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.confirm_frame, text="예", width=6, command=self.open_url).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.confirm_frame, text="아니오", width=6, command=self.hide_confirm).pack(side=tk.LEFT, padx=5)
+
+        self.close_button = tk.Button(self.window, text="닫기", command=on_close)
+        self.close_button.pack(side=tk.BOTTOM, pady=20)
+
+    @staticmethod
+    def set_text(widget, value):
+        widget.configure(state="normal")
+        widget.delete("1.0", tk.END)
+        widget.insert(tk.END, value)
+        widget.configure(state="disabled")
+
+    def update(self, qr_data, final_url, suspicion_count, reasons):
+        self.set_text(self.text_area, qr_data)
+        if final_url and final_url != qr_data:
+            self.set_text(self.url_display, final_url)
+            self.url_frame.pack(before=self.close_button)
+        else:
+            self.url_frame.pack_forget()
+        if suspicion_count > 0 and reasons:
+            self.count_label.configure(text=f"[의심 카운트] {suspicion_count}")
+            self.reasons_label.configure(text="\n".join(f"• {reason}" for reason in reasons))
+            self.reason_frame.pack(before=self.close_button)
+        else:
+            self.reason_frame.pack_forget()
+        # 창을 다시 보이게 하고 맨 앞으로
+        self.window.deiconify()
+        self.window.lift()
+
+    def ask_open(self, url):
+        self.url = url
+        self.confirm_frame.pack(before=self.close_button, pady=10)
+
+    def open_url(self):
+        if self.url:
+            import webbrowser  # 실제로 URL을 열 때만 불러옴
+            webbrowser.open(self.url)
+        self.hide_confirm()
+
+    def hide_confirm(self):
+        self.confirm_frame.pack_forget()
+
+    def destroy(self):
+        self.window.destroy()
+
+class UIController:
+    def __init__(self, poll_interval_ms=POLL_INTERVAL_MS, max_windows=MAX_PREVIEW_WINDOWS):
+        self.poll_interval_ms = poll_interval_ms
+        self.max_windows = max_windows
+        self.requests = queue.Queue()
+        self.windows = OrderedDict()   # QR 내용 → PreviewWindow (UI 스레드에서만 접근)
+        self.root = None
+        self.thread = None
+        self.available = True          # Tk를 만들 수 없는 환경(디스플레이 없음 등)이면 False
+        self.stats = {"posted": 0, "created": 0, "reused": 0, "closed": 0, "dropped": 0, "max_post_seconds": 0.0}
+
+    # ------------------------------
+    # 감지 / 분석 스레드에서 호출 (큐에 넣기만 함)
+    # ------------------------------
+    def post(self, kind, *args):
+        if not self.available:
+            self.stats["dropped"] += 1
+            return
+        started = time.perf_counter()
+        self.requests.put((kind, args))
+        elapsed = time.perf_counter() - started
+        self.stats["posted"] += 1
+        if elapsed > self.stats["max_post_seconds"]:
+            self.stats["max_post_seconds"] = elapsed
+
+    def show_preview(self, qr_data, final_url, suspicion_count, reasons):
+        self.post("preview", qr_data, final_url, suspicion_count, list(reasons))
+
+    def confirm_open(self, url):
+        """미리보기 창에 실행 여부 확인 버튼 표시 (예를 누르면 브라우저로 열기)"""
+        self.post("confirm", url)
+
+    # ------------------------------
+    # UI 스레드
+    # ------------------------------
+    def start(self):
+        if self.thread is None:
+            ready = threading.Event()
+            self.thread = threading.Thread(target=self.run, args=(ready,), name="qr-ui", daemon=True)
+            self.thread.start()
+            ready.wait(timeout=5)
+        return self
+
+    def run(self, ready):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError as e:
+            print(f"[UI] 팝업 창을 사용할 수 없습니다: {e}")
+            self.available = False
+            ready.set()
+            return
+        self.root.withdraw()  # 루트 창은 숨기고 미리보기 창(Toplevel)만 표시
+        self.root.after(self.poll_interval_ms, self.drain)
+        ready.set()
+        self.root.mainloop()
+        for window in self.windows.values():
+            window.destroy()
+        self.windows.clear()
+        self.root.destroy()
+        self.root = None
+
+    def drain(self):
+        while True:
+            try:
+                kind, args = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "stop":
+                self.root.quit()
+                return
+            try:
+                if kind == "preview":
+                    self.preview(*args)
+                elif kind == "confirm":
+                    if args[0] not in self.windows:
+                        self.preview(args[0], args[0], 0, [])
+                    self.windows[args[0]].ask_open(args[0])
+            except tk.TclError as e:  # 사용자가 닫는 중인 창 등
+                print(f"[UI] 요청 처리 실패: {e}")
+        self.root.after(self.poll_interval_ms, self.drain)
+
+    def preview_window(self, key):
+        """key(QR 내용)에 해당하는 창 (없으면 만들고, 개수가 넘치면 가장 오래된 창을 닫음)"""
+        window = self.windows.get(key)
+        if window is not None:
+            self.windows.move_to_end(key)
+            self.stats["reused"] += 1
+            return window
+        while len(self.windows) >= self.max_windows:
+            _, oldest = self.windows.popitem(last=False)
+            oldest.destroy()
+            self.stats["closed"] += 1
+        window = PreviewWindow(self.root, lambda: self.close(key))
+        self.windows[key] = window
+        self.stats["created"] += 1
+        return window
+
+    def preview(self, qr_data, final_url, suspicion_count, reasons):
+        self.preview_window(qr_data).update(qr_data, final_url, suspicion_count, reasons)
+
+    def close(self, key):
+        window = self.windows.pop(key, None)
+        if window is not None:
+            window.destroy()
+
+    def stop(self):
+        if self.thread is not None:
+            if self.available:
+                self.requests.put(("stop", ()))
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def summary(self):
+        return (f"[UI] 요청 {self.stats['posted']}건 (전달 최대 {self.stats['max_post_seconds'] * 1e6:.0f}µs), "
+                f"창 생성 {self.stats['created']}개 / 재사용 {self.stats['reused']}회 / 자동 닫기 {self.stats['closed']}개"
+                + (f", 버린 요청 {self.stats['dropped']}건" if self.stats["dropped"] else ""))
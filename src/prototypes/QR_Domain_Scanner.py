@@ -1,12 +1,21 @@
 # QR코드와 도메인을 스캔하여 검사하는 알고리즘
+import os, sys
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import cv2
 import numpy as np
 import re
 import requests
-from pyzbar.pyzbar import decode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+from qr_decoders import create_decoder_cascade  # OpenCV / pyzbar / WeChat 디코더 통합 (설치된 것만 사용)
+from domain_blocklist import load_blocklist, PHISHING_LIST_PATH  # 공용 피싱 도메인 목록 (하위 도메인까지 검사)
+from blocklist_reloader import BlocklistReloader, DEFAULT_RELOAD_INTERVAL
 
 # 설정
-SUSPICIOUS_DOMAINS = ["discord-gift.com", "free-nitro.com", "discord-airdrop.com"]  # 의심 도메인 리스트
+SUSPICIOUS_DOMAINS = load_blocklist(PHISHING_LIST_PATH)  # 의심 도메인 목록 (src/final/blocklists/phishing_domains.txt)
 
 # URL에서 도메인 추출 함수
 def extract_domain(url):
@@ -16,16 +25,33 @@ def extract_domain(url):
 
 # 의심 도메인인지 확인
 def is_suspicious_domain(domain):
-    return domain in SUSPICIOUS_DOMAINS
+    return SUSPICIOUS_DOMAINS.match(domain) is not None
+
+# --blocklist로 지정한 피싱 피드를 의심 도메인 목록에 추가 (이미 불러온 파일은 건너뜀)
+loaded_blocklists = set()
+
+def load_extra_blocklists(paths):
+    for path in paths:
+        if path not in loaded_blocklists:
+            SUSPICIOUS_DOMAINS.load_file(path)
+            loaded_blocklists.add(path)
+
+# 목록 파일 / 변경분 파일을 감시하면서 자동 갱신하는 목록으로 교체 (오래 걸리는 배치 작업용)
+def enable_blocklist_reload(blocklist_paths=(), delta_paths=(), interval=DEFAULT_RELOAD_INTERVAL):
+    global SUSPICIOUS_DOMAINS
+    SUSPICIOUS_DOMAINS = BlocklistReloader([PHISHING_LIST_PATH, *blocklist_paths], delta_paths, interval,
+                                           name="피싱 목록").start()
+
+# QR 디코더 (빠른 백엔드부터 시도하고 실패 시 다음 백엔드로 넘어감)
+qr_decoder = create_decoder_cascade()
 
 # 이미지에서 QR 코드 탐지
 def scan_qr_code(image_path):
     img = cv2.imread(image_path)
-    detected_qrs = decode(img)
+    detected_qrs = qr_decoder.decode(img)
     results = []
 
-    for qr in detected_qrs:
-        qr_data = qr.data.decode("utf-8")
+    for qr_data, _ in detected_qrs:
         domain = extract_domain(qr_data)
         is_suspicious = is_suspicious_domain(domain) if domain else False
         results.append({
@@ -35,6 +61,158 @@ def scan_qr_code(image_path):
         })
     return results
 
+# ------------------------------
+# 배치 모드: 폴더 / 파일 목록의 이미지를 프로세스 풀로 나눠서 디코딩하고 JSONL로 결과를 스트리밍
+# ------------------------------
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp", ".tif", ".tiff"}
+
+# 입력(폴더, 이미지 파일, "-"=표준입력의 파일 목록)에서 이미지 경로를 하나씩 꺼냄
+def iter_image_paths(sources):
+    for source in sources:
+        if source == "-":
+            for line in sys.stdin:
+                path = line.strip()
+                if path:
+                    yield path
+        elif os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                        yield os.path.join(root, name)
+        else:
+            yield source
+
+# 이미 처리한 이미지 경로 (중단 후 재개용). 마지막 줄이 중간에 끊겼으면 무시
+def load_done_paths(output_path):
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+# 중단되면서 마지막 줄이 반쯤 기록된 경우, 그 뒤에 이어 쓰면 새 기록이 깨진 줄에 붙으므로
+# 이어 쓰기 전에 마지막 줄바꿈 뒤의 불완전한 부분을 잘라냄
+def truncate_partial_line(output_path, chunk_size=65536):
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(position - chunk_size, 0)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            position = start
+        else:
+            keep = 0
+        if keep < end:
+            print(f"[이어 쓰기] 마지막 불완전한 줄({end - keep}바이트)을 잘라냄", file=sys.stderr)
+            f.truncate(keep)
+
+# 워커 프로세스 초기화: 프로세스마다 OpenCV 내부 스레드를 1개로 제한 (코어 과점유 방지)
+# fork 방식이면 부모가 불러온 차단 목록을 그대로 물려받고, spawn 방식(Windows)이면 여기서 다시 불러옴
+# 자동 갱신(reload_interval 지정)은 스레드가 fork로 복제되지 않으므로 워커마다 따로 시작
+def init_batch_worker(blocklist_paths=(), delta_paths=(), reload_interval=None):
+    cv2.setNumThreads(1)
+    if reload_interval:
+        enable_blocklist_reload(blocklist_paths, delta_paths, reload_interval)
+    else:
+        load_extra_blocklists(blocklist_paths)
+
+# 이미지 한 장 처리 (워커 프로세스에서 실행). JSONL 한 줄에 해당하는 dict 반환
+def scan_image_record(image_path):
+    started = time.perf_counter()
+    record = {"path": image_path, "qr_codes": [], "verdict": "no_qr", "error": None}
+
+    img = cv2.imread(image_path)
+    read_done = time.perf_counter()
+    if img is None:
+        record["verdict"] = "error"
+        record["error"] = "이미지를 읽을 수 없음"
+        read_ms = round((read_done - started) * 1000, 3)
+        record["timings_ms"] = {"read": read_ms, "decode": 0.0, "total": read_ms}
+        return record
+
+    detected_qrs = qr_decoder.decode(img)
+    decode_done = time.perf_counter()
+
+    for qr_data, _ in detected_qrs:
+        domain = extract_domain(qr_data)
+        is_suspicious = is_suspicious_domain(domain) if domain else False
+        record["qr_codes"].append({
+            "data": qr_data,
+            "domain": domain,
+            "verdict": "suspicious" if is_suspicious else "safe",
+        })
+    if record["qr_codes"]:
+        suspicious = any(qr["verdict"] == "suspicious" for qr in record["qr_codes"])
+        record["verdict"] = "suspicious" if suspicious else "safe"
+
+    record["timings_ms"] = {
+        "read": round((read_done - started) * 1000, 3),
+        "decode": round((decode_done - read_done) * 1000, 3),
+        "total": round((time.perf_counter() - started) * 1000, 3),
+    }
+    return record
+
+def run_batch(sources, output_path=None, workers=None, resume=False, blocklist_paths=(), delta_paths=(),
+              reload_interval=None):
+    """
+    이미지들을 프로세스 풀에서 디코딩하고, 끝나는 순서대로 JSONL 한 줄씩 출력
+    output_path가 없으면 표준출력으로, resume=True면 output_path에 이미 기록된 이미지는 건너뜀
+    """
+    workers = workers or os.cpu_count() or 1
+    done = load_done_paths(output_path) if (resume and output_path) else set()
+    if resume and output_path:
+        truncate_partial_line(output_path)
+    out = open(output_path, "a" if resume else "w", encoding="utf-8") if output_path else sys.stdout
+    max_in_flight = workers * 4   # 수십만 장을 한꺼번에 제출하지 않도록 제한
+
+    counts = {"images": 0, "skipped": len(done), "qr": 0, "suspicious": 0, "errors": 0}
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                 initargs=(tuple(blocklist_paths), tuple(delta_paths), reload_interval)) as executor:
+            pending = set()
+            paths = (path for path in iter_image_paths(sources) if path not in done)
+
+            def write_finished(finished):
+                for future in finished:
+                    record = future.result()
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    counts["images"] += 1
+                    counts["qr"] += len(record["qr_codes"])
+                    counts["suspicious"] += record["verdict"] == "suspicious"
+                    counts["errors"] += record["verdict"] == "error"
+                out.flush()  # 중단되어도 여기까지의 결과는 남도록
+
+            for path in paths:
+                done.add(path)  # 같은 이미지가 여러 입력에 중복되어 있어도 한 번만 처리
+                pending.add(executor.submit(scan_image_record, path))
+                if len(pending) >= max_in_flight:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    write_finished(finished)
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write_finished(finished)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    rate = counts["images"] / elapsed if elapsed > 0 else 0.0
+    print(f"[배치 완료] 이미지 {counts['images']}장 ({rate:.1f}장/초), 건너뜀 {counts['skipped']}장, "
+          f"QR {counts['qr']}개, 의심 {counts['suspicious']}장, 오류 {counts['errors']}장", file=sys.stderr)
+    return counts
+
 # 이미지에서 텍스트 기반 URL 탐지
 def scan_text_for_urls(image_path):
     img = cv2.imread(image_path)
@@ -89,5 +267,32 @@ def main(image_path):
         print("[텍스트 URL 없음]")
 
 if __name__ == "__main__":
-    test_image = "test.png"  # 분석할 이미지 파일 경로
-    main(test_image)
+    parser = argparse.ArgumentParser(description="QR코드 / 도메인 스캐너")
+    parser.add_argument("image", nargs="?", default="test.png", help="분석할 이미지 파일 경로 (단일 모드)")
+    parser.add_argument("--batch", nargs="+", metavar="SOURCE",
+                        help="배치 모드: 폴더 / 이미지 파일 / '-'(표준입력으로 파일 목록)")
+    parser.add_argument("-o", "--output", help="JSONL 결과 파일 (없으면 표준출력)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--resume", action="store_true", help="출력 파일에 이미 기록된 이미지는 건너뛰고 이어서 처리")
+    parser.add_argument("--blocklist", action="append", default=[], metavar="PATH",
+                        help="추가로 불러올 피싱 도메인 목록 파일 (여러 번 지정 가능)")
+    parser.add_argument("--blocklist-delta", action="append", default=[], metavar="PATH",
+                        help="피싱 목록 변경분 파일 (한 줄에 +도메인 / -도메인, 덧붙인 줄만 실행 중에 반영)")
+    parser.add_argument("--watch-blocklists", action="store_true",
+                        help="배치 실행 중 목록 파일이 바뀌면 다시 불러옴")
+    parser.add_argument("--reload-interval", type=float, default=DEFAULT_RELOAD_INTERVAL,
+                        help="목록 파일 변경 확인 간격(초)")
+    args = parser.parse_args()
+    reload_interval = args.reload_interval if args.watch_blocklists or args.blocklist_delta else None
+    if reload_interval:
+        enable_blocklist_reload(args.blocklist, args.blocklist_delta, reload_interval)
+    else:
+        load_extra_blocklists(args.blocklist)
+
+    if args.batch:
+        if args.resume and not args.output:
+            parser.error("--resume은 --output과 함께 사용해야 합니다.")
+        run_batch(args.batch, args.output, args.workers, args.resume, args.blocklist,
+                  args.blocklist_delta, reload_interval)
+    else:
+        main(args.image)
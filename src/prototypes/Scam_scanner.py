@@ -1,15 +1,20 @@
 # Discord Nitro 무료 지급 사기 이미지 감지 코드
 
+import os, sys
 import cv2
 import numpy as np
-import pyzbar.pyzbar as pyzbar
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+from qr_decoders import create_decoder_cascade  # OpenCV / pyzbar / WeChat 디코더 통합 (설치된 것만 사용)
+
+qr_decoder = create_decoder_cascade()
 
 def detect_qr_and_text(image_path):
     img = cv2.imread(image_path)
     # QR코드 스캔
-    decoded_objects = pyzbar.decode(img)
-    for obj in decoded_objects:
-        print(f"QR Detected: {obj.data.decode('utf-8')}")
+    decoded_objects = qr_decoder.decode(img)
+    for data, _ in decoded_objects:
+        print(f"QR Detected: {data}")
 
     # 텍스트 영역 감지 (간단 버전: Canny + Contour)
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -1,18 +1,19 @@
+import os, sys
 import requests
 import re
 import qrcode
 import cv2
-from pyzbar.pyzbar import decode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "final"))
+from qr_decoders import create_decoder_cascade  # OpenCV / pyzbar / WeChat 디코더 통합 (설치된 것만 사용)
+from domain_blocklist import load_blocklist, PHISHING_LIST_PATH
+from bulk_verdict import BulkScanner, iter_url_file  # URL 목록 파일 일괄 검사 (모드 3)
 
 # ------------------------------
-# 1. 피싱 사이트 DB (예시: 단순 리스트)
-#    실제로는 PhishTank, Google Safe Browsing API 사용 가능
+# 1. 피싱 사이트 DB (공용 목록 파일: src/final/blocklists/phishing_domains.txt)
+#    실제로는 PhishTank, Google Safe Browsing API 등의 피드를 같은 형식으로 받아서 사용 가능
 # ------------------------------
-known_phishing_domains = [
-    "malicious-example.com",
-    "discord-fake-login.com",
-    "phishingsite.net"
-]
+known_phishing_domains = load_blocklist(PHISHING_LIST_PATH)
 
 # ------------------------------
 # 2. URL 위험도 체크 함수
@@ -24,20 +25,21 @@ def is_phishing_domain(url):
         return False
     domain = domain_match.group(1).lower()
 
-    # DB와 비교
-    if domain in known_phishing_domains:
+    # DB와 비교 (하위 도메인까지 포함)
+    if known_phishing_domains.match(domain):
         return True
     return False
 
 # ------------------------------
 # 3. QR코드에서 URL 추출
 # ------------------------------
+qr_decoder = create_decoder_cascade()
+
 def scan_qr_image(image_path):
     img = cv2.imread(image_path)
-    decoded_objects = decode(img)
+    decoded_objects = qr_decoder.decode(img)
     urls = []
-    for obj in decoded_objects:
-        data = obj.data.decode("utf-8")
+    for data, _ in decoded_objects:
         if re.match(r"https?://", data):
             urls.append(data)
     return urls
@@ -47,7 +49,7 @@ def scan_qr_image(image_path):
 # ------------------------------
 if __name__ == "__main__":
     print("=== 피싱 감지 프로그램 ===")
-    mode = input("QR코드 이미지 스캔(1) / 도메인 직접 입력(2) 중 선택: ")
+    mode = input("QR코드 이미지 스캔(1) / 도메인 직접 입력(2) / URL 목록 파일 검사(3) 중 선택: ")
 
     if mode == "1":
         image_path = input("QR코드 이미지 경로 입력: ")
@@ -69,5 +71,16 @@ if __name__ == "__main__":
         else:
             print("✅ 안전: 피싱 DB에 등록되지 않음")
 
+    elif mode == "3":
+        # 한 줄에 URL 하나씩 적힌 파일을 동시에 검사 (중복 제거, 리다이렉션 추적 + 웹캠 스캐너와 같은 규칙으로 판정)
+        list_path = input("URL 목록 파일 경로 입력: ")
+        scanner = BulkScanner()
+        for verdict in scanner.scan(iter_url_file(list_path)):
+            if verdict["bad"]:
+                print(f"⚠ 위험: {verdict['url']} → {verdict['final_url']} ({', '.join(verdict['reasons'])})")
+            else:
+                print(f"✅ 안전: {verdict['url']}")
+        print(scanner.summary())
+
     else:
         print("잘못된 선택입니다.")